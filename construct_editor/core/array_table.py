@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+import dataclasses
+import enum
+import io
+import typing as t
+
+import construct as cs
+import construct_typed as cst
+
+import construct_editor.core.entries as entries
+import construct_editor.core.model as model
+from construct_editor.core.preprocessor import IncludeGuiMetaData
+
+if t.TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # numpy is optional, without it the table view is disabled
+        np = None
+
+
+class ArrayTableColumnType(enum.Enum):
+    Integer = enum.auto()
+    Float = enum.auto()
+    Flag = enum.auto()
+    Bytes = enum.auto()
+    Enum = enum.auto()
+
+
+@dataclasses.dataclass
+class ArrayTableColumn:
+    name: str
+    field: str
+    typ: ArrayTableColumnType
+    enum_names: t.Optional[t.Dict[int, str]] = None
+    enum_prefix: str = ""
+
+
+# mapping from struct format characters to numpy type codes
+_FORMATFIELD_DTYPES: t.Dict[str, str] = {
+    "B": "u1",
+    "H": "u2",
+    "I": "u4",
+    "L": "u4",
+    "Q": "u8",
+    "b": "i1",
+    "h": "i2",
+    "i": "i4",
+    "l": "i4",
+    "q": "i8",
+    "e": "f2",
+    "f": "f4",
+    "d": "f8",
+}
+
+
+class ArrayTable:
+    """
+    Columnar view of an `cs.Array`/`cs.GreedyRange` of fixed sized structs
+    with primitive fields.
+
+    The bytes of the array are reinterpreted as a NumPy structured array, so
+    that the rows and columns can be read without creating entries or
+    accessing the parsed objects of each element.
+    """
+
+    def __init__(
+        self,
+        model: "model.ConstructEditorModel",
+        columns: t.List[ArrayTableColumn],
+        data: "np.ndarray",
+        row_typ_str: str,
+    ):
+        self.model = model
+        self.columns = columns
+        self.data = data
+
+        # type of the elements, that is shown for each row
+        self.row_typ_str = row_typ_str
+
+        # views of the single columns (no copy is made)
+        self._column_data = [data[column.field] for column in columns]
+
+        # cache for the last sort order, so that it is not recalculated on every reload
+        self._sort_order: t.Optional[t.Tuple[int, bool, "np.ndarray"]] = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def column_names(self) -> t.List[str]:
+        return [column.name for column in self.columns]
+
+    def get_column(self, col: int) -> "np.ndarray":
+        """
+        Get all values of one column.
+        """
+        return self._column_data[col]
+
+    def get_cell_str(self, row: int, col: int) -> str:
+        """
+        Get the string representation of a single cell.
+
+        The format is the same as `obj_str` of the corresponding entry.
+        """
+        if col >= len(self.columns):
+            return ""
+        column = self.columns[col]
+        val = self._column_data[col][row]
+
+        if column.typ is ArrayTableColumnType.Integer:
+            return entries.int_to_str(self.model.integer_format, int(val))
+        elif column.typ is ArrayTableColumnType.Float:
+            return str(float(val))
+        elif column.typ is ArrayTableColumnType.Flag:
+            return str(bool(val))
+        elif column.typ is ArrayTableColumnType.Bytes:
+            return val.tobytes().hex(" ")
+        elif column.typ is ArrayTableColumnType.Enum:
+            val = int(val)
+            val_str = entries.int_to_str(self.model.integer_format, val)
+            if column.enum_names is not None and val in column.enum_names:
+                return f"{val_str} ({column.enum_prefix}{column.enum_names[val]})"
+            return f"{val_str} (EnumInteger)"
+        return str(val)
+
+    def get_sort_order(self, col: int, descending: bool = False) -> "np.ndarray":
+        """
+        Get the row indexes, that sort the table by one column.
+        """
+        if self._sort_order is not None:
+            sort_col, sort_descending, order = self._sort_order
+            if sort_col == col and sort_descending == descending:
+                return order
+
+        if col >= len(self.columns):
+            order = np.arange(len(self.data))
+            self._sort_order = (col, descending, order)
+            return order
+
+        column_data = self._column_data[col]
+        if self.columns[col].typ is ArrayTableColumnType.Bytes:
+            # void types cannot be sorted directly, so compare the raw bytes
+            column_data = column_data.view(f"S{column_data.dtype.itemsize}")
+        order = np.argsort(column_data, kind="stable")
+        if descending:
+            order = order[::-1]
+        self._sort_order = (col, descending, order)
+        return order
+
+
+def _unwrap_construct(
+    constr: "cs.Construct[t.Any, t.Any]",
+) -> t.Tuple["cs.Construct[t.Any, t.Any]", t.Optional[str]]:
+    """
+    Remove all `cs.Renamed` and `IncludeGuiMetaData` wrappers from a construct.
+    """
+    name = None
+    while isinstance(constr, (cs.Renamed, IncludeGuiMetaData)):
+        if isinstance(constr, cs.Renamed) and constr.name is not None:
+            name = constr.name
+        constr = constr.subcon
+    return constr, name
+
+
+def _get_primitive_column(
+    constr: "cs.Construct[t.Any, t.Any]",
+) -> t.Optional[t.Tuple[str, ArrayTableColumnType, t.Optional[t.Dict[int, str]], str]]:
+    """
+    Get the numpy dtype, the column type and the enum names (with the prefix
+    of the enum names) of a primitive construct.
+    Returns None if the construct is not supported.
+    """
+    if isinstance(constr, cs.FormatField):
+        byteorder = constr.fmtstr[0]
+        code = _FORMATFIELD_DTYPES.get(constr.fmtstr[1:])
+        if code is None:
+            return None
+        if code.startswith("f"):
+            return (byteorder + code, ArrayTableColumnType.Float, None, "")
+        return (byteorder + code, ArrayTableColumnType.Integer, None, "")
+
+    if isinstance(constr, cs.BytesInteger):
+        if (constr.length not in (1, 2, 4, 8)) or (
+            not isinstance(constr.swapped, bool)
+        ):
+            return None
+        byteorder = "<" if constr.swapped else ">"
+        code = ("i" if constr.signed else "u") + str(constr.length)
+        return (byteorder + code, ArrayTableColumnType.Integer, None, "")
+
+    if isinstance(constr, type(cs.Flag)):
+        return ("u1", ArrayTableColumnType.Flag, None, "")
+
+    if isinstance(constr, cs.Bytes):
+        if not isinstance(constr.length, int):
+            return None
+        return (f"V{constr.length}", ArrayTableColumnType.Bytes, None, "")
+
+    if isinstance(constr, cst.TEnum):
+        subcon, _ = _unwrap_construct(constr.subcon)
+        column = _get_primitive_column(subcon)
+        if column is None or column[1] is not ArrayTableColumnType.Integer:
+            return None
+        enum_names = {int(e.value): e.name for e in constr.enum_type}
+        enum_prefix = f"{constr.enum_type.__name__}."
+        return (column[0], ArrayTableColumnType.Enum, enum_names, enum_prefix)
+
+    if isinstance(constr, cs.Enum):
+        subcon, _ = _unwrap_construct(constr.subcon)
+        column = _get_primitive_column(subcon)
+        if column is None or column[1] is not ArrayTableColumnType.Integer:
+            return None
+        enum_names = {int(v): str(k) for v, k in constr.decmapping.items()}
+        return (column[0], ArrayTableColumnType.Enum, enum_names, "")
+
+    return None
+
+
+def _add_struct_columns(
+    model: "model.ConstructEditorModel",
+    constr: "cs.Construct[t.Any, t.Any]",
+    path: t.List[str],
+    offset: int,
+    dtype_fields: t.Dict[str, t.List[t.Any]],
+    columns: t.List[ArrayTableColumn],
+) -> t.Optional[int]:
+    """
+    Add all fields of a (nested) struct to the dtype fields and the columns.
+    Returns the end offset of the struct or None if the struct is not supported.
+    """
+    constr, _ = _unwrap_construct(constr)
+    if isinstance(constr, cst.DataclassStruct):
+        if constr.reverse:
+            return None
+        constr, _ = _unwrap_construct(constr.subcon)
+
+    if not isinstance(constr, cs.Struct):
+        return None
+
+    for subcon in constr.subcons:
+        subcon, name = _unwrap_construct(subcon)
+
+        # unnamed fields (eg. `cs.Padding`) are only skipped
+        if name is None:
+            try:
+                offset += subcon.sizeof()
+            except cs.SizeofError:
+                return None
+            continue
+
+        # protected fields are not shown in the list view either
+        if model.hide_protected and name.startswith("_"):
+            hidden = True
+        else:
+            hidden = False
+
+        if isinstance(subcon, (cs.Struct, cst.DataclassStruct)):
+            end_offset = _add_struct_columns(
+                model, subcon, path + [name], offset, dtype_fields, columns
+            )
+            if end_offset is None:
+                return None
+            offset = end_offset
+            continue
+
+        column = _get_primitive_column(subcon)
+        if column is None:
+            return None
+        dtype, typ, enum_names, enum_prefix = column
+
+        field = f"f{len(dtype_fields['names'])}"
+        dtype_fields["names"].append(field)
+        dtype_fields["formats"].append(dtype)
+        dtype_fields["offsets"].append(offset)
+        if not hidden:
+            columns.append(
+                ArrayTableColumn(
+                    name=entries.create_path_str(path + [name]),
+                    field=field,
+                    typ=typ,
+                    enum_names=enum_names,
+                    enum_prefix=enum_prefix,
+                )
+            )
+        offset += np.dtype(dtype).itemsize
+
+    return offset
+
+
+def create_array_table(
+    model: "model.ConstructEditorModel", entry: "entries.EntryArray"
+) -> t.Optional[ArrayTable]:
+    """
+    Create an `ArrayTable` for an array entry.
+
+    Returns None if NumPy is not installed, the elements are no fixed sized
+    structs with primitive fields or the parsed data is not available.
+    """
+    if np is None:
+        return None
+
+    dtype_fields: t.Dict[str, t.List[t.Any]] = {
+        "names": [],
+        "formats": [],
+        "offsets": [],
+    }
+    columns: t.List[ArrayTableColumn] = []
+    itemsize = _add_struct_columns(
+        model, entry.construct.subcon, [], 0, dtype_fields, columns
+    )
+    if itemsize is None or itemsize == 0 or len(columns) == 0:
+        return None
+    dtype = np.dtype(
+        {
+            "names": dtype_fields["names"],
+            "formats": dtype_fields["formats"],
+            "offsets": dtype_fields["offsets"],
+            "itemsize": itemsize,
+        }
+    )
+
+    # get the raw bytes of the array from the parsed stream
+    try:
+        obj = entry.obj
+        count = len(obj)
+    except Exception:
+        return None
+    metadata = entry.obj_metadata
+    if metadata is None:
+        return None
+    stream = metadata.stream
+    if not isinstance(stream, io.BytesIO):
+        return None
+    start, end = metadata.offset_start, metadata.offset_end
+    if (end - start) != count * itemsize:
+        return None
+
+    # `getvalue` shares the data without exporting the buffer of the stream
+    # (other than `getbuffer`), so data can still be appended to the stream
+    # (see `incremental_parse.parse_appended`)
+    data = np.frombuffer(stream.getvalue(), dtype=dtype, count=count, offset=start)
+    row_entry = entries.create_entry_from_construct(
+        model, entry, entry.construct.subcon, None, ""
+    )
+    return ArrayTable(model, columns, data, row_entry.typ_str)
@@ -1,8 +1,40 @@
 # -*- coding: utf-8 -*-
 import abc
+import collections
+import dataclasses
+import io
+import sys
 import typing as t
 
 
+def get_object_size(*objs: t.Any) -> int:
+    """
+    Approximate memory of objects including all items of nested containers
+    (eg. the bytes in a `cs.Container`) and the fields of dataclasses, which
+    `sys.getsizeof` does not count. Objects that are referenced multiple times
+    are only counted once. Other objects are not traversed and streams are not
+    counted at all, because they are shared with the parsed data.
+    """
+    size = 0
+    seen: t.Set[int] = set()
+    stack = list(objs)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, io.IOBase):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            stack.extend(getattr(obj, field.name) for field in dataclasses.fields(obj))
+    return size
+
+
 class Command:
     def __init__(self, can_undo: bool, name: str) -> None:
         self.can_undo: bool = can_undo
@@ -16,12 +48,75 @@ class Command:
     def undo(self) -> bool:
         ...
 
+    def get_size(self) -> int:
+        """
+        Approximate memory, that is needed to save this command in the history
+        (in bytes). By default the attributes are counted with
+        `get_object_size`, commands that save other data should override this.
+        """
+        return sys.getsizeof(self) + get_object_size(getattr(self, "__dict__", {}))
+
+    def merge(self, command: "Command") -> bool:
+        """
+        Try to merge a command, that was executed directly after this command,
+        into this command (eg. consecutive typing). If the command was merged,
+        it is not stored separately in the history.
+
+        :return: True if the command was merged
+        """
+        return False
+
+
+class CompositeCmd(Command):
+    """
+    Command that combines multiple commands, so that they are done and undone
+    together.
+    """
+
+    def __init__(self, name: str, commands: t.Sequence[Command]) -> None:
+        super().__init__(all(command.can_undo for command in commands), name)
+        self.commands: t.List[Command] = list(commands)
+
+    def do(self) -> bool:
+        for command in self.commands:
+            if command.do() is False:
+                return False
+        return True
+
+    def undo(self) -> bool:
+        for command in reversed(self.commands):
+            if command.undo() is False:
+                return False
+        return True
+
+    def get_size(self) -> int:
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.commands)
+            + sum(command.get_size() for command in self.commands)
+        )
+
 
 class CommandProcessor:
-    def __init__(self, max_commands: int) -> None:
+    """
+    History of the executed commands for undo and redo.
+
+    The history is limited by the number of commands (`max_commands`) and/or
+    by the approximate memory of the commands (`max_size`, see
+    `Command.get_size`). If a limit is exceeded, the oldest commands are
+    removed. The newest command is always kept, even if it is larger than
+    `max_size`.
+    """
+
+    def __init__(
+        self, max_commands: t.Optional[int] = None, max_size: t.Optional[int] = None
+    ) -> None:
         self._max_commands = max_commands
+        self._max_size = max_size
 
-        self._history: t.List[Command] = []
+        self._history: t.Deque[Command] = collections.deque()
+        self._history_sizes: t.Deque[int] = collections.deque()
+        self._history_size = 0
         self._current_command_idx: t.Optional[int] = None
 
     def can_undo(self) -> bool:
@@ -96,7 +191,8 @@ class CommandProcessor:
         edit menu (if any) updated appropriately. If it fails, the command is
         deleted immediately.
         """
-        command.do()
+        if command.do() is False:
+            return
         self.store(command)
 
     def store(self, command: Command) -> None:
@@ -104,31 +200,63 @@ class CommandProcessor:
         Just store the command without executing it.
 
         Any command that has been undone will be chopped off the history list.
+        If the command can be merged into the current command (see
+        `Command.merge`), no new history entry is created.
         """
+        current_command = self.get_current_command()
+        if (
+            current_command is not None
+            and self.get_next_command() is None
+            and current_command.merge(command)
+        ):
+            command_size = current_command.get_size()
+            self._history_size += command_size - self._history_sizes[-1]
+            self._history_sizes[-1] = command_size
+            return
+
         # We must chop off the current 'branch', so that
         # we're at the end of the command list.
         if self._current_command_idx is None:
             self.clear_commands()
         else:
-            self._history = self._history[: self._current_command_idx + 1]
+            while len(self._history) > self._current_command_idx + 1:
+                self._history.pop()
+                self._history_size -= self._history_sizes.pop()
+
+        # append command to history
+        command_size = command.get_size()
+        self._history.append(command)
+        self._history_sizes.append(command_size)
+        self._history_size += command_size
+        self._current_command_idx = len(self._history) - 1
 
         # Limit history length. Remove fist commands from history
         # if an overflow occures
-        if len(self._history) >= self._max_commands:
-            if self._current_command_idx is None:
-                raise ValueError("history and current_command_idx are out of sync")
-            self._history.pop(0)
-            self._current_command_idx = self._current_command_idx - 1
+        while len(self._history) > 1 and self._is_history_overflowed():
+            self._history.popleft()
+            self._history_size -= self._history_sizes.popleft()
+            self._current_command_idx -= 1
 
-        # append command to history
-        self._current_command_idx = len(self._history)
-        self._history.append(command)
+    def _is_history_overflowed(self) -> bool:
+        if self._max_commands is not None and len(self._history) > self._max_commands:
+            return True
+        if self._max_size is not None and self._history_size > self._max_size:
+            return True
+        return False
+
+    def get_history_size(self) -> int:
+        """
+        Returns the approximate memory of all commands in the history (in bytes).
+        """
+        return self._history_size
 
     def clear_commands(self):
         """
         Deletes all commands in the list and sets the current command pointer to None.
         """
         self._history.clear()
+        self._history_sizes.clear()
+        self._history_size = 0
         self._current_command_idx = None
 
     def get_current_command(self) -> t.Optional[Command]:
@@ -1,19 +1,35 @@
 # -*- coding: utf-8 -*-
 import abc
+import contextlib
+import copy
 import typing as t
 
 import construct as cs
 
 import construct_editor.core.entries as entries
+import construct_editor.core.follow as follow
+import construct_editor.core.incremental_parse as incremental_parse
+import construct_editor.core.list_view as list_view
+import construct_editor.core.session_cache as session_cache
 from construct_editor.core.callbacks import CallbackList
 from construct_editor.core.model import ConstructEditorColumn, ConstructEditorModel
-from construct_editor.core.preprocessor import include_metadata
+from construct_editor.core.preprocessor import (
+    ObjProxyWithGuiMetaData,
+    include_metadata,
+)
 
 
 class ConstructEditor:
     def __init__(self, construct: cs.Construct, model: ConstructEditorModel):
         self._model = model
 
+        # Flag, if the binary data is parsed again after building it (see `build`)
+        self._reparsing_built_binary = False
+
+        # Text and path of the last value, that was copied to the clipboard
+        # (see `paste_entry_value_from_clipboard`)
+        self._copied_value: t.Optional[t.Tuple[str, str]] = None
+
         self.change_construct(construct)
 
         self.on_entry_selected: CallbackList[
@@ -69,6 +85,29 @@ class ConstructEditor:
         This has to be implemented by the derived class.
         """
 
+    def find(
+        self,
+        name: t.Optional[str] = None,
+        value: t.Optional[str] = None,
+        min_value: t.Optional[t.Union[int, float]] = None,
+        max_value: t.Optional[t.Union[int, float]] = None,
+        path: t.Optional[str] = None,
+    ) -> t.List["entries.EntryConstruct"]:
+        """
+        Find all entries that match all given criterias, eg. every `checksum`
+        whose value is 0: `find(name="checksum", min_value=0, max_value=0)`.
+
+        The returned entries can be passed to `select_entry`.
+        See `SearchIndex.find` for the details of the criterias.
+        """
+        return self._model.get_search_index().find(
+            name=name,
+            value=value,
+            min_value=min_value,
+            max_value=max_value,
+            path=path,
+        )
+
     @abc.abstractmethod
     def _put_to_clipboard(self, txt: str):
         """
@@ -91,6 +130,7 @@ class ConstructEditor:
         """
         copy_txt = entry.obj_str
         self._put_to_clipboard(copy_txt)
+        self._copied_value = (copy_txt, entries.create_path_str(entry.path))
 
     def copy_entry_path_to_clipboard(self, entry: "entries.EntryConstruct"):
         """
@@ -107,11 +147,89 @@ class ConstructEditor:
         if txt is None:
             return
 
-        # TODO: This does not work correctly, because the clipboard only saves
-        # strings. So here is a string to entry.obj conversation needed, which is
-        # not so easy.
-        # self.model.set_value(txt, entry, ConstructEditorColumn.Value)
-        # self.on_root_obj_changed.fire(self.root_obj)
+        # TODO: Text from outside of the editor cannot be pasted yet, because
+        # the clipboard only saves strings. So here is a string to entry.obj
+        # conversation needed, which is not so easy.
+        if self._copied_value is None or self._copied_value[0] != txt:
+            return
+
+        # The text was copied from an entry of this editor, so the value can
+        # be taken directly from the object of the copied path.
+        copied_path_str = self._copied_value[1]
+        copied_entry = self._model.get_entry(copied_path_str)
+        if copied_entry is None or copied_entry.subentries is not None:
+            return
+        if copied_entry.typ_str != entry.typ_str:
+            return
+        try:
+            obj = self._model.get_obj(copied_path_str)
+        except KeyError:
+            return
+
+        # The GUI metadata of the copied object must not be modified
+        if isinstance(obj, ObjProxyWithGuiMetaData):
+            obj = obj.__wrapped__
+        else:
+            obj = copy.copy(obj)
+
+        self._model.set_value(obj, entry, ConstructEditorColumn.Value)
+
+    @contextlib.contextmanager
+    def batch_edit(self, name: str = "Batch edit") -> t.Iterator[None]:
+        """
+        Combine all value changes in this context to one command, that can be
+        undone at once (see `ConstructEditorModel.batch_edit`).
+
+        The callbacks of `on_root_obj_changed` (eg. building and parsing the
+        binary data again) are only called once at the end of the context.
+        """
+        outermost = not self._model.in_batch_edit
+        with self._model.batch_edit(name):
+            yield
+        if outermost:
+            self.on_root_obj_changed.fire(self._model.root_obj)
+
+    def undo(self) -> bool:
+        """
+        Undo the last value change. The value is changed back like a normal
+        edit: the changed entry is updated (see `ChangeValueCmd`) and the
+        callbacks of `on_root_obj_changed` build the binary data again. After
+        that only the entries with changed values are updated (see `parse`).
+
+        :return: True if a change was undone, False if there is nothing to undo
+            or the value was changed in the meantime
+        """
+        if not self._model.command_processor.undo():
+            return False
+        self.on_root_obj_changed.fire(self._model.root_obj)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Redo the last undone value change (see `undo`).
+
+        :return: True if a change was redone
+        """
+        if not self._model.command_processor.redo():
+            return False
+        self.on_root_obj_changed.fire(self._model.root_obj)
+        return True
+
+    def set_values(
+        self, values: t.Iterable[t.Tuple[str, t.Any]], name: str = "Batch edit"
+    ) -> None:
+        """
+        Set the values of multiple entries as one command (see `batch_edit`).
+
+        :param values: pairs of path string (eg. "root.sections[3].name") and new value
+        :raises KeyError: if no entry exists for a path, then no value is changed
+        """
+        with self.batch_edit(name):
+            for path_str, value in values:
+                entry = self._model.get_entry(path_str)
+                if entry is None:
+                    raise KeyError(path_str)
+                self._model.set_value(value, entry, ConstructEditorColumn.Value)
 
     def change_construct(self, constr: cs.Construct) -> None:
         """
@@ -134,6 +252,13 @@ class ConstructEditor:
         )
 
         self._model.list_viewed_entries.clear()
+        self._model.list_view_states.clear()
+        self._model.clear_array_tables()
+        self._model.clear_search_index()
+
+        # the compared object was parsed with the old construct
+        self._model.compare_root_obj = None
+        self._model.update_diff()
 
     def change_hide_protected(self, hide_protected: bool) -> None:
         """
@@ -141,12 +266,14 @@ class ConstructEditor:
         A protected member starts with an undescore (_)
         """
         self._model.hide_protected = hide_protected
+        self._model.clear_array_tables()
         self.reload()
 
     def parse(self, binary: bytes, **contextkw: t.Any):
         """
         Parse binary data to struct.
         """
+        old_root_obj = self._model.root_obj
         try:
             self._model.root_obj = self._construct.parse(binary, **contextkw)
             self.show_parse_error_message(None, None)
@@ -155,8 +282,78 @@ class ConstructEditor:
                 f"Error while parsing binary data: {type(e).__name__}\n{str(e)}", e
             )
             self._model.root_obj = None
+        self._model.clear_array_tables()
+        if self._model.compare_root_obj is not None:
+            self._model.update_diff()
+
+        # When the binary data was built from the changed root_obj (eg. after
+        # an edit or an undo), normally only the changed entries have to be
+        # updated instead of reloading the whole view.
+        if self._reparsing_built_binary:
+            if self._model.update_changed_values(old_root_obj):
+                return
+        else:
+            self._model.clear_search_index()
+
+            # clear all commands, when new data is set from external
+            self._model.command_processor.clear_commands()
+        self._model.invalidate_render_cache()
+        self.reload()
+
+    def parse_append(
+        self, binary: t.Union[bytes, bytearray], **contextkw: t.Any
+    ) -> bool:
+        """
+        Parse only the data, that was appended to the parsed binary data (eg.
+        of a log file, that is still written). The new elements are appended
+        to the root object, so the view state of the old elements is kept.
+
+        This is only possible, if the top-level construct is a `cs.GreedyRange`
+        (see `incremental_parse.parse_appended`).
+
+        :return: True if the appended data was parsed, else `parse` has to be used
+        """
+        if self._model.root_obj is None:
+            return False
+
+        # the tables share the data of the stream, which would have to be
+        # copied when data is appended
+        self._model.clear_array_tables()
+        try:
+            count = incremental_parse.parse_appended(
+                self._construct, self._model.root_obj, binary, **contextkw
+            )
+        except Exception:
+            return False  # the error is shown by the complete parse
+        if count is None:
+            return False
+
+        if count > 0:
+            self._model.invalidate_render_cache()
+            self._model.invalidate_path_index()
+            self._model.clear_search_index()
+            if self._model.compare_root_obj is not None:
+                self._model.update_diff()
+            self.reload()
+        return True
+
+    def show_follow_window(self, window: "follow.FollowWindow") -> None:
+        """
+        Show the records of a followed stream (see `follow.FollowWindow`).
+        This has to be called again after new data was fed to the window.
 
-        # clear all commands, when new data is set from external
+        The window has to be created with `construct` of this editor.
+        """
+        self._model.root_obj = window.root_obj
+        self.show_parse_error_message(None, None)
+        self._model.invalidate_render_cache()
+        self._model.invalidate_path_index()
+        self._model.clear_array_tables()
+        self._model.clear_search_index()
+        if self._model.compare_root_obj is not None:
+            self._model.update_diff()
+
+        # the commands would keep the evicted records alive
         self._model.command_processor.clear_commands()
         self.reload()
 
@@ -175,10 +372,136 @@ class ConstructEditor:
 
         # Parse the build binary, so that constructs that parses from nothing
         # are shown correctly (eg. cs.Peek, cs.Pointer).
-        self.parse(binary, **contextkw)
+        try:
+            self._reparsing_built_binary = True
+            self.parse(binary, **contextkw)
+        finally:
+            self._reparsing_built_binary = False
 
         return binary
 
+    def compare(self, binary: t.Optional[bytes], **contextkw: t.Any):
+        """
+        Compare the parsed data with another binary of the same format (eg. a
+        second capture). The other binary is parsed with the same construct
+        and the differences are compared by the paths of the entries
+        (see `model.diff`). Pass None to end the compare mode.
+
+        :raises Exception: if the other binary cannot be parsed
+        """
+        if binary is None:
+            self._model.compare_root_obj = None
+        else:
+            self._model.compare_root_obj = self._construct.parse(binary, **contextkw)
+        self._model.update_diff()
+        self.reload()
+
+    def save_session(
+        self,
+        cache: "session_cache.SessionCache",
+        file_path: str,
+        file_stamp: "session_cache.FileStamp",
+        **contextkw: t.Any,
+    ) -> bool:
+        """
+        Save the parsed data and the view state (expanded entries and list
+        views) of a file, that was parsed with `parse`, to a session cache.
+        `file_stamp` is the stamp of the file, when it was read (see
+        `session_cache.read_file`).
+
+        :return: True if the session was saved
+        """
+        if self._model.root_obj is None:
+            return False
+
+        session = session_cache.Session(
+            root_obj=self._model.root_obj,
+            expanded_paths=self._get_expanded_paths(),
+            list_views=self._get_list_view_settings(),
+        )
+        return cache.save(file_path, file_stamp, self._construct, contextkw, session)
+
+    def restore_session(
+        self,
+        cache: "session_cache.SessionCache",
+        file_path: str,
+        file_stamp: "session_cache.FileStamp",
+        binary: bytes,
+        **contextkw: t.Any,
+    ) -> bool:
+        """
+        Restore the parsed data and the view state of a file from a session
+        cache, instead of parsing `binary` (the content of the file) again.
+        `file_stamp` is the stamp of the file, when it was read (see
+        `session_cache.read_file`).
+
+        :return: True if the session was restored, else the binary has to be parsed
+        """
+        session = cache.load(
+            file_path, file_stamp, self._construct, contextkw, binary
+        )
+        if session is None:
+            return False
+
+        self._model.root_obj = session.root_obj
+        self.show_parse_error_message(None, None)
+        self._model.invalidate_render_cache()
+        self._model.clear_array_tables()
+        if self._model.compare_root_obj is not None:
+            self._model.update_diff()
+        self._model.clear_search_index()
+        self._model.command_processor.clear_commands()
+
+        # the list views have to be restored first, because they change the
+        # children of the entries
+        self._model.list_viewed_entries.clear()
+        self._model.list_view_states.clear()
+        for settings in session.list_views:
+            entry = self._model.get_entry(settings.path_str)
+            if entry is None:
+                continue
+            self._model.list_viewed_entries.append(entry)
+            state = self._model.get_list_view_state(entry)
+            if settings.filter_expression is not None:
+                state.predicate = list_view.ListViewPredicate(
+                    settings.filter_expression
+                )
+            state.sort = settings.sort
+
+        for path_str in session.expanded_paths:
+            entry = self._model.get_entry(path_str)
+            if entry is not None:
+                entry.row_expanded = True
+
+        self.reload()
+        return True
+
+
+    def _get_expanded_paths(self) -> t.List[str]:
+        """Get the paths of all expanded entries, that are visible"""
+        expanded_paths: t.List[str] = []
+        stack = list(reversed(self._model.get_children(None)))
+        while stack:
+            entry = stack.pop()
+            if not self._model.is_container(entry) or not entry.row_expanded:
+                continue
+            expanded_paths.append(entries.create_path_str(entry.path))
+            stack.extend(reversed(self._model.get_children(entry)))
+        return expanded_paths
+
+    def _get_list_view_settings(self) -> t.List["session_cache.ListViewSettings"]:
+        settings: t.List["session_cache.ListViewSettings"] = []
+        for entry in self._model.list_viewed_entries:
+            state = self._model.list_view_states.get(entry)
+            settings.append(
+                session_cache.ListViewSettings(
+                    path_str=entries.create_path_str(entry.path),
+                    filter_expression=self.get_list_view_filter(entry),
+                    sort=state.sort if state is not None else None,
+                )
+            )
+        return settings
+
     @abc.abstractmethod
     def expand_entry(self, entry: "entries.EntryConstruct"):
         """
@@ -193,11 +516,37 @@ class ConstructEditor:
         """
         self.expand_entry(entry)
 
+        # the rows of a table have no entries (see `model.get_table_rows`)
+        if self._model.get_array_table(entry) is not None:
+            return
+
         subentries = entry.subentries
         if subentries is not None:
             for sub_entry in subentries:
                 self.expand_children(sub_entry)
 
+    def expand_parents(self, entry: "entries.EntryConstruct") -> None:
+        """
+        Expand all parents of an entry, so that the entry is shown in the view.
+
+        If the entry is an element of an array that is shown as table, only
+        the parents of the table are expanded, because the element is shown
+        as row of the table (see `ConstructEditorModel.get_table_row`).
+        """
+        parents: t.List["entries.EntryConstruct"] = []
+        parent = entry.parent
+        while parent is not None:
+            parents.insert(0, parent)
+            parent = parent.parent
+
+        # `get_children` updates the `visible_row` flags of the children
+        self._model.get_children(None)
+        for parent in parents:
+            self._model.get_children(parent)
+            self.expand_entry(parent)
+            if self._model.get_array_table(parent) is not None:
+                return
+
     def expand_all(self):
         """
         Expand all entries.
@@ -211,6 +560,11 @@ class ConstructEditor:
         """
 
         def dvc_expand(entry: "entries.EntryConstruct", current_level: int):
+            # the rows of a table have no entries (see `model.get_table_rows`)
+            if self._model.get_array_table(entry) is not None:
+                self.expand_entry(entry)
+                return
+
             subentries = entry.subentries
             if subentries is None:
                 return
@@ -236,10 +590,12 @@ class ConstructEditor:
         """
         Collapse all children of an entry recursively including the entry itself.
         """
-        subentries = entry.subentries
-        if subentries is not None:
-            for sub_entry in subentries:
-                self.collapse_children(sub_entry)
+        # the rows of a table have no entries (see `model.get_table_rows`)
+        if self._model.get_array_table(entry) is None:
+            subentries = entry.subentries
+            if subentries is not None:
+                for sub_entry in subentries:
+                    self.collapse_children(sub_entry)
 
         self.collapse_entry(entry)
 
@@ -298,6 +654,8 @@ class ConstructEditor:
             return
 
         self._model.list_viewed_entries.remove(entry)
+        self._model.list_view_states.pop(entry, None)
+        self._model.clear_array_tables()
         self.reload()
 
     def is_list_view_enabled(self, entry: "entries.EntryConstruct") -> bool:
@@ -308,6 +666,92 @@ class ConstructEditor:
             return True
         return False
 
+    def sort_list_view(
+        self,
+        entry: "entries.EntryConstruct",
+        column: t.Optional[int],
+        descending: t.Optional[bool] = None,
+    ):
+        """
+        Sort the rows of a list viewed entry by one of the list viewed columns.
+
+        If `descending` is None, the order is toggled when the entry is already
+        sorted by this column. If `column` is None, the sorting is removed.
+        """
+        if not self.is_list_view_enabled(entry):
+            return
+
+        state = self._model.get_list_view_state(entry)
+        if column is None:
+            state.sort = None
+        else:
+            if descending is None:
+                descending = state.sort == (column, False)
+            state.sort = (column, descending)
+        state.invalidate()
+        self.reload()
+
+    def filter_list_view(
+        self, entry: "entries.EntryConstruct", expression: t.Optional[str]
+    ):
+        """
+        Filter the rows of a list viewed entry, eg. with `len > 1400 and proto == 6`.
+
+        The names in the expression are the names of the list viewed columns.
+        If `expression` is None or empty, the filter is removed. An invalid
+        expression raises a `ListViewFilterError` and the old filter remains.
+        """
+        if not self.is_list_view_enabled(entry):
+            return
+
+        state = self._model.get_list_view_state(entry)
+        old_predicate = state.predicate
+        if expression is None or expression.strip() == "":
+            state.predicate = None
+        else:
+            state.predicate = list_view.ListViewPredicate(expression)
+        state.invalidate()
+
+        # evaluate the filter now, so that errors are raised to the caller
+        try:
+            if self._model.get_array_table(entry) is not None:
+                self._model.get_table_rows(entry)
+            else:
+                self._model.get_children(entry)
+            error = state.error
+            if error is not None:
+                state.predicate = old_predicate
+                state.invalidate()
+                raise error
+        finally:
+            self.reload()
+
+    def get_list_view_filter(self, entry: "entries.EntryConstruct") -> t.Optional[str]:
+        """
+        Get the filter expression of a list viewed entry (or None if not filtered).
+        """
+        state = self._model.list_view_states.get(entry)
+        if state is None or state.predicate is None:
+            return None
+        return state.predicate.expression
+
+    @abc.abstractmethod
+    def show_array_statistics(self, entry: "entries.EntryArray"):
+        """
+        Show the statistics of all fields of an array to the user
+        (see `ConstructEditorModel.get_array_statistics`).
+
+        This has to be implemented by the derived class.
+        """
+
+    @abc.abstractmethod
+    def edit_list_view_filter(self, entry: "entries.EntryConstruct"):
+        """
+        Let the user edit the filter expression of a list viewed entry.
+
+        This has to be implemented by the derived class.
+        """
+
     @property
     def construct(self) -> cs.Construct:
         """
@@ -352,6 +796,11 @@ class ConstructEditor:
         """
         column_count = 0
         for list_viewed_entry in self._model.list_viewed_entries:
+            table = self._model.get_array_table(list_viewed_entry)
+            if table is not None:
+                column_count = max(column_count, len(table.columns))
+                continue
+
             if list_viewed_entry.subentries is None:
                 continue
             for subentry in list_viewed_entry.subentries:
@@ -369,6 +818,13 @@ class ConstructEditor:
         columns than subentries in the selected entry or no selected entry is
         passed, the column number is used as label.
         """
+        # the rows of a table have no entries, so the array itself is selected
+        table = self._model.get_array_table(selected_entry)
+        if table is None:
+            table = self._model.get_array_table(selected_entry.parent)
+        if table is not None:
+            return table.column_names
+
         column_names: t.List[str] = []
         flat_list = self._model.create_flat_subentry_list(selected_entry)
         for entry in flat_list:
@@ -201,10 +201,10 @@ class ContextMenu:
         self.parent.paste_entry_value_from_clipboard(self.entry)
 
     def on_undo(self):
-        self.model.command_processor.undo()
+        self.parent.undo()
 
     def on_redo(self):
-        self.model.command_processor.redo()
+        self.parent.redo()
 
     def on_hide_protected(self, checked: bool):
         self.parent.change_hide_protected(checked)
@@ -16,6 +16,7 @@ def add_custom_transparent_subconstruct(
     """
     preprocessor.custom_subconstructs.append(subconstruct)
     entries.construct_entry_mapping[subconstruct] = entries.EntryTransparentSubcon
+    entries.clear_entry_class_cache()
 
 
 def add_custom_tunnel(
@@ -27,6 +28,8 @@ def add_custom_tunnel(
     """
 
     class EntryTunnel(entries.EntrySubconstruct):
+        __slots__ = ()
+
         def __init__(
             self,
             model: "model.ConstructEditorModel",
@@ -42,6 +45,7 @@ def add_custom_tunnel(
             return f"{type_str}[{self.subentry.typ_str}]"
 
     entries.construct_entry_mapping[tunnel] = EntryTunnel
+    entries.clear_entry_class_cache()
 
 
 class AdapterObjEditorType(enum.Enum):
@@ -63,6 +67,8 @@ def add_custom_adapter(
     """
 
     class EntryAdapter(entries.EntryConstruct):
+        __slots__ = ()
+
         def __init__(
             self,
             model: "model.ConstructEditorModel",
@@ -91,3 +97,4 @@ def add_custom_adapter(
                 return entries.ObjViewSettings_Default(self)
 
     entries.construct_entry_mapping[adapter] = EntryAdapter
+    entries.clear_entry_class_cache()
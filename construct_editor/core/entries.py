@@ -2,7 +2,9 @@
 import dataclasses
 import enum
 import io
+import re
 import string
+import textwrap
 import typing as t
 from typing import Any, Dict, List, Optional, Type
 
@@ -10,6 +12,7 @@ import construct as cs
 import construct_typed as cst
 
 import construct_editor.core.model as model
+import construct_editor.core.restreamed as restreamed
 from construct_editor.core.context_menu import (
     ButtonMenuItem,
     CheckboxMenuItem,
@@ -19,7 +22,10 @@ from construct_editor.core.context_menu import (
 from construct_editor.core.preprocessor import (
     GuiMetaData,
     IncludeGuiMetaData,
+    LazyObj,
     get_gui_metadata,
+    get_gui_metadata_of_construct,
+    resolve_lazy,
 )
 
 
@@ -50,6 +56,32 @@ def str_to_bytes(s: str) -> bytes:
     return bytes.fromhex(s)
 
 
+# translation table, that replaces all non printable characters with "."
+_ASCII_VIEW_TRANSLATION = bytes(
+    b if chr(b) in string.printable else ord(".") for b in range(256)
+)
+
+
+class _RenderCache:
+    """
+    Cached strings of an entry, that are displayed in the view.
+
+    The cache is cleared, when the value of the entry has changed (see
+    `EntryConstruct.invalidate_render_cache`). It is also only valid as long
+    as `generation` is equal to the `render_generation` of the model, which
+    changes when all strings may have changed (eg. the integer format).
+    """
+
+    __slots__ = ("generation", "obj_str", "typ_str", "name_tooltip", "type_tooltip")
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.obj_str: t.Optional[str] = None
+        self.typ_str: t.Optional[str] = None
+        self.name_tooltip: t.Optional[str] = None
+        self.type_tooltip: t.Optional[str] = None
+
+
 @dataclasses.dataclass
 class ObjViewSettings_Default:
     entry: "EntryConstruct"
@@ -102,45 +134,6 @@ ObjViewSettings = t.Union[
 ]
 
 
-def _convert_restreamed(stream: cs.RestreamedBytesIO) -> io.BytesIO:
-    """
-    Helper method to convert a `RestreamedBytesIO` to a normal `BytesIO`.
-    This is eg. nessesary for:
-      - `cs.Bitwise(cs.GreedyRange(cs.Bit))`
-      - `cs.BitsSwapped(cs.Bitwise(cs.GreedyRange(cs.Bit)))`
-    """
-
-    def reset_substream_recursively(stream: t.Union[io.BytesIO, cs.RestreamedBytesIO]):
-        if isinstance(stream, cs.RestreamedBytesIO):
-            if stream.substream is None:
-                raise RuntimeError(
-                    "stream.substream has to be io.BytesIO or cs.RestreamedBytesIO"
-                )
-            return reset_substream_recursively(stream.substream)
-        else:
-            stream.seek(0)
-
-    # check if there is already a cached version
-    bytes_io_stream: t.Optional[io.BytesIO] = getattr(
-        stream, "_construct_bytes_io", None
-    )
-
-    if bytes_io_stream is None:
-        # reset substream recursively, so that the whole RestreamedBytesIO can be read again
-        reset_substream_recursively(stream)
-
-        # read the entire RestreamedBytesIO
-        data = stream.read()
-
-        # create a new BytesIO with the data of the RestreamedBytesIO
-        bytes_io_stream = io.BytesIO(data)
-
-        # cache the created stream, so that we dont have to do it again
-        setattr(stream, "_construct_bytes_io", bytes_io_stream)
-
-    return bytes_io_stream
-
-
 @dataclasses.dataclass
 class EnumItem:
     name: str
@@ -161,6 +154,14 @@ class StreamInfo:
     byte_range: t.Tuple[int, int]
     bitstream: bool
 
+    # Offset of the first byte of `stream` in the whole stream. This is not 0,
+    # if only a part of the stream is available (eg. for RestreamedBytesIO)
+    offset: int = 0
+
+    # True if `stream` contains the bits of a bitstream packed into bytes
+    # (8 bits per byte). `byte_range` and `offset` are bit positions then.
+    packed_bits: bool = False
+
 
 class NameExcludedFromPath(str):
     pass
@@ -187,12 +188,52 @@ def create_path_str(path: PathType) -> str:
     return path_str
 
 
+_PATH_STR_REGEX = re.compile(r"(\[\d+\])|\.?([^.\[\]]+)")
+
+
+def parse_path_str(path_str: str) -> PathType:
+    """
+    Split a path string (see `create_path_str`) into the path.
+
+    Eg. "root.sections[3].name" -> ["root", "sections", "[3]", "name"]
+    """
+    path: PathType = []
+    pos = 0
+    while pos < len(path_str):
+        match = _PATH_STR_REGEX.match(path_str, pos)
+        if match is None or (pos == 0 and path_str.startswith(".")):
+            raise ValueError(f"invalid path string: {path_str!r}")
+        index, name = match.groups()
+        if index is not None:
+            path.append(ListIndexName(index))
+        else:
+            path.append(name)
+        pos = match.end()
+    return path
+
+
 # #####################################################################################################################
 # Construct Entries ###################################################################################################
 # #####################################################################################################################
 
 # EntryConstruct ######################################################################################################
+# Bits of `EntryConstruct._flags`
+_FLAG_VISIBLE_ROW = 0x01
+_FLAG_ROW_EXPANDED = 0x02
+_FLAG_ASCII_VIEW = 0x04
+
+
 class EntryConstruct(object):
+    __slots__ = (
+        "model",
+        "_parent",
+        "_construct",
+        "_name",
+        "_docs",
+        "_flags",
+        "_render_cache",
+    )
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -207,17 +248,23 @@ class EntryConstruct(object):
         self._name = name
         self._docs = docs
 
-        # Flag, if this entry is an own row in the view.
-        # This is nessesarry, because most `subcon` in an `Subconstruct` is not
-        # visible as an own row in the view. So to detect the visible row of an
-        # entry we can iterate through the parents till we find an visible row.
-        self._visible_row: bool = False
-
-        # Flag if this row is expanded or not.
-        # Only valid, if self._visible_row is True. This is needed because the
-        # expansion state is sometimes not saved in the view itself while reloading
-        # the view (eg. in wxPython).
-        self._row_expanded: bool = False
+        # Boolean flags of the entry, packed into one integer (see `_FLAG_*`):
+        #
+        # - _FLAG_VISIBLE_ROW: Flag, if this entry is an own row in the view.
+        #   This is nessesarry, because most `subcon` in an `Subconstruct` is not
+        #   visible as an own row in the view. So to detect the visible row of an
+        #   entry we can iterate through the parents till we find an visible row.
+        #
+        # - _FLAG_ROW_EXPANDED: Flag if this row is expanded or not.
+        #   Only valid, if _FLAG_VISIBLE_ROW is set. This is needed because the
+        #   expansion state is sometimes not saved in the view itself while reloading
+        #   the view (eg. in wxPython).
+        #
+        # - _FLAG_ASCII_VIEW: Only used by `EntryBytes` (see `ascii_view`).
+        self._flags: int = 0
+
+        # Cache for the strings, that are displayed in the view
+        self._render_cache: t.Optional[_RenderCache] = None
 
     def get_debug_infos(self) -> str:
         s = ""
@@ -245,35 +292,99 @@ class EntryConstruct(object):
     # default "obj" ###########################################################
     @property
     def obj(self) -> Any:
-        path = self.path
-        obj = self.model.root_obj
-        for p in path[1:]:
-            if isinstance(obj, dict) or isinstance(obj, cst.DataclassMixin):
-                obj = obj[p]
-            elif isinstance(obj, list):
-                obj = obj[int(p.strip("[]"))]
-        return obj
+        return resolve_lazy(self._get_unresolved_obj())
 
     @obj.setter
     def obj(self, val: Any):
         path = self.path
         obj = self.model.root_obj
         for p in path[1:-1]:
+            obj = resolve_lazy(obj)
             if isinstance(obj, dict) or isinstance(obj, cst.DataclassMixin):
                 obj = obj[p]
             elif isinstance(obj, list):
                 obj = obj[int(p.strip("[]"))]
 
+        obj = resolve_lazy(obj)
         if isinstance(obj, dict) or isinstance(obj, cst.DataclassMixin):
             obj[path[-1]] = val
         elif isinstance(obj, list):
             obj[int(path[-1].strip("[]"))] = val
 
+    def _get_unresolved_obj(self) -> Any:
+        """
+        Get the object of the entry, without parsing it, if it is a `LazyObj`
+        (the objects of the parents are always parsed).
+        """
+        path = self.path
+        obj = self.model.root_obj
+        for p in path[1:]:
+            obj = resolve_lazy(obj)
+            if isinstance(obj, dict) or isinstance(obj, cst.DataclassMixin):
+                obj = obj[p]
+            elif isinstance(obj, list):
+                obj = obj[int(p.strip("[]"))]
+        return obj
+
     # default "obj_str" #######################################################
     @property
     def obj_str(self) -> str:
         return str(self.obj)
 
+    # cached "obj_str", "typ_str" and tooltips ################################
+    def _get_render_cache(self) -> _RenderCache:
+        cache = self._render_cache
+        generation = self.model.render_generation
+        if cache is None or cache.generation != generation:
+            cache = _RenderCache(generation)
+            self._render_cache = cache
+        return cache
+
+    def invalidate_render_cache(self) -> None:
+        """
+        Invalidate the cached strings of this entry (see `cached_obj_str`),
+        eg. after its value has changed.
+        """
+        self._render_cache = None
+
+    @property
+    def cached_obj_str(self) -> str:
+        """
+        Same as `obj_str`, but the string is only created again, when the
+        value has changed (see `invalidate_render_cache`).
+        """
+        cache = self._get_render_cache()
+        if cache.obj_str is None:
+            cache.obj_str = self.obj_str
+        return cache.obj_str
+
+    @property
+    def cached_typ_str(self) -> str:
+        """
+        Same as `typ_str`, but the string is only created again, when the
+        value has changed (see `invalidate_render_cache`).
+        """
+        cache = self._get_render_cache()
+        if cache.typ_str is None:
+            cache.typ_str = self.typ_str
+        return cache.typ_str
+
+    @property
+    def name_tooltip(self) -> str:
+        """Tooltip for the name of the entry."""
+        cache = self._get_render_cache()
+        if cache.name_tooltip is None:
+            cache.name_tooltip = textwrap.dedent(self.docs or self.name).strip()
+        return cache.name_tooltip
+
+    @property
+    def type_tooltip(self) -> str:
+        """Tooltip for the type of the entry."""
+        cache = self._get_render_cache()
+        if cache.type_tooltip is None:
+            cache.type_tooltip = str(self.construct)
+        return cache.type_tooltip
+
     # default "obj_metadata" ##################################################
     @property
     def obj_metadata(self) -> t.Optional[GuiMetaData]:
@@ -305,11 +416,11 @@ class EntryConstruct(object):
     # default "visible_row" ###################################################
     @property
     def visible_row(self) -> bool:
-        return self._visible_row
+        return (self._flags & _FLAG_VISIBLE_ROW) != 0
 
     @visible_row.setter
     def visible_row(self, val: bool):
-        self._visible_row = val
+        self._set_flag(_FLAG_VISIBLE_ROW, val)
 
     # default "get_visible_row_entry" #########################################
     def get_visible_row_entry(self) -> t.Optional["EntryConstruct"]:
@@ -319,7 +430,7 @@ class EntryConstruct(object):
         the visible row.
         """
         # Check if this is the visible row
-        if self._visible_row is True:
+        if self._flags & _FLAG_VISIBLE_ROW:
             return self
 
         # Check if a parent is available. If not this is the root object
@@ -332,11 +443,17 @@ class EntryConstruct(object):
     # default "row_expanded" ##################################################
     @property
     def row_expanded(self) -> bool:
-        return self._row_expanded
+        return (self._flags & _FLAG_ROW_EXPANDED) != 0
 
     @row_expanded.setter
     def row_expanded(self, val: bool):
-        self._row_expanded = val
+        self._set_flag(_FLAG_ROW_EXPANDED, val)
+
+    def _set_flag(self, flag: int, val: bool):
+        if val:
+            self._flags |= flag
+        else:
+            self._flags &= ~flag
 
     # default "obj_view_settings" #############################################
     @property
@@ -379,7 +496,7 @@ class EntryConstruct(object):
         if metadata is None:
             return stream_infos
 
-        stream = metadata["stream"]
+        stream = metadata.stream
 
         # Add StreamInfos from parent, if a parent exists
         if self.parent is not None:
@@ -389,9 +506,19 @@ class EntryConstruct(object):
         if child_stream != stream:
             bitstream = getattr(stream, "_construct_bitstream_flag", False)
 
+            offset = 0
+            packed_bits = False
+            if bitstream:
+                packed = restreamed.get_packed_bits(stream, metadata.byte_range)
+                if packed is not None:
+                    stream, offset = packed
+                    packed_bits = True
+
             # Some special handling for RestreamedBytesIO
-            if isinstance(stream, cs.RestreamedBytesIO):
-                stream = _convert_restreamed(stream)
+            if not packed_bits and isinstance(stream, cs.RestreamedBytesIO):
+                stream, offset = restreamed.get_restreamed_window(
+                    stream, metadata.byte_range
+                )
 
             if not isinstance(stream, io.BytesIO):
                 raise RuntimeError("stream has to be io.BytesIO")
@@ -400,8 +527,10 @@ class EntryConstruct(object):
                 StreamInfo(
                     stream=stream,
                     path_str=create_path_str(self.path[:-1]),
-                    byte_range=(metadata["byte_range"]),
+                    byte_range=metadata.byte_range,
                     bitstream=bitstream,
+                    offset=offset,
+                    packed_bits=packed_bits,
                 )
             )
 
@@ -410,6 +539,8 @@ class EntryConstruct(object):
 
 # EntrySubconstruct ###################################################################################################
 class EntrySubconstruct(EntryConstruct):
+    __slots__ = ("subentry",)
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -451,6 +582,8 @@ class EntrySubconstruct(EntryConstruct):
 
 # EntryStruct #########################################################################################################
 class EntryStruct(EntryConstruct):
+    __slots__ = ("_subentries",)
+
     construct: "cs.Struct[Any, Any]"
 
     def __init__(
@@ -515,6 +648,8 @@ class EntryStruct(EntryConstruct):
 
 # EntryArray ##########################################################################################################
 class EntryArray(EntrySubconstruct):
+    __slots__ = ("_subentries",)
+
     construct: t.Union[
         "cs.Array[Any, Any, Any, Any]", "cs.GreedyRange[Any, Any, Any, Any]"
     ]
@@ -546,10 +681,11 @@ class EntryArray(EntrySubconstruct):
             else:
                 array_len = 1
 
-        # append entries if not appended yet
+        # append entries if not appended yet (the entries of the existing
+        # elements are kept, eg. when elements are appended to the array)
         if len(self._subentries) != array_len:
-            self._subentries.clear()
-            for index in range(0, array_len):
+            del self._subentries[array_len:]
+            for index in range(len(self._subentries), array_len):
                 subentry = create_entry_from_construct(
                     self.model,
                     self,
@@ -587,6 +723,9 @@ class EntryArray(EntrySubconstruct):
         def on_collapse_children_clicked():
             menu.parent.collapse_children(self)
 
+        def on_show_statistics_clicked():
+            menu.parent.show_array_statistics(self)
+
         menu.add_menu_item(SeparatorMenuItem())
         menu.add_menu_item(
             ButtonMenuItem(
@@ -604,6 +743,14 @@ class EntryArray(EntrySubconstruct):
                 on_collapse_children_clicked,
             )
         )
+        menu.add_menu_item(
+            ButtonMenuItem(
+                "Show Statistics",
+                None,
+                self.model.root_obj is not None,
+                on_show_statistics_clicked,
+            )
+        )
 
         # If the subentry has no subentries itself, it makes no sense to create a list view.
         temp_subentry = create_entry_from_construct(
@@ -628,10 +775,42 @@ class EntryArray(EntrySubconstruct):
                 on_menu_item_clicked,
             )
         )
+        if not menu.parent.is_list_view_enabled(self):
+            return
+
+        def on_filter_clicked():
+            menu.parent.edit_list_view_filter(self)
+
+        def on_clear_filter_clicked():
+            menu.parent.filter_list_view(self, None)
+
+        def on_clear_sorting_clicked():
+            menu.parent.sort_list_view(self, None)
+
+        list_view_state = self.model.list_view_states.get(self)
+        menu.add_menu_item(ButtonMenuItem("Filter...", None, True, on_filter_clicked))
+        menu.add_menu_item(
+            ButtonMenuItem(
+                "Clear Filter",
+                None,
+                (list_view_state is not None) and (list_view_state.predicate is not None),
+                on_clear_filter_clicked,
+            )
+        )
+        menu.add_menu_item(
+            ButtonMenuItem(
+                "Clear Sorting",
+                None,
+                (list_view_state is not None) and (list_view_state.sort is not None),
+                on_clear_sorting_clicked,
+            )
+        )
 
 
 # EntryIfThenElse #####################################################################################################
 class EntryIfThenElse(EntryConstruct):
+    __slots__ = ("_subentry_then", "_subentry_else", "_subentries")
+
     construct: "cs.IfThenElse[Any, Any]"
 
     def __init__(
@@ -672,13 +851,11 @@ class EntryIfThenElse(EntryConstruct):
         if obj is None:
             return None
 
-        metadata = get_gui_metadata(obj)
-        if metadata is None:
+        metadata = get_gui_metadata_of_construct(obj, self.construct)
+        if metadata is None or metadata.selector is None:
             return None
 
-        ctx = metadata["context"]
-        cond = evaluate(self.construct.condfunc, ctx)
-        if cond:
+        if metadata.selector:
             return self._subentry_then
         else:
             return self._subentry_else
@@ -725,6 +902,8 @@ class EntryIfThenElse(EntryConstruct):
 
 # EntrySwitch #########################################################################################################
 class EntrySwitch(EntryConstruct):
+    __slots__ = ("_subentries", "_subentry_cases", "_subentry_default")
+
     construct: "cs.Switch[Any, Any]"
 
     def __init__(
@@ -737,22 +916,32 @@ class EntrySwitch(EntryConstruct):
     ):
         super().__init__(model, parent, construct, name, docs)
 
-        self._subentries: List[EntryConstruct] = []
-        self._subentry_cases: Dict[str, EntryConstruct] = {}
+        # The entries of the cases are created on demand, because normally
+        # only one case of a Switch is used.
+        self._subentries: Optional[List[EntryConstruct]] = None
+        self._subentry_cases: Dict[Any, EntryConstruct] = {}
         self._subentry_default: Optional[EntryConstruct] = None
 
-        for key, value in self.construct.cases.items():
+    def _get_case_subentry(self, key: Any) -> "Optional[EntryConstruct]":
+        """Get the entry of a case (or of the default), create it if not done yet"""
+        if key not in self.construct.cases:
+            return self._get_default_subentry()
+
+        subentry_case = self._subentry_cases.get(key)
+        if subentry_case is None:
             subentry_case = create_entry_from_construct(
                 self.model,
                 self,
-                value,
+                self.construct.cases[key],
                 NameExcludedFromPath(f"Case {self.construct.keyfunc} == {str(key)}"),
                 "",
             )
             self._subentry_cases[key] = subentry_case
-            self._subentries.append(subentry_case)
+        return subentry_case
 
-        if self.construct.default is not None:
+    def _get_default_subentry(self) -> "Optional[EntryConstruct]":
+        """Get the entry of the default case, create it if not done yet"""
+        if self._subentry_default is None and self.construct.default is not None:
             self._subentry_default = create_entry_from_construct(
                 self.model,
                 self,
@@ -760,7 +949,21 @@ class EntrySwitch(EntryConstruct):
                 NameExcludedFromPath("Default"),
                 "",
             )
-            self._subentries.append(self._subentry_default)
+        return self._subentry_default
+
+    def _get_all_subentries(self) -> List["EntryConstruct"]:
+        """Get the entries of all cases and of the default, create them if not done yet"""
+        if self._subentries is None:
+            subentries: List[EntryConstruct] = []
+            for key in self.construct.cases.keys():
+                subentry = self._get_case_subentry(key)
+                if subentry is not None:
+                    subentries.append(subentry)
+            subentry_default = self._get_default_subentry()
+            if subentry_default is not None:
+                subentries.append(subentry_default)
+            self._subentries = subentries
+        return self._subentries
 
     def _get_subentry(self) -> "Optional[EntryConstruct]":
         """Evaluate the conditional function to detect the type of the subentry"""
@@ -768,16 +971,11 @@ class EntrySwitch(EntryConstruct):
         if obj is None:
             return None
 
-        metadata = get_gui_metadata(obj)
+        metadata = get_gui_metadata_of_construct(obj, self.construct)
         if metadata is None:
             return None
 
-        ctx = metadata["context"]
-        key = evaluate(self.construct.keyfunc, ctx)
-        if key in self._subentry_cases:
-            return self._subentry_cases[key]
-        else:
-            return self._subentry_default
+        return self._get_case_subentry(metadata.selector)
 
     @property
     def obj_str(self) -> str:
@@ -799,7 +997,7 @@ class EntrySwitch(EntryConstruct):
     def subentries(self) -> Optional[List["EntryConstruct"]]:
         subentry = self._get_subentry()
         if subentry is None:
-            return self._subentries
+            return self._get_all_subentries()
         else:
             return subentry.subentries
 
@@ -833,6 +1031,8 @@ class FormatFieldFloat:
 
 
 class EntryFormatField(EntryConstruct):
+    __slots__ = ("type_infos",)
+
     construct: "cs.FormatField[Any, Any]"
     type_mapping: t.Dict[str, t.Union[FormatFieldInt, FormatFieldFloat]] = {
         ">B": FormatFieldInt("Int8ub", 8, False),
@@ -914,6 +1114,8 @@ class EntryFormatField(EntryConstruct):
 
 # EntryBytesInteger ###################################################################################################
 class EntryBytesInteger(EntryConstruct):
+    __slots__ = ()
+
     construct: "cs.BytesInteger[Any, Any]"
 
     def __init__(
@@ -960,6 +1162,8 @@ class EntryBytesInteger(EntryConstruct):
 
 # EntryBitsInteger ####################################################################################################
 class EntryBitsInteger(EntryConstruct):
+    __slots__ = ()
+
     construct: "cs.BitsInteger[Any, Any]"
 
     def __init__(
@@ -998,6 +1202,8 @@ class EntryBitsInteger(EntryConstruct):
 
 # EntryComputed #######################################################################################################
 class EntryStringEncoded(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1019,6 +1225,8 @@ class EntryStringEncoded(EntrySubconstruct):
 
 # EntryBytes ##########################################################################################################
 class EntryBytes(EntryConstruct):
+    __slots__ = ()
+
     construct: t.Union["cs.Bytes[Any, Any]", "cs.Construct[bytes, bytes]"]
 
     def __init__(
@@ -1030,19 +1238,21 @@ class EntryBytes(EntryConstruct):
         docs: str,
     ):
         super().__init__(model, parent, construct, name, docs)
-        self.ascii_view = False
+
+    @property
+    def ascii_view(self) -> bool:
+        return (self._flags & _FLAG_ASCII_VIEW) != 0
+
+    @ascii_view.setter
+    def ascii_view(self, val: bool):
+        self._set_flag(_FLAG_ASCII_VIEW, val)
+        self.invalidate_render_cache()
 
     @property
     def obj_str(self) -> str:
         try:
             if self.ascii_view:
-                chars = []
-                for b in self.obj:
-                    char = chr(b)
-                    if char not in string.printable:
-                        char = "."
-                    chars.append(char)
-                return "".join(chars)
+                return self.obj.translate(_ASCII_VIEW_TRANSLATION).decode("ascii")
             else:
                 return self.obj.hex(" ")
         except Exception:
@@ -1082,6 +1292,8 @@ class EntryBytes(EntryConstruct):
 
 # EntryTell ###########################################################################################################
 class EntryTell(EntryConstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1099,6 +1311,8 @@ class EntryTell(EntryConstruct):
 
 # EntrySeek ###########################################################################################################
 class EntrySeek(EntryConstruct):
+    __slots__ = ()
+
     construct: "cs.Seek"
 
     def __init__(
@@ -1122,6 +1336,8 @@ class EntrySeek(EntryConstruct):
 
 # EntryPass ###########################################################################################################
 class EntryPass(EntryConstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1143,6 +1359,8 @@ class EntryPass(EntryConstruct):
 
 # EntryConst #######################################################################################################
 class EntryConst(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1160,6 +1378,8 @@ class EntryConst(EntrySubconstruct):
 
 # EntryComputed #######################################################################################################
 class EntryComputed(EntryConstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1184,6 +1404,8 @@ class EntryComputed(EntryConstruct):
 
 # EntryDefault ########################################################################################################
 class EntryDefault(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1213,6 +1435,8 @@ class EntryDefault(EntrySubconstruct):
 
 # EntryFocusedSeq ###################################################################################################
 class EntryFocusedSeq(EntryConstruct):
+    __slots__ = ("_subentries",)
+
     construct: "cs.FocusedSeq"
 
     def __init__(
@@ -1254,14 +1478,11 @@ class EntryFocusedSeq(EntryConstruct):
         if obj is None:
             return None
 
-        metadata = get_gui_metadata(obj)
+        metadata = get_gui_metadata_of_construct(obj, self.construct)
         if metadata is None:
             return None
 
-        ctx = metadata["context"]
-        parsebuildfrom = evaluate(self.construct.parsebuildfrom, ctx)
-        subentry = self._subentries[parsebuildfrom]
-        return subentry
+        return self._subentries.get(metadata.selector)
 
     @property
     def obj_str(self) -> str:
@@ -1305,6 +1526,8 @@ class EntryFocusedSeq(EntryConstruct):
 
 # EntrySelect ###################################################################################################
 class EntrySelect(EntryConstruct):
+    __slots__ = ("_subentries",)
+
     construct: "cs.Select"
 
     def __init__(
@@ -1317,19 +1540,22 @@ class EntrySelect(EntryConstruct):
     ):
         super().__init__(model, parent, construct, name, docs)
 
-        # change default row infos
+        # The entries of the options are created on demand.
         self._subentries: t.Dict[int, EntryConstruct] = {}
 
-        # create sub entries
-        for idx, subcon in enumerate(self.construct.subcons):
+    def _get_option_subentry(self, idx: int) -> "EntryConstruct":
+        """Get the entry of an option, create it if not done yet"""
+        subentry = self._subentries.get(idx)
+        if subentry is None:
             subentry = create_entry_from_construct(
-                model,
+                self.model,
                 self,
-                subcon,
+                self.construct.subcons[idx],
                 NameExcludedFromPath(f"Option {idx}"),
                 "",
             )
-            self._subentries[id(subentry.construct)] = subentry
+            self._subentries[idx] = subentry
+        return subentry
 
     def _get_subentry(self) -> "Optional[EntryConstruct]":
         """Evaluate the conditional function to detect the type of the subentry"""
@@ -1337,19 +1563,15 @@ class EntrySelect(EntryConstruct):
         if obj is None:
             return None
 
-        metadata = get_gui_metadata(obj)
+        metadata = get_gui_metadata_of_construct(obj, self.construct)
         if metadata is None:
             return None
 
-        # we are not interested in the metadata of the
-        # cs.Select, but of its childs
-        metadata = metadata["child_gui_metadata"]
-        if metadata is None:
+        # the index of the parsed option is detected while parsing
+        idx = metadata.selector
+        if idx is None:
             return None
-        if id(metadata["construct"]) not in self._subentries:
-            print("error")
-        subentry = self._subentries[id(metadata["construct"])]
-        return subentry
+        return self._get_option_subentry(idx)
 
     @property
     def obj_str(self) -> str:
@@ -1371,7 +1593,10 @@ class EntrySelect(EntryConstruct):
     def subentries(self) -> Optional[List["EntryConstruct"]]:
         subentry = self._get_subentry()
         if subentry is None:
-            return list(self._subentries.values())
+            return [
+                self._get_option_subentry(idx)
+                for idx in range(len(self.construct.subcons))
+            ]
         else:
             return subentry.subentries
 
@@ -1393,6 +1618,8 @@ class EntrySelect(EntryConstruct):
 
 # EntryTimestamp ######################################################################################################
 class EntryTimestamp(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1414,6 +1641,8 @@ class EntryTimestamp(EntrySubconstruct):
 
 # EntryTransparentSubcon ##############################################################################################
 class EntryTransparentSubcon(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1427,6 +1656,8 @@ class EntryTransparentSubcon(EntrySubconstruct):
 
 # EntryNullStripped ###################################################################################################
 class EntryNullStripped(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cs.NullStripped[Any, Any]"
 
     def __init__(
@@ -1446,6 +1677,8 @@ class EntryNullStripped(EntrySubconstruct):
 
 # EntryNullTerminated #################################################################################################
 class EntryNullTerminated(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cs.NullTerminated[Any, Any]"
 
     def __init__(
@@ -1465,6 +1698,8 @@ class EntryNullTerminated(EntrySubconstruct):
 
 # EntryChecksumSubcon #################################################################################################
 class EntryChecksumSubcon(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1484,6 +1719,8 @@ class EntryChecksumSubcon(EntrySubconstruct):
 
 # EntryCompressed #####################################################################################################
 class EntryCompressed(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1501,6 +1738,8 @@ class EntryCompressed(EntrySubconstruct):
 
 # EntryPeek ###########################################################################################################
 class EntryPeek(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cs.Peek"
 
     def __init__(
@@ -1516,6 +1755,8 @@ class EntryPeek(EntrySubconstruct):
 
 # EntryRawCopy #######################################################################################################
 class EntryRawCopy(EntrySubconstruct):
+    __slots__ = ()
+
     def __init__(
         self,
         model: "model.ConstructEditorModel",
@@ -1531,6 +1772,8 @@ class EntryRawCopy(EntrySubconstruct):
 
 # EntryDataclassStruct ################################################################################################
 class EntryDataclassStruct(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cst.DataclassStruct[Any]"
 
     def __init__(
@@ -1557,6 +1800,8 @@ class EntryDataclassStruct(EntrySubconstruct):
 
 # EntryFlag ####################################################################################################
 class EntryFlag(EntryConstruct):
+    __slots__ = ()
+
     construct: "cs.FormatField[Any, Any]"
 
     def __init__(
@@ -1585,6 +1830,8 @@ class EntryFlag(EntryConstruct):
 
 # EntryEnum ###########################################################################################################
 class EntryEnum(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cs.Enum"
 
     def __init__(
@@ -1652,6 +1899,8 @@ class EntryEnum(EntrySubconstruct):
 
 # EntryFlagsEnum ######################################################################################################
 class EntryFlagsEnum(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cs.FlagsEnum"
 
     def __init__(
@@ -1716,6 +1965,8 @@ def get_enum_name(e: cst.EnumBase):
 
 
 class EntryTEnum(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cst.TEnum[Any]"
 
     def __init__(
@@ -1775,6 +2026,8 @@ class EntryTEnum(EntrySubconstruct):
 
 # EntryTFlagsEnum #####################################################################################################
 class EntryTFlagsEnum(EntrySubconstruct):
+    __slots__ = ()
+
     construct: "cst.TFlagsEnum[Any]"
 
     def __init__(
@@ -1835,6 +2088,165 @@ class EntryTFlagsEnum(EntrySubconstruct):
         return new_obj
 
 
+# EntryLazy ###########################################################################################################
+class EntryLazy(EntrySubconstruct):
+    """
+    Entry of a `cs.Lazy`. The subcon is only parsed, when the value of the
+    subentry is requested (eg. when the row is expanded), see `LazyObj`.
+    Simple values without subentries are parsed as soon as they are shown.
+    """
+
+    __slots__ = ("_cached_is_parsed",)
+
+    construct: "cs.Lazy"  # type: ignore
+
+    def __init__(
+        self,
+        model: "model.ConstructEditorModel",
+        parent: Optional["EntryConstruct"],
+        construct: "cs.Lazy",
+        name: t.Optional[NameType],
+        docs: str,
+    ):
+        super().__init__(model, parent, construct, name, docs)
+        self._cached_is_parsed = False
+
+    # The strings change, when the object is parsed (eg. when the row is
+    # expanded) or when a new unparsed object is set, which does not change
+    # the value itself.
+    def _get_render_cache(self) -> _RenderCache:
+        is_parsed = self.is_parsed
+        if self._cached_is_parsed != is_parsed:
+            self._cached_is_parsed = is_parsed
+            self._render_cache = None
+        return super()._get_render_cache()
+
+    # the object of the subentry has the same path, but is the parsed object
+    @property
+    def obj(self) -> Any:
+        return self._get_unresolved_obj()
+
+    @obj.setter
+    def obj(self, val: Any):
+        EntryConstruct.obj.fset(self, val)  # type: ignore
+
+    @property
+    def is_parsed(self) -> bool:
+        """Flag, if the subcon is already parsed (or does not need to be parsed)"""
+        if self.subentry.subentries is None:
+            return True
+        obj = self.obj
+        return not isinstance(obj, LazyObj) or obj.is_parsed
+
+    @property
+    def obj_str(self) -> str:
+        if self.is_parsed:
+            return self.subentry.obj_str
+        return ""
+
+    @property
+    def typ_str(self) -> str:
+        if self.is_parsed:
+            return f"Lazy[{self.subentry.typ_str}]"
+        return "Lazy"
+
+    @property
+    def obj_view_settings(self) -> ObjViewSettings:
+        if self.is_parsed:
+            return self.subentry.obj_view_settings
+        return ObjViewSettings_Default(self)
+
+    def modify_context_menu(self, menu: ContextMenu):
+        if self.is_parsed:
+            return self.subentry.modify_context_menu(menu)
+
+
+# EntryLazyStruct #####################################################################################################
+class EntryLazyStruct(EntryStruct):
+    """
+    Entry of a `cs.LazyStruct`. The fields are only parsed, when they are
+    shown (eg. when the row is expanded), see `cs.LazyContainer`.
+    """
+
+    __slots__ = ()
+
+    construct: "cs.LazyStruct"  # type: ignore
+
+    @property
+    def typ_str(self) -> str:
+        return "LazyStruct"
+
+
+# EntryLazyArray ######################################################################################################
+class EntryLazyArray(EntryArray):
+    """
+    Entry of a `cs.LazyArray`. The elements are only parsed, when they are
+    shown (eg. when the row is expanded), see `cs.LazyListContainer`.
+    """
+
+    __slots__ = ()
+
+    construct: "cs.LazyArray[Any, Any]"  # type: ignore
+
+    @property
+    def typ_str(self) -> str:
+        try:
+            return f"LazyArray[{len(self.obj)}]"
+        except Exception:
+            return f"LazyArray[{self.construct.count}]"
+
+
+# EntryLazyBound ######################################################################################################
+class EntryLazyBound(EntryConstruct):
+    """
+    Entry of a `cs.LazyBound`. The entry of the subcon is only created, when
+    it is needed, because recursive constructs would never end otherwise.
+    """
+
+    __slots__ = ("_subentry",)
+
+    construct: "cs.LazyBound[Any, Any]"  # type: ignore
+
+    def __init__(
+        self,
+        model: "model.ConstructEditorModel",
+        parent: Optional["EntryConstruct"],
+        construct: "cs.LazyBound[Any, Any]",
+        name: t.Optional[NameType],
+        docs: str,
+    ):
+        super().__init__(model, parent, construct, name, docs)
+        self._subentry: t.Optional[EntryConstruct] = None
+
+    @property
+    def subentry(self) -> EntryConstruct:
+        if self._subentry is None:
+            self._subentry = create_entry_from_construct(
+                self.model, self, self.construct.subconfunc(), None, ""
+            )
+        return self._subentry
+
+    # pass throught everything to subentry ####################################
+    @property
+    def obj_str(self) -> str:
+        return self.subentry.obj_str
+
+    @property
+    def typ_str(self) -> str:
+        return self.subentry.typ_str
+
+    @property
+    def subentries(self) -> Optional[List["EntryConstruct"]]:
+        return self.subentry.subentries
+
+    @property
+    def obj_view_settings(self) -> ObjViewSettings:
+        return self.subentry.obj_view_settings
+
+    def modify_context_menu(self, menu: ContextMenu):
+        return self.subentry.modify_context_menu(menu)
+
+
 # #####################################################################################################################
 # Entry Mapping #######################################################################################################
 # #####################################################################################################################
@@ -1929,10 +2341,10 @@ construct_entry_mapping: t.Dict[
     # cs.Rebuffered
     #
     # lazy equivalents ##########################
-    # cs.Lazy
-    # cs.LazyStruct
-    # cs.LazyArray
-    # cs.LazyBound
+    cs.Lazy: EntryLazy,
+    cs.LazyStruct: EntryLazyStruct,
+    cs.LazyArray: EntryLazyArray,
+    cs.LazyBound: EntryLazyBound,
     # #########################################################################
     #
     #
@@ -1979,17 +2391,49 @@ def create_entry_from_construct(
     if subcon in construct_entry_mapping:
         return construct_entry_mapping[subcon](model, parent, subcon, name, docs)
 
-    # check for class-mappings
-    if type(subcon) in construct_entry_mapping:
-        return construct_entry_mapping[type(subcon)](model, parent, subcon, name, docs)
-
-    # iterate through all mappings and check if the subcon inherits from a known mapping
-    for key, value in construct_entry_mapping.items():
-        if isinstance(key, type) and isinstance(subcon, key):  # type: ignore
-            return value(model, parent, subcon, name, docs)
+    # check for class-mappings (including the base classes of the subcon)
+    entry_class = _get_entry_class(type(subcon))
+    if entry_class is not None:
+        return entry_class(model, parent, subcon, name, docs)
 
     # use fallback, if no entry found in the mapping
     if isinstance(subcon, cs.Construct):
         return EntryConstruct(model, parent, subcon, name, docs)
 
     raise ValueError(f"subcon type {repr(subcon)} is not implemented")
+
+
+# Cache for the entry classes of all construct types, that were already looked up
+# in the `construct_entry_mapping` (None, if no entry class is mapped).
+_entry_class_cache: Dict[type, Optional[Type[EntryConstruct]]] = {}
+
+
+def _get_entry_class(subcon_type: type) -> Optional[Type[EntryConstruct]]:
+    """
+    Get the entry class of a construct type.
+
+    The base classes are checked in MRO order, so that subclasses of a known
+    construct always resolve to the entry class of their nearest mapped base.
+    """
+    try:
+        return _entry_class_cache[subcon_type]
+    except KeyError:
+        pass
+
+    entry_class = None
+    for base in subcon_type.__mro__:
+        if base in construct_entry_mapping:
+            entry_class = construct_entry_mapping[base]
+            break
+
+    _entry_class_cache[subcon_type] = entry_class
+    return entry_class
+
+
+def clear_entry_class_cache():
+    """
+    Clear the cache of the entry classes.
+
+    This has to be called each time the `construct_entry_mapping` is modified.
+    """
+    _entry_class_cache.clear()
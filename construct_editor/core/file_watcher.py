@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import enum
+import os
+import typing as t
+
+# Maximum number of bytes of the known data, that are compared with the file
+# at each check, to detect if the file was only appended (see `FileWatcher`)
+MAX_COMPARED_SIZE = 1024 * 1024
+
+
+class FileChange(enum.Enum):
+    Appended = enum.auto()  # data was appended, the old data is unchanged
+    Rewritten = enum.auto()  # the file was changed otherwise
+    Removed = enum.auto()
+
+
+class FileWatcher:
+    """
+    Watch a file for changes (eg. a capture file, that a logger is still
+    writing), by polling its size and modification time. `check` has to be
+    called periodically, eg. by a timer of the GUI.
+
+    When the file grows, only the new data is read and appended to `binary`
+    in place. The file is assumed to be appended, if the known data is
+    unchanged. To keep the checks of big files fast, only a bounded part of
+    the known data is compared each time the file grows: the end of the known
+    data, where the new data is appended, and the next part of the rest. So
+    the known data is compared completely after some checks and a file, that
+    was rewritten in the meantime, is detected as `FileChange.Rewritten` then.
+    """
+
+    def __init__(self, file_path: str, binary: bytes):
+        self.file_path = file_path
+
+        # Known content of the file
+        self.binary = bytearray(binary)
+
+        # Data, that was appended at the last check (see `FileChange.Appended`)
+        self.appended = b""
+
+        # Position of the part of the known data, that is compared next
+        self._compare_pos = 0
+
+        self._stat = self._get_stat()
+
+    @property
+    def file_stamp(self) -> t.Optional[t.Tuple[int, int]]:
+        """
+        Modification time and size of the file, when `binary` was read (or
+        None, if the file was changed while it was read).
+        """
+        if self._stat is None or self._stat[1] != len(self.binary):
+            return None
+        return self._stat
+
+    def check(self) -> t.Optional[FileChange]:
+        """
+        Check if the file has changed since the last check. If so, `binary`
+        contains the new content of the file afterwards.
+
+        :return: the kind of the change or None, if the file is unchanged
+        """
+        stat = self._get_stat()
+        if stat == self._stat:
+            return None
+        self._stat = stat
+        if stat is None:
+            return FileChange.Removed
+
+        try:
+            with open(self.file_path, "rb") as f:
+                change = self._read_changes(f, stat[1])
+        except OSError:
+            self._stat = None
+            return FileChange.Removed
+        return change
+
+    def _read_changes(self, f: t.BinaryIO, size: int) -> t.Optional[FileChange]:
+        self.appended = b""
+        old_size = len(self.binary)
+        if size > old_size and self._is_unchanged(f):
+            f.seek(old_size)
+            self.appended = f.read()
+            self.binary += self.appended
+            return FileChange.Appended
+
+        f.seek(0)
+        binary = f.read()
+        self._compare_pos = 0
+        if binary == self.binary:
+            return None  # eg. only the modification time has changed
+        self.binary = bytearray(binary)
+        return FileChange.Rewritten
+
+    def _is_unchanged(self, f: t.BinaryIO) -> bool:
+        """Check if the file starts with the known data (see `MAX_COMPARED_SIZE`)"""
+        old_size = len(self.binary)
+        if old_size <= MAX_COMPARED_SIZE:
+            return self._is_range_unchanged(f, 0, old_size)
+
+        # the end of the known data, where the new data is appended
+        tail_size = MAX_COMPARED_SIZE // 2
+        if not self._is_range_unchanged(f, old_size - tail_size, tail_size):
+            return False
+
+        # the next part of the rest of the known data
+        rest_size = old_size - tail_size
+        if self._compare_pos >= rest_size:
+            self._compare_pos = 0
+        size = min(MAX_COMPARED_SIZE - tail_size, rest_size - self._compare_pos)
+        if not self._is_range_unchanged(f, self._compare_pos, size):
+            return False
+        self._compare_pos += size
+        return True
+
+    def _is_range_unchanged(self, f: t.BinaryIO, offset: int, size: int) -> bool:
+        f.seek(offset)
+        return f.read(size) == self.binary[offset : offset + size]
+
+    def _get_stat(self) -> t.Optional[t.Tuple[int, int]]:
+        """Get the modification time and the size of the file"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
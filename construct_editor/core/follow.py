@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+import dataclasses
+import io
+import os
+import stat
+import typing as t
+
+import construct as cs
+import construct_typed as cst
+
+import construct_editor.core.restreamed as restreamed
+from construct_editor.core.incremental_parse import (
+    get_top_level_greedy_range,
+    parse_elements,
+)
+from construct_editor.core.preprocessor import (
+    GuiMetaData,
+    add_gui_metadata,
+    get_gui_metadata,
+)
+
+# Maximum number of bytes, that are read at once from a followed stream
+READ_SIZE = 1024 * 1024
+
+# Maximum size of data, that cannot be parsed (eg. an incomplete record).
+# If more data is pending, the stream cannot be parsed anymore and the
+# pending data is dropped, so that the memory does not grow.
+MAX_PENDING_BYTES = 16 * 1024 * 1024
+
+
+class FollowSource:
+    """
+    Source of a followed stream: a file, that is still written, or a named
+    pipe (FIFO). The data is read without blocking.
+    """
+
+    def __init__(self, path: str, from_end: bool = False):
+        self.path = path
+        flags = os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(path, flags)
+
+        # start at the end of a file, to show only new records
+        if from_end and stat.S_ISREG(os.fstat(self._fd).st_mode):
+            os.lseek(self._fd, 0, os.SEEK_END)
+
+    def read(self, size: int = READ_SIZE) -> bytes:
+        """Read the available data (or b"" if no new data is available)"""
+        if self._fd is None:
+            return b""
+        try:
+            return os.read(self._fd, size)
+        except BlockingIOError:
+            return b""
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class FollowWindow:
+    """
+    Window with the last records of a never-ending stream (eg. a log, that is
+    read from a pipe), for constructs with a top-level `cs.GreedyRange`.
+
+    The data of the stream is fed in chunks (see `feed`). Only complete
+    records are parsed, an incomplete record at the end is parsed when the
+    rest of it is fed. Old records are evicted, when there are more than
+    `max_records` records or when the records are bigger than `max_bytes`.
+    The data of the evicted records is removed from the stream, when it is
+    bigger than the data of the remaining records. Then the offsets in the
+    metadata of the remaining records are moved, so that the memory stays
+    constant (the stream is at most twice as big as the window). Because
+    the records are not moved on each eviction, the stream may start with
+    data of evicted records (see `window_start`).
+
+    `root_obj` is a list of the records like the parsed object of the whole
+    stream, so it can be shown like a normal parsed object (see
+    `ConstructEditor.show_follow_window`).
+    """
+
+    def __init__(
+        self,
+        constr: "cs.Construct[t.Any, t.Any]",
+        max_records: t.Optional[int] = None,
+        max_bytes: t.Optional[int] = None,
+        **contextkw: t.Any,
+    ):
+        greedy_range = get_top_level_greedy_range(constr)
+        if greedy_range is None:
+            raise ValueError("following needs a construct with a top-level GreedyRange")
+        if max_records is None and max_bytes is None:
+            raise ValueError("max_records or max_bytes has to be set")
+
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._greedy_range = greedy_range
+        self._contextkw = contextkw
+
+        self._stream = io.BytesIO()
+        self._parsed_end = 0  # end of the last parsed record in the stream
+        self._root_metadata = GuiMetaData(0, 0, greedy_range, self._stream)
+        self.root_obj: t.List[t.Any] = add_gui_metadata(
+            cs.ListContainer(), self._root_metadata
+        )
+
+        # Offset of the stream in the followed stream
+        self.base_offset = 0
+
+        # Number of evicted records (index of the first record of the window)
+        self.first_index = 0
+
+        # Number of bytes, that were dropped (see `MAX_PENDING_BYTES`)
+        self.dropped_bytes = 0
+
+    @property
+    def binary(self) -> bytes:
+        """Data of the stream (the offsets of the records refer to this data)"""
+        return self._stream.getvalue()
+
+    @property
+    def window_start(self) -> int:
+        """Offset of the first record in the stream"""
+        return self._get_record_start(0)
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Add new data of the followed stream. All complete records are parsed
+        and old records are evicted.
+
+        :return: True if records were added or evicted
+        """
+        if len(data) == 0:
+            return False
+
+        stream = self._stream
+        stream.seek(0, io.SEEK_END)
+        stream.write(data)
+        restreamed.clear_stream_cache(stream)
+
+        stream.seek(self._parsed_end)
+        new_objs = parse_elements(
+            self._greedy_range,
+            stream,
+            self.first_index + len(self.root_obj),
+            **self._contextkw,
+        )
+        self._parsed_end = stream.tell()
+        self.root_obj.extend(new_objs)
+
+        pending = stream.seek(0, io.SEEK_END) - self._parsed_end
+        if pending > MAX_PENDING_BYTES:
+            stream.truncate(self._parsed_end)
+            self.dropped_bytes += pending
+
+        evicted = self._evict()
+        self._compact()
+
+        self._root_metadata.offset_start = self._get_record_start(0)
+        self._root_metadata.offset_end = self._parsed_end
+        return len(new_objs) > 0 or evicted > 0
+
+    def _get_record_start(self, index: int) -> int:
+        if index >= len(self.root_obj):
+            return self._parsed_end
+        metadata = get_gui_metadata(self.root_obj[index])
+        if metadata is None or metadata.stream is not self._stream:
+            return self._parsed_end
+        return metadata.offset_start
+
+    def _evict(self) -> int:
+        """Remove the oldest records, if the window is too big"""
+        count = 0
+        if self.max_records is not None:
+            count = max(len(self.root_obj) - self.max_records, 0)
+        if self.max_bytes is not None:
+            # the newest record is always kept
+            while (count < len(self.root_obj) - 1) and (
+                self._parsed_end - self._get_record_start(count) > self.max_bytes
+            ):
+                count += 1
+
+        del self.root_obj[:count]
+        self.first_index += count
+        return count
+
+    def _compact(self) -> None:
+        """Remove the data of the evicted records from the stream, if it is too big"""
+        shift = self._get_record_start(0)
+        if shift == 0 or shift < self._parsed_end - shift:
+            return
+
+        old_stream = self._stream
+        new_stream = io.BytesIO(old_stream.getvalue()[shift:])
+        _move_metadata(self.root_obj, old_stream, new_stream, shift)
+
+        self._root_metadata.stream = new_stream
+        self._stream = new_stream
+        self._parsed_end -= shift
+        self.base_offset += shift
+
+
+def _move_metadata(
+    objs: t.List[t.Any], old_stream: io.BytesIO, new_stream: io.BytesIO, shift: int
+) -> None:
+    """
+    Move the metadata of parsed objects from the old to the new stream, whose
+    data starts `shift` bytes later. Nested streams (eg. of `cs.Compressed`)
+    are not changed.
+    """
+    seen: t.Set[int] = set()
+    stack = list(objs)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        metadata = get_gui_metadata(obj)
+        while metadata is not None:
+            if metadata.stream is old_stream and id(metadata) not in seen:
+                seen.add(id(metadata))
+                metadata.stream = new_stream
+                metadata.offset_start -= shift
+                metadata.offset_end -= shift
+            metadata = metadata.child_gui_metadata
+
+        if isinstance(obj, dict):
+            # `cs.Struct` saves the stream in the parsed container
+            if obj.get("_io") is old_stream:
+                obj["_io"] = new_stream
+            stack.extend(
+                value
+                for key, value in obj.items()
+                if key not in ("_io", "__construct_editor_metadata__")
+            )
+        elif isinstance(obj, list):
+            stack.extend(obj)
+        elif isinstance(obj, cst.DataclassMixin):
+            stack.extend(getattr(obj, f.name) for f in dataclasses.fields(obj))
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import io
+import itertools
+import typing as t
+
+import construct as cs
+
+import construct_editor.core.restreamed as restreamed
+from construct_editor.core.preprocessor import IncludeGuiMetaData, get_gui_metadata
+
+
+def get_top_level_greedy_range(
+    constr: "cs.Construct[t.Any, t.Any]",
+) -> t.Optional["cs.GreedyRange[t.Any, t.Any]"]:
+    """
+    Get the `cs.GreedyRange` of a construct (with the GUI metadata, see
+    `include_metadata`), if it is the top-level construct (eg. a file with
+    a list of records).
+    """
+    while isinstance(constr, (cs.Renamed, IncludeGuiMetaData)):
+        constr = constr.subcon
+    if isinstance(constr, cs.GreedyRange) and not constr.discard:
+        return constr
+    return None
+
+
+def parse_appended(
+    constr: "cs.Construct[t.Any, t.Any]",
+    root_obj: t.Any,
+    binary: t.Union[bytes, bytearray],
+    **contextkw: t.Any,
+) -> t.Optional[int]:
+    """
+    Parse only the data, that was appended to the binary of a parsed object
+    (eg. of a log file, that is still written), and append the new elements
+    to the object.
+
+    This is only possible for a top-level `cs.GreedyRange`. Parsing is
+    continued after the last parsed element, so an incomplete element at the
+    end of the old data is parsed again. The data of the old stream is
+    extended, so that the metadata of all old elements stays valid.
+
+    The binary has to start with the old data, which is not compared
+    completely here, because the caller knows if data was only appended
+    (eg. `FileWatcher`). Only the end of the old data is compared, which
+    contains the element, that is parsed again.
+
+    :return: the number of new elements or None, if the binary cannot be
+        parsed incrementally (eg. because the old data was changed)
+    """
+    greedy_range = get_top_level_greedy_range(constr)
+    if greedy_range is None or not isinstance(root_obj, list):
+        return None
+
+    metadata = get_gui_metadata(root_obj)
+    if metadata is None or not isinstance(metadata.stream, io.BytesIO):
+        return None
+    stream: io.BytesIO = metadata.stream
+
+    old_size = stream.seek(0, io.SEEK_END)
+    if len(binary) < old_size:
+        return None
+
+    # continue after the last parsed element
+    if len(root_obj) > 0:
+        last_metadata = get_gui_metadata(root_obj[-1])
+        if last_metadata is None or last_metadata.stream is not stream:
+            return None
+        offset = last_metadata.offset_end
+    else:
+        offset = metadata.offset_start
+    if not _is_range_unchanged(stream, binary, offset, old_size):
+        return None
+
+    stream.seek(old_size)
+    stream.write(binary[old_size:])
+    restreamed.clear_stream_cache(stream)
+
+    stream.seek(offset)
+    new_objs = parse_elements(greedy_range, stream, len(root_obj), **contextkw)
+    root_obj.extend(new_objs)
+    metadata.offset_end = stream.tell()
+    return len(new_objs)
+
+
+def _is_range_unchanged(
+    stream: io.BytesIO, binary: t.Union[bytes, bytearray], start: int, end: int
+) -> bool:
+    """Check if the data [start, end) of the stream is the same as in the binary"""
+    with stream.getbuffer() as old, memoryview(binary) as new:
+        return old[start:end] == new[start:end]
+
+
+def parse_elements(
+    greedy_range: "cs.GreedyRange[t.Any, t.Any]",
+    stream: io.BytesIO,
+    first_index: int,
+    **contextkw: t.Any,
+) -> t.List[t.Any]:
+    """
+    Parse the elements of a `cs.GreedyRange` from the current position of
+    the stream, till an element cannot be parsed (eg. because it is not
+    complete yet). The stream is positioned after the last parsed element.
+
+    :param first_index: index of the first parsed element (`this._index`)
+    """
+    # same as `cs.Construct.parse` and `cs.GreedyRange._parse`
+    context = cs.Container(**contextkw)
+    context["_parsing"] = True
+    context["_building"] = False
+    context["_sizing"] = False
+    context["_params"] = context
+    path = "(parsing)"
+
+    objs = []
+    fallback = cs.stream_tell(stream, path)
+    try:
+        for index in itertools.count(first_index):
+            context["_index"] = index
+            fallback = cs.stream_tell(stream, path)
+            obj = greedy_range.subcon._parsereport(  # type: ignore
+                stream, context, path
+            )
+            objs.append(obj)
+    except cs.StopFieldError:
+        pass
+    except cs.ExplicitError:
+        raise
+    except Exception:
+        cs.stream_seek(stream, fallback, 0, path)
+    return objs
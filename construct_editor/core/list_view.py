@@ -0,0 +1,556 @@
+# -*- coding: utf-8 -*-
+import ast
+import enum
+import operator
+import typing as t
+
+import construct as cs
+
+import construct_editor.core.array_table as array_table
+import construct_editor.core.entries as entries
+import construct_editor.core.model as model
+from construct_editor.core.preprocessor import NoneWithGuiMetadata
+
+if t.TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # numpy is optional, without it the predicates are evaluated row by row
+        np = None
+
+# Values of a column (numpy arrays, if NumPy is available)
+ColumnValues = t.Union[t.Sequence[t.Any], "np.ndarray"]
+
+
+class ListViewFilterError(ValueError):
+    pass
+
+
+class ListViewColumn:
+    """
+    Values of one column of a list view.
+
+    `values` contains the raw values of the column (for enums the integer
+    value) and `names` the names of enum values, so that they can be
+    compared with strings in a filter.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        values: ColumnValues,
+        names: t.Optional[ColumnValues] = None,
+    ):
+        self.name = name
+        self.values = values
+        self.names = names
+
+
+class ListViewColumns:
+    """
+    All columns of a list viewed entry.
+
+    If the entry is shown as table (see `array_table.ArrayTable`), the columns
+    are views of the table and the rows are only the indexes of the table
+    rows. Otherwise the rows are entries and the values are collected from
+    the objects of their flattened subentries. The `obj_str` of the entries
+    is never used.
+    """
+
+    def __init__(
+        self,
+        model: "model.ConstructEditorModel",
+        entry: "entries.EntryConstruct",
+        rows: t.Sequence[t.Any],
+        table: t.Optional["array_table.ArrayTable"] = None,
+    ):
+        self.model = model
+        self.entry = entry
+        self.rows = rows
+        self.table = table if table is not None else model.get_array_table(entry)
+
+        self._columns: t.Dict[str, ListViewColumn] = {}
+        self._flat_rows: t.Optional[t.List[t.Dict[str, "entries.EntryConstruct"]]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def vectorized(self) -> bool:
+        """
+        Flag if the columns are numpy arrays, so that whole columns can be
+        evaluated at once.
+        """
+        return np is not None
+
+    @property
+    def column_names(self) -> t.List[str]:
+        if self.table is not None:
+            return self.table.column_names
+
+        flat_rows = self._get_flat_rows()
+        if len(flat_rows) == 0:
+            return []
+        return list(flat_rows[0].keys())
+
+    def get_column_by_index(self, col: int) -> t.Optional[ListViewColumn]:
+        names = self.column_names
+        if col >= len(names):
+            return None
+        return self.get_column(names[col])
+
+    def get_column(self, name: str) -> ListViewColumn:
+        if name in self._columns:
+            return self._columns[name]
+
+        if self.table is not None:
+            column = self._create_table_column(self.table, name)
+        else:
+            column = self._create_entry_column(name)
+
+        self._columns[name] = column
+        return column
+
+    def _create_table_column(
+        self, table: "array_table.ArrayTable", name: str
+    ) -> ListViewColumn:
+        if name not in table.column_names:
+            raise ListViewFilterError(f"unknown column '{name}'")
+        col = table.column_names.index(name)
+        table_column = table.columns[col]
+        values = table.get_column(col)
+
+        names = None
+        if table_column.typ is array_table.ArrayTableColumnType.Flag:
+            values = values.astype(bool)
+        elif table_column.typ is array_table.ArrayTableColumnType.Bytes:
+            values = values.view(f"S{values.dtype.itemsize}")
+        elif table_column.typ is array_table.ArrayTableColumnType.Enum:
+            # map every row to the name of its enum value
+            names = np.full(len(values), None, dtype=object)
+            for value, value_name in (table_column.enum_names or {}).items():
+                names[values == value] = value_name
+
+        return ListViewColumn(name, values, names)
+
+    def _create_entry_column(self, name: str) -> ListViewColumn:
+        flat_rows = self._get_flat_rows()
+        if all(name not in flat_row for flat_row in flat_rows):
+            raise ListViewFilterError(f"unknown column '{name}'")
+
+        values: t.List[t.Any] = []
+        names: t.List[t.Any] = []
+        has_names = False
+        for flat_row in flat_rows:
+            entry = flat_row.get(name)
+            if entry is None:
+                values.append(None)
+                names.append(None)
+                continue
+            try:
+                obj = entry.obj
+            except Exception:
+                obj = None
+            value, value_name = _split_enum_value(obj)
+            values.append(value)
+            names.append(value_name)
+            has_names = has_names or (value_name is not None)
+
+        if self.vectorized:
+            return ListViewColumn(
+                name, _to_vector(values), _to_vector(names) if has_names else None
+            )
+        return ListViewColumn(name, values, names if has_names else None)
+
+    def _get_flat_rows(self) -> t.List[t.Dict[str, "entries.EntryConstruct"]]:
+        """
+        Create a mapping of the column names to the entries for each row.
+        """
+        if self._flat_rows is not None:
+            return self._flat_rows
+
+        flat_rows = []
+        for row in self.rows:
+            row_path_len = len(row.path)
+            flat_row = {}
+            for entry in self.model.create_flat_subentry_list(row):
+                column_name = entries.create_path_str(entry.path[row_path_len:])
+                flat_row[column_name] = entry
+            flat_rows.append(flat_row)
+        self._flat_rows = flat_rows
+        return flat_rows
+
+
+def _split_enum_value(obj: t.Any) -> t.Tuple[t.Any, t.Optional[str]]:
+    """
+    Split an enum object into its integer value and its name.
+    """
+    if isinstance(obj, NoneWithGuiMetadata):
+        return None, None
+    if isinstance(obj, cs.EnumIntegerString):
+        return int(obj), str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value, obj.name
+    return obj, None
+
+
+def _to_vector(values: t.List[t.Any]) -> "np.ndarray":
+    """
+    Convert a list of values to a numpy array. Numbers are converted to
+    numeric arrays and everything else to object arrays.
+    """
+    if all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+    ):
+        try:
+            return np.array(values)
+        except OverflowError:
+            pass
+    elif all(isinstance(v, bool) for v in values):
+        return np.array(values, dtype=bool)
+
+    vector = np.empty(len(values), dtype=object)
+    vector[:] = values
+    return vector
+
+
+# #####################################################################################################################
+# Predicates ##########################################################################################################
+# #####################################################################################################################
+# Maximum right operand of `<<`, because shifting a Python integer by a huge
+# number (eg. `x << 10000000000`) would block the GUI. `**` is not supported
+# for the same reason.
+MAX_LEFT_SHIFT = 1024
+
+
+def _lshift(a: t.Any, b: t.Any) -> t.Any:
+    if isinstance(b, int) and b > MAX_LEFT_SHIFT:
+        raise ListViewFilterError(f"shift count {b} is too big (max. {MAX_LEFT_SHIFT})")
+    return operator.lshift(a, b)
+
+
+_BINOPS: t.Dict[t.Type[ast.operator], t.Callable[[t.Any, t.Any], t.Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.LShift: _lshift,
+    ast.RShift: operator.rshift,
+}
+
+_CMPOPS: t.Dict[t.Type[ast.cmpop], t.Callable[[t.Any, t.Any], t.Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _get_column_name(node: ast.AST) -> t.Optional[str]:
+    """
+    Get the column name of a (dotted) name node, eg. `header.len` or `items[0].val`.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _get_column_name(node.value)
+        if base is None:
+            return None
+        return f"{base}.{node.attr}"
+    if isinstance(node, ast.Subscript):
+        base = _get_column_name(node.value)
+        index = node.slice
+        if isinstance(index, ast.Index):  # Python < 3.9
+            index = index.value  # type: ignore
+        if base is None or not isinstance(index, ast.Constant):
+            return None
+        return f"{base}[{index.value}]"
+    return None
+
+
+class ListViewPredicate:
+    """
+    Filter expression for the rows of a list view, eg. `len > 1400 and proto == "tcp"`.
+
+    The names in the expression refer to the list viewed columns. Comparisons
+    of a column with a string compare the names of enum values. If NumPy is
+    available, the expression is evaluated for whole columns at once. If this
+    is not possible (eg. for columns with None or mixed types), the expression
+    is evaluated row by row and rows that cannot be compared do not match.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        try:
+            self._tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ListViewFilterError(f"invalid filter expression: {e.msg}") from e
+
+    def evaluate(self, columns: ListViewColumns) -> t.List[int]:
+        """
+        Get the indexes of all rows that match the predicate.
+        """
+        if columns.vectorized:
+            try:
+                mask = self._eval(self._tree.body, columns, None)
+                mask = np.broadcast_to(np.asarray(mask, dtype=bool), (len(columns),))
+                return np.flatnonzero(mask).tolist()
+            except TypeError:
+                pass  # eg. object columns with None, so evaluate row by row
+
+        return [row for row in range(len(columns)) if self._matches(columns, row)]
+
+    def _matches(self, columns: ListViewColumns, row: int) -> bool:
+        try:
+            return bool(self._eval(self._tree.body, columns, row))
+        except TypeError:
+            return False  # eg. `None > 1400`
+
+    def _eval(
+        self, node: ast.AST, columns: ListViewColumns, row: t.Optional[int]
+    ) -> t.Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        column_name = _get_column_name(node)
+        if column_name is not None:
+            return self._get_values(columns.get_column(column_name), row)
+
+        if isinstance(node, ast.BoolOp):
+            is_and = isinstance(node.op, ast.And)
+            result = self._eval(node.values[0], columns, row)
+            for value_node in node.values[1:]:
+                # single rows are short-circuited, eg. `len is None or len > 10`
+                if row is not None and bool(result) is not is_and:
+                    return result
+                value = self._eval(value_node, columns, row)
+                if is_and:
+                    result = _logical_and(result, value)
+                else:
+                    result = _logical_or(result, value)
+            return result
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, columns, row)
+            if isinstance(node.op, ast.Not):
+                return _logical_not(operand)
+            if isinstance(node.op, ast.USub):
+                return -operand
+            if isinstance(node.op, ast.UAdd):
+                return +operand
+            if isinstance(node.op, ast.Invert):
+                return ~operand
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            left = self._eval(node.left, columns, row)
+            right = self._eval(node.right, columns, row)
+            return _BINOPS[type(node.op)](left, right)
+
+        if isinstance(node, ast.Compare):
+            result = None
+            left_node = node.left
+            for op, right_node in zip(node.ops, node.comparators):
+                if type(op) not in _CMPOPS:
+                    break
+                left, right = self._eval_compare_operands(
+                    left_node, right_node, columns, row
+                )
+                value = _CMPOPS[type(op)](left, right)
+                result = value if result is None else _logical_and(result, value)
+                left_node = right_node
+            else:
+                return result
+
+        raise ListViewFilterError(
+            f"unsupported filter expression '{ast.get_source_segment(self.expression.strip(), node)}'"
+        )
+
+    def _eval_compare_operands(
+        self,
+        left_node: ast.AST,
+        right_node: ast.AST,
+        columns: ListViewColumns,
+        row: t.Optional[int],
+    ) -> t.Tuple[t.Any, t.Any]:
+        """
+        Evaluate both operands of a comparison. If a column is compared with a
+        string, the names of the enum values are used instead of the values.
+        """
+        left_name = _get_column_name(left_node)
+        right_name = _get_column_name(right_node)
+        if left_name is not None and _is_str_constant(right_node):
+            return (
+                self._get_names(columns.get_column(left_name), row),
+                self._eval(right_node, columns, row),
+            )
+        if right_name is not None and _is_str_constant(left_node):
+            return (
+                self._eval(left_node, columns, row),
+                self._get_names(columns.get_column(right_name), row),
+            )
+        return (self._eval(left_node, columns, row), self._eval(right_node, columns, row))
+
+    @staticmethod
+    def _get_values(column: ListViewColumn, row: t.Optional[int]):
+        if row is None:
+            return column.values
+        return column.values[row]
+
+    @staticmethod
+    def _get_names(column: ListViewColumn, row: t.Optional[int]):
+        names = column.names if column.names is not None else column.values
+        if row is None:
+            return names
+        return names[row]
+
+
+def _is_str_constant(node: ast.AST) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, str)
+
+
+def _is_vector(value: t.Any) -> bool:
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _logical_and(a: t.Any, b: t.Any) -> t.Any:
+    if _is_vector(a) or _is_vector(b):
+        return np.logical_and(a, b)
+    return bool(a) and bool(b)
+
+
+def _logical_or(a: t.Any, b: t.Any) -> t.Any:
+    if _is_vector(a) or _is_vector(b):
+        return np.logical_or(a, b)
+    return bool(a) or bool(b)
+
+
+def _logical_not(a: t.Any) -> t.Any:
+    if _is_vector(a):
+        return np.logical_not(a)
+    return not a
+
+
+# #####################################################################################################################
+# Sorting #############################################################################################################
+# #####################################################################################################################
+def _sort_key(value: t.Any) -> t.Tuple[int, t.Any]:
+    # None values are sorted to the end and values of different types are
+    # grouped by their type name, so that they never have to be compared.
+    if value is None:
+        return (2, "")
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, (type(value).__name__, value))
+
+
+def sort_rows(
+    columns: ListViewColumns, col: int, descending: bool, rows: t.List[int]
+) -> t.List[int]:
+    """
+    Sort the row indexes by the values of one column.
+    """
+    if columns.table is not None:
+        order = columns.table.get_sort_order(col, descending)
+        if len(rows) == len(columns):
+            return order.tolist()
+        # keep only the filtered rows in the sort order
+        keep = np.zeros(len(columns), dtype=bool)
+        keep[rows] = True
+        return order[keep[order]].tolist()
+
+    column = columns.get_column_by_index(col)
+    if column is None:
+        return rows
+
+    values = column.values
+    if np is not None and isinstance(values, np.ndarray) and values.dtype != object:
+        row_array = np.asarray(rows, dtype=np.intp)
+        order = np.argsort(values[row_array], kind="stable")
+        if descending:
+            order = order[::-1]
+        return row_array[order].tolist()
+
+    return sorted(rows, key=lambda row: _sort_key(values[row]), reverse=descending)
+
+
+# #####################################################################################################################
+# List View State #####################################################################################################
+# #####################################################################################################################
+class ListViewState:
+    """
+    Filter and sorting of one list viewed entry.
+
+    The resulting permutation of the rows is cached until the data changes
+    (see `ConstructEditorModel.clear_array_tables`).
+    """
+
+    def __init__(self):
+        self.predicate: t.Optional[ListViewPredicate] = None
+        self.sort: t.Optional[t.Tuple[int, bool]] = None  # (column, descending)
+
+        # Error of the last evaluation (then all rows are shown unsorted)
+        self.error: t.Optional[ListViewFilterError] = None
+
+        self._permutation: t.Optional[t.List[int]] = None
+
+    @property
+    def active(self) -> bool:
+        return (self.predicate is not None) or (self.sort is not None)
+
+    def invalidate(self) -> None:
+        self._permutation = None
+
+    def get_permutation(
+        self,
+        model: "model.ConstructEditorModel",
+        entry: "entries.EntryConstruct",
+        rows: t.Sequence[t.Any],
+    ) -> t.List[int]:
+        """
+        Get the indexes of the visible rows in the order they should be shown.
+
+        If the filter or the sorting cannot be evaluated (eg. because the data
+        has changed), all rows are shown and the error is saved in `error`.
+        """
+        if self._permutation is not None:
+            return self._permutation
+
+        try:
+            permutation = self._evaluate(model, entry, rows)
+            self.error = None
+        except ListViewFilterError as e:
+            permutation = list(range(len(rows)))
+            self.error = e
+        except Exception as e:
+            permutation = list(range(len(rows)))
+            self.error = ListViewFilterError(
+                f"error while evaluating filter: {type(e).__name__}: {e}"
+            )
+            self.error.__cause__ = e
+
+        self._permutation = permutation
+        return permutation
+
+    def _evaluate(
+        self,
+        model: "model.ConstructEditorModel",
+        entry: "entries.EntryConstruct",
+        rows: t.Sequence[t.Any],
+    ) -> t.List[int]:
+        columns = ListViewColumns(model, entry, rows)
+        if self.predicate is not None:
+            permutation = self.predicate.evaluate(columns)
+        else:
+            permutation = list(range(len(rows)))
+
+        if self.sort is not None:
+            permutation = sort_rows(columns, *self.sort, permutation)
+        return permutation
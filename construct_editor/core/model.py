@@ -1,10 +1,18 @@
 # -*- coding: utf-8 -*-
 import abc
+import contextlib
 import enum
 import typing as t
 
+import construct_editor.core.array_table as array_table
 import construct_editor.core.entries as entries
-from construct_editor.core.commands import Command, CommandProcessor
+import construct_editor.core.list_view as list_view
+import construct_editor.core.path_index as path_index
+import construct_editor.core.search_index as search_index
+import construct_editor.core.statistics as statistics
+import construct_editor.core.structural_diff as structural_diff
+import construct_editor.core.value_delta as value_delta
+from construct_editor.core.commands import Command, CommandProcessor, CompositeCmd
 from construct_editor.core.preprocessor import add_gui_metadata, get_gui_metadata
 
 
@@ -25,16 +33,37 @@ class ChangeValueCmd(Command):
     ) -> None:
         super().__init__(True, f"Value '{entry.path[-1]}' changed")
         self.entry = entry
-        self.old_value = old_value
-        self.new_value = new_value
 
-    def do(self) -> None:
-        self.entry.obj = self.new_value
+        # Only the difference between the values is saved, so that large
+        # values (eg. bytes) do not have to be saved completely in the history.
+        self.delta = value_delta.create_value_delta(old_value, new_value)
+
+    def do(self) -> bool:
+        return self._apply(revert=False)
+
+    def undo(self) -> bool:
+        return self._apply(revert=True)
+
+    def _apply(self, revert: bool) -> bool:
+        # The delta can only be applied to the value, that it was created
+        # from. Otherwise the value was changed without this command.
+        current_value = self.entry.obj
+        if not self.delta.matches(current_value, revert):
+            return False
+
+        # Only the changed entry is updated here (see `mark_value_changed`).
+        # The binary data is built again by the callbacks of
+        # `ConstructEditor.on_root_obj_changed`, which are called after each
+        # edit, undo and redo.
+        self.entry.obj = value_delta.apply_value_delta(
+            self.delta, current_value, revert
+        )
+        self.entry.model.mark_value_changed(self.entry)
         self.entry.model.on_value_changed(self.entry)
+        return True
 
-    def undo(self) -> None:
-        self.entry.obj = self.old_value
-        self.entry.model.on_value_changed(self.entry)
+    def get_size(self) -> int:
+        return self.delta.get_size()
 
 
 class ConstructEditorModel:
@@ -47,25 +76,92 @@ class ConstructEditorModel:
     """
 
     def __init__(self):
+        # Counter that is incremented each time the displayed strings of all
+        # entries may have changed (see `invalidate_render_cache`)
+        self.render_generation = 0
+
         self.root_entry: t.Optional["entries.EntryConstruct"] = None
-        self.root_obj: t.Optional[t.Any] = None
+        self._root_obj: t.Optional[t.Any] = None
 
         # Modelwide flag, if hidden entries should be shown (hidden means starting with an underscore)
         self.hide_protected = True
 
         # Modelwide format of integer values
-        self.integer_format = IntegerFormat.Dec
+        self._integer_format = IntegerFormat.Dec
 
         # List with all entries that have the list view enabled
         self.list_viewed_entries: t.List["entries.EntryConstruct"] = []
 
-        self.command_processor = CommandProcessor(max_commands=10)
+        # Filter and sorting of the list viewed entries
+        self.list_view_states: t.Dict[
+            "entries.EntryConstruct", "list_view.ListViewState"
+        ] = {}
+
+        # Cache for the tables of the list viewed arrays (None if no table can be created)
+        self._array_tables: t.Dict[
+            "entries.EntryConstruct", t.Optional["array_table.ArrayTable"]
+        ] = {}
+
+        # Cache for the statistics of arrays
+        self._array_statistics: t.Dict[
+            "entries.EntryConstruct", t.List["statistics.FieldStatistics"]
+        ] = {}
+
+        # The undo history is limited by the memory of the commands
+        self.command_processor = CommandProcessor(max_size=16 * 1024 * 1024)
+
+        # Commands of the currently running batch edit (see `batch_edit`)
+        self._batch_commands: t.Optional[t.List[Command]] = None
+
+        # Index for searching entries, which is created on the first search
+        self._search_index: t.Optional["search_index.SearchIndex"] = None
+        self._search_index_integer_format = self.integer_format
+        self._changed_entries: t.List["entries.EntryConstruct"] = []
+
+        # Flag, if a value with subentries was changed, because then the
+        # subentries may have changed too (see `update_changed_values`)
+        self._subentries_changed = False
+
+        # Index for accessing entries by their path, which is created on the first access
+        self._path_index: t.Optional["path_index.PathIndex"] = None
+
+        # Object of the binary, that the root object is compared with and the
+        # differences to it (see `update_diff`)
+        self.compare_root_obj: t.Optional[t.Any] = None
+        self.diff: t.Optional["structural_diff.StructuralDiff"] = None
 
     @abc.abstractmethod
     def on_value_changed(self, entry: "entries.EntryConstruct"):
         """Implement this in the derived class"""
         ...
 
+    @property
+    def root_obj(self) -> t.Optional[t.Any]:
+        return self._root_obj
+
+    @root_obj.setter
+    def root_obj(self, root_obj: t.Optional[t.Any]):
+        self._root_obj = root_obj
+
+    @property
+    def integer_format(self) -> IntegerFormat:
+        return self._integer_format
+
+    @integer_format.setter
+    def integer_format(self, integer_format: IntegerFormat):
+        self._integer_format = integer_format
+        self.invalidate_render_cache()
+
+    def invalidate_render_cache(self) -> None:
+        """
+        Invalidate the cached strings of all entries (see `EntryConstruct.cached_obj_str`).
+
+        This has to be called each time all displayed strings may have
+        changed, eg. when new data is parsed. When only some values have
+        changed, only their entries are invalidated (see `mark_value_changed`).
+        """
+        self.render_generation += 1
+
     def get_children(
         self, entry: t.Optional["entries.EntryConstruct"]
     ) -> t.List["entries.EntryConstruct"]:
@@ -81,6 +177,10 @@ class ConstructEditorModel:
             self.root_entry.visible_row = True
             return [self.root_entry]
 
+        # the rows of a table have no entries (see `get_table_rows`)
+        if self.get_array_table(entry) is not None:
+            return []
+
         if entry.subentries is None:
             return []
 
@@ -94,12 +194,20 @@ class ConstructEditorModel:
 
             children.append(subentry)
             subentry.visible_row = True
+
+        # rows of list viewed entries may be filtered and sorted
+        list_view_state = self.list_view_states.get(entry)
+        if list_view_state is not None and list_view_state.active:
+            permutation = list_view_state.get_permutation(self, entry, children)
+            children = list(map(children.__getitem__, permutation))
         return children
 
     def is_container(self, entry: "entries.EntryConstruct") -> bool:
         """
         Check if an entry is a container (contains children)
         """
+        if self.get_array_table(entry) is not None:
+            return True
         return entry.subentries is not None
 
     def get_parent(
@@ -132,7 +240,7 @@ class ConstructEditorModel:
         if column == ConstructEditorColumn.Name:
             return entry.name
         if column == ConstructEditorColumn.Type:
-            return entry.typ_str
+            return entry.cached_typ_str
         if column == ConstructEditorColumn.Value:
             return entry
 
@@ -145,10 +253,64 @@ class ConstructEditorModel:
         flat_subentry_list: t.List["entries.EntryConstruct"] = []
         flat_subentry_list = self.create_flat_subentry_list(entry)
         if len(flat_subentry_list) > column:
-            return flat_subentry_list[column].obj_str
+            return flat_subentry_list[column].cached_obj_str
         else:
             return ""
 
+    def get_table_rows(self, entry: "entries.EntryConstruct") -> t.List[int]:
+        """
+        Get the rows of an array, that is shown as table (see `get_array_table`),
+        in the order they are shown.
+
+        The rows are only the indexes of the elements, their values are read
+        directly from the table (see `get_table_value`). So other than for
+        the children of an entry, no entries are created for the rows.
+        """
+        table = self.get_array_table(entry)
+        if table is None:
+            return []
+        rows = list(range(len(table)))
+
+        # rows of list viewed entries may be filtered and sorted
+        list_view_state = self.list_view_states.get(entry)
+        if list_view_state is not None and list_view_state.active:
+            return list(list_view_state.get_permutation(self, entry, rows))
+        return rows
+
+    def get_table_value(self, entry: "entries.EntryConstruct", row: int, column: int):
+        """
+        Return the value to be displayed for a row of a table (see
+        `get_table_rows`) in a specific column.
+        """
+        table = self.get_array_table(entry)
+        if table is None:
+            return ""
+        if column == ConstructEditorColumn.Name:
+            return f"[{row}]"
+        if column == ConstructEditorColumn.Type:
+            return table.row_typ_str
+        if column == ConstructEditorColumn.Value:
+            return None  # the rows have no entries, which could be edited
+        return table.get_cell_str(row, column - len(ConstructEditorColumn))
+
+    def get_table_row(
+        self, entry: "entries.EntryConstruct"
+    ) -> t.Optional[t.Tuple["entries.EntryConstruct", int]]:
+        """
+        Get the array and the row, that show an entry, if the entry is an
+        element (or a part of an element) of an array, that is shown as table.
+        """
+        child = entry
+        parent = entry.parent
+        while parent is not None:
+            if self.get_array_table(parent) is not None:
+                # the entries of the elements exist, when an element is given
+                elements = parent.subentries or []
+                return parent, elements.index(child)
+            child = parent
+            parent = parent.parent
+        return None
+
     def set_value(
         self, new_value: t.Any, entry: "entries.EntryConstruct", column: int
     ) -> None:
@@ -167,7 +329,43 @@ class ConstructEditorModel:
             new_value = add_gui_metadata(new_value, metadata)
 
         cmd = ChangeValueCmd(entry, current_value, new_value)
-        self.command_processor.submit(cmd)
+        if self._batch_commands is not None:
+            cmd.do()
+            self._batch_commands.append(cmd)
+        else:
+            self.command_processor.submit(cmd)
+
+    @property
+    def in_batch_edit(self) -> bool:
+        """Flag, if a batch edit is currently running (see `batch_edit`)"""
+        return self._batch_commands is not None
+
+    @contextlib.contextmanager
+    def batch_edit(self, name: str = "Batch edit") -> t.Iterator[None]:
+        """
+        Combine all values, that are set in this context (see `set_value`), to
+        one command, so that they can be undone at once.
+
+        If an exception is raised in the context, all values are changed back.
+        Nested batch edits are combined to the outermost one.
+        """
+        if self._batch_commands is not None:
+            yield
+            return
+
+        commands: t.List[Command] = []
+        self._batch_commands = commands
+        try:
+            yield
+        except BaseException:
+            for cmd in reversed(commands):
+                cmd.undo()
+            raise
+        finally:
+            self._batch_commands = None
+
+        if len(commands) > 0:
+            self.command_processor.store(CompositeCmd(name, commands))
 
     def create_flat_subentry_list(
         self, entry: "entries.EntryConstruct"
@@ -189,3 +387,260 @@ class ConstructEditorModel:
             child_flat_subentry_list = self.create_flat_subentry_list(child)
             flat_subentry_list.extend(child_flat_subentry_list)
         return flat_subentry_list
+
+    def get_array_table(
+        self, entry: t.Optional["entries.EntryConstruct"]
+    ) -> t.Optional["array_table.ArrayTable"]:
+        """
+        Get the table of a list viewed array, if the array can be shown as table.
+        """
+        if not isinstance(entry, entries.EntryArray):
+            return None
+        if entry not in self.list_viewed_entries:
+            return None
+
+        if entry not in self._array_tables:
+            self._array_tables[entry] = array_table.create_array_table(self, entry)
+        return self._array_tables[entry]
+
+    def get_list_view_state(
+        self, entry: "entries.EntryConstruct"
+    ) -> "list_view.ListViewState":
+        """
+        Get the filter and sorting of a list viewed entry.
+        """
+        if entry not in self.list_view_states:
+            self.list_view_states[entry] = list_view.ListViewState()
+        return self.list_view_states[entry]
+
+    def get_array_statistics(
+        self, entry: "entries.EntryArray"
+    ) -> t.List["statistics.FieldStatistics"]:
+        """
+        Get the statistics of all fields of an array.
+        """
+        if entry not in self._array_statistics:
+            self._array_statistics[entry] = statistics.compute_array_statistics(
+                self, entry
+            )
+        return self._array_statistics[entry]
+
+    def clear_array_tables(self) -> None:
+        """
+        Clear the cached tables, eg. when the data of the tables has changed.
+
+        The cached statistics and the filter and sort results of the list
+        views are also invalidated, because they depend on the same data.
+        """
+        self._array_tables.clear()
+        self._array_statistics.clear()
+        for list_view_state in self.list_view_states.values():
+            list_view_state.invalidate()
+
+    def get_search_index(self) -> "search_index.SearchIndex":
+        """
+        Get the search index of all entries.
+
+        The index is created on the first call. Entries that have changed
+        since then (see `mark_value_changed`) are updated incrementally.
+        """
+        if (
+            self._search_index is None
+            or self._search_index_integer_format is not self.integer_format
+        ):
+            self._changed_entries.clear()
+            self._search_index = search_index.SearchIndex(self)
+            self._search_index_integer_format = self.integer_format
+            return self._search_index
+
+        # update the parents of the changed entries, because the values of
+        # the siblings may also depend on the changed value (eg. a length)
+        updated: t.Set["entries.EntryConstruct"] = set()
+        for entry in self._changed_entries:
+            parent = entry.parent if entry.parent is not None else entry
+            if parent not in updated:
+                self._search_index.update(parent)
+                updated.add(parent)
+        self._changed_entries.clear()
+        return self._search_index
+
+    def mark_value_changed(self, entry: "entries.EntryConstruct") -> None:
+        """
+        Mark the value of an entry as changed, so that caches depending on
+        the value can be updated.
+        """
+        # only the strings of the entry and of its parents can show the value
+        # (eg. the length of an array)
+        parent: t.Optional["entries.EntryConstruct"] = entry
+        while parent is not None:
+            parent.invalidate_render_cache()
+            parent = parent.parent
+        if self._search_index is not None:
+            self._changed_entries.append(entry)
+        if entry.subentries is not None:
+            # the values of all subentries may have changed
+            self._subentries_changed = True
+            self.invalidate_render_cache()
+
+    def update_changed_values(self, old_root_obj: t.Any) -> bool:
+        """
+        Update all entries, whose values differ between an old root object
+        and the current one (see `mark_value_changed` and `on_value_changed`).
+
+        This is needed after the built binary was parsed again (eg. after an
+        edit or an undo), because this also changes values that depend on the
+        edited values (eg. a checksum or a length field).
+
+        :return: False if not only values have changed (eg. the length of an
+            array), then the whole view has to be reloaded
+        """
+        if self.root_entry is None or self.root_obj is None or old_root_obj is None:
+            self.clear_search_index()
+            self._subentries_changed = False
+            return False
+
+        diff = structural_diff.StructuralDiff(
+            entries.create_path_str(self.root_entry.path), old_root_obj, self.root_obj
+        )
+        changed_entries: t.List["entries.EntryConstruct"] = []
+        only_values_changed = True
+        for item in diff.items:
+            # removed objects have no entry anymore, so the next parent is used
+            path = entries.parse_path_str(item.path_str)
+            entry = self.get_entry(item.path_str)
+            if entry is None or not item.is_value_change:
+                only_values_changed = False
+            while entry is None and len(path) > 1:
+                path = path[:-1]
+                entry = self.get_entry(entries.create_path_str(path))
+            if entry is not None:
+                changed_entries.append(entry)
+
+        for entry in changed_entries:
+            self.mark_value_changed(entry)
+        subentries_changed = self._subentries_changed
+        self._subentries_changed = False
+
+        # the changed values may change the order of the filtered or sorted rows
+        if any(state.active for state in self.list_view_states.values()):
+            return False
+        if subentries_changed or not only_values_changed:
+            return False
+
+        for entry in changed_entries:
+            self.on_value_changed(entry)
+        return True
+
+    def clear_search_index(self) -> None:
+        """
+        Clear the search index, eg. when completely new data is parsed.
+        """
+        self._search_index = None
+        self._changed_entries.clear()
+
+    def get_path_index(self) -> "path_index.PathIndex":
+        """
+        Get the index of the entries by their path.
+
+        The index is created again, when the root entry has changed (eg. a
+        new construct is set).
+        """
+        if self._path_index is None or not self._path_index.is_valid(self):
+            self._path_index = path_index.PathIndex(self)
+        return self._path_index
+
+    def invalidate_path_index(self) -> None:
+        """
+        Invalidate the index of the entries by their path, eg. when new
+        data is parsed.
+        """
+        self._path_index = None
+
+    def get_entry(self, path_str: str) -> t.Optional["entries.EntryConstruct"]:
+        """
+        Get the entry of a path string (eg. "root.sections[3].name").
+
+        :return: the entry or None, if no entry with this path exists
+        """
+        return self.get_path_index().get_entry(path_str)
+
+    def get_obj(self, path_str: str) -> t.Any:
+        """
+        Get the object of a path string (eg. "root.sections[3].name").
+
+        Other than `get_entry(path_str).obj` no entries are needed for this.
+
+        :raises KeyError: if the path does not exist in the root object
+        :raises ValueError: if the path string is invalid
+        """
+        if self.root_entry is None:
+            raise KeyError(path_str)
+        root_path_str = entries.create_path_str(self.root_entry.path)
+        return path_index.compile_path_accessor(path_str, root_path_str)(self.root_obj)
+
+    def update_diff(self) -> None:
+        """
+        Compare the root object with `compare_root_obj` again, eg. when new
+        data is parsed.
+        """
+        if (
+            self.root_entry is None
+            or self.root_obj is None
+            or self.compare_root_obj is None
+        ):
+            self.diff = None
+        else:
+            self.diff = structural_diff.StructuralDiff(
+                entries.create_path_str(self.root_entry.path),
+                self.root_obj,
+                self.compare_root_obj,
+            )
+
+    def get_diff_kind(
+        self, entry: "entries.EntryConstruct"
+    ) -> t.Optional["structural_diff.DiffKind"]:
+        """
+        Get the kind of the difference of an entry, when compared with
+        `compare_root_obj` (None, if the entry has not changed).
+        """
+        if self.diff is None:
+            return None
+        item = self.diff.get_item(entries.create_path_str(entry.path))
+        if item is None:
+            return None
+        return item.kind
+
+    def contains_diff(self, entry: "entries.EntryConstruct") -> bool:
+        """Check if the subentries of an entry contain differences"""
+        if self.diff is None:
+            return False
+        return self.diff.contains_changes(entries.create_path_str(entry.path))
+
+    def get_compare_byte_range(
+        self, entry: "entries.EntryConstruct"
+    ) -> t.Optional[t.Tuple[int, int]]:
+        """
+        Get the byte range of an entry in the compared binary. For entries in
+        nested streams, the byte range of the next parent in the root stream
+        is returned (None, if the entry does not exist in the compared binary).
+        """
+        if self.root_entry is None or self.compare_root_obj is None:
+            return None
+        root_metadata = get_gui_metadata(self.compare_root_obj)
+        if root_metadata is None:
+            return None
+
+        root_path_str = entries.create_path_str(self.root_entry.path)
+        current: t.Optional["entries.EntryConstruct"] = entry
+        while current is not None:
+            path_str = entries.create_path_str(current.path)
+            try:
+                accessor = path_index.compile_path_accessor(path_str, root_path_str)
+                obj = accessor(self.compare_root_obj)
+            except KeyError:
+                return None
+            metadata = get_gui_metadata(obj)
+            if metadata is not None and metadata.stream is root_metadata.stream:
+                return metadata.byte_range
+            current = current.parent
+        return None
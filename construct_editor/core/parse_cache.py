@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import collections
+import functools
+import hashlib
+import sys
+import typing as t
+
+# Maximum size of all cached results (in bytes)
+MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+# Smaller inputs are not cached, because hashing them is not faster
+# than calling the function again.
+MIN_INPUT_SIZE = 256
+
+_CacheKey = t.Tuple[t.Any, int, bytes]
+
+_cache: "collections.OrderedDict[_CacheKey, t.Tuple[t.Any, int]]" = (
+    collections.OrderedDict()
+)
+_cache_size = 0
+
+BytesLike = t.Union[bytes, bytearray, memoryview]
+
+
+def memoize_bytes_func(func: t.Callable[[BytesLike], t.Any]) -> t.Callable[[t.Any], t.Any]:
+    """
+    Memoize a function, that only depends on a bytes argument (eg. a
+    decompression function).
+
+    The results are cached by the length and the hash of the input, so
+    the function is not called again on a re-parse, if the input has not
+    changed (even if it is a new object). The function has to be pure and
+    the results must not be modified by the caller.
+    """
+
+    @functools.wraps(func)
+    def wrapper(data: t.Any) -> t.Any:
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            return func(data)  # eg. a stream
+        if len(data) < MIN_INPUT_SIZE:
+            return func(data)
+
+        key: _CacheKey = (
+            func,
+            len(data),
+            hashlib.blake2b(data, digest_size=16).digest(),
+        )
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached[0]
+
+        result = func(data)
+        _add_to_cache(key, result)
+        return result
+
+    return wrapper
+
+
+def _add_to_cache(key: _CacheKey, result: t.Any) -> None:
+    global _cache_size
+
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        size = len(result)
+    else:
+        size = sys.getsizeof(result)
+    if size > MAX_CACHE_SIZE:
+        return
+
+    _cache[key] = (result, size)
+    _cache_size += size
+    while _cache_size > MAX_CACHE_SIZE:
+        _, (_, removed_size) = _cache.popitem(last=False)
+        _cache_size -= removed_size
+
+
+def clear_parse_cache() -> None:
+    """Remove all cached results"""
+    global _cache_size
+    _cache.clear()
+    _cache_size = 0
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import functools
+import typing as t
+
+import construct_editor.core.entries as entries
+import construct_editor.core.model as model
+from construct_editor.core.preprocessor import resolve_lazy
+
+# Function that gets an object from the root object
+PathAccessor = t.Callable[[t.Any], t.Any]
+
+
+class PathIndex:
+    """
+    Index from the path strings (see `entries.create_path_str`) to the entries.
+
+    The index is built lazily: the children of an entry are indexed, when a
+    path below the entry is requested the first time. The entries get their
+    objects from the root object of the model, so the index stays valid when
+    the root object is replaced (eg. after an edit). Only the children of some
+    entries depend on the object (eg. the elements of an array or the fields
+    of the selected case of a `cs.Switch`), so these are checked on each
+    access and indexed again, if they have changed. The whole index has to
+    be created again only when the root entry changes (see `is_valid`).
+
+    If multiple entries have the same path (eg. a `cs.Switch` and its cases),
+    the outermost entry is indexed.
+    """
+
+    def __init__(self, model: "model.ConstructEditorModel"):
+        self.root_entry = model.root_entry
+        self._children: t.Dict["entries.EntryConstruct", _IndexedChildren] = {}
+
+    def is_valid(self, model: "model.ConstructEditorModel") -> bool:
+        """Check if the index was created for the current root entry of the model"""
+        return self.root_entry is model.root_entry
+
+    def get_entry(self, path_str: str) -> t.Optional["entries.EntryConstruct"]:
+        """
+        Get the entry of a path string (eg. "root.sections[3].name").
+
+        :return: the entry or None, if no entry with this path exists
+        """
+        if self.root_entry is None:
+            return None
+        try:
+            path = entries.parse_path_str(path_str)
+        except ValueError:
+            return None
+        root_path = self.root_entry.path
+        if path[: len(root_path)] != root_path:
+            return None
+
+        entry = self.root_entry
+        for name in path[len(root_path) :]:
+            child = self._get_children(entry).get(name)
+            if child is None:
+                return None
+            entry = child
+        return entry
+
+    def _get_children(
+        self, entry: "entries.EntryConstruct"
+    ) -> t.Dict[str, "entries.EntryConstruct"]:
+        """Get the children of an entry by their names, index them if needed"""
+        indexed = self._children.get(entry)
+        if indexed is not None and indexed.is_current():
+            return indexed.names
+
+        new_indexed = _IndexedChildren(entry)
+        if indexed is not None:
+            # forget the indexed children of removed entries
+            for child in indexed.names.values():
+                if new_indexed.names.get(child.name) is not child:
+                    self._forget(child)
+        self._children[entry] = new_indexed
+        return new_indexed.names
+
+    def _forget(self, entry: "entries.EntryConstruct") -> None:
+        indexed = self._children.pop(entry, None)
+        if indexed is not None:
+            for child in indexed.names.values():
+                self._forget(child)
+
+
+class _IndexedChildren:
+    """
+    Children of an entry by their names. The children of subentries, whose
+    names are excluded from the path (eg. the cases of a `cs.Switch`), are
+    children of the entry itself.
+    """
+
+    __slots__ = ("names", "_lists")
+
+    def __init__(self, entry: "entries.EntryConstruct"):
+        self.names: t.Dict[str, "entries.EntryConstruct"] = {}
+
+        # (entry, its subentries, the last subentry) of all entries, whose
+        # subentries were indexed
+        self._lists: t.List[
+            t.Tuple[
+                "entries.EntryConstruct",
+                t.List["entries.EntryConstruct"],
+                t.Optional["entries.EntryConstruct"],
+            ]
+        ] = []
+        self._add(entry)
+
+    def _add(self, entry: "entries.EntryConstruct") -> None:
+        subentries = entry.subentries
+        if subentries is None:
+            return
+        last = subentries[-1] if subentries else None
+        self._lists.append((entry, subentries, last))
+        for subentry in subentries:
+            name = subentry.name
+            if isinstance(name, entries.NameExcludedFromPath) or name == "":
+                self._add(subentry)
+            else:
+                self.names.setdefault(name, subentry)
+
+    def is_current(self) -> bool:
+        """Check if the subentries of the indexed entries are still the same"""
+        for entry, subentries, last in self._lists:
+            current = entry.subentries
+            if current is None or len(current) != len(subentries):
+                return False
+            if current is subentries:
+                # the elements of an array are changed in place (see
+                # `EntryArray.subentries`)
+                if len(current) > 0 and current[-1] is not last:
+                    return False
+            elif any(a is not b for a, b in zip(current, subentries)):
+                return False  # eg. another case of a `cs.Switch` is selected
+        return True
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_path_accessor(path_str: str, root_path_str: str) -> PathAccessor:
+    """
+    Compile a path string (eg. "root.sections[3].name") to a function, that
+    gets the object of the path from the root object. `root_path_str` is the
+    path string of the root entry (eg. "root").
+
+    The compiled accessors are cached, so that repeated accesses of the same
+    path do not have to parse the path string again.
+
+    :raises KeyError: if the path does not start with the path of the root
+    :raises ValueError: if the path string is invalid
+    """
+    path = entries.parse_path_str(path_str)
+    root_path = entries.parse_path_str(root_path_str)
+    if path[: len(root_path)] != root_path:
+        raise KeyError(path_str)
+
+    keys: t.List[t.Union[str, int]] = []
+    for name in path[len(root_path) :]:
+        if isinstance(name, entries.ListIndexName):
+            keys.append(int(name[1:-1]))
+        else:
+            keys.append(name)
+
+    def accessor(root_obj: t.Any) -> t.Any:
+        obj = root_obj
+        try:
+            for key in keys:
+                obj = resolve_lazy(obj)[key]
+        except (KeyError, IndexError, AttributeError, TypeError):
+            raise KeyError(path_str) from None
+        return resolve_lazy(obj)
+
+    return accessor
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import copy
 import enum
+import functools
 import io
 import typing as t
 
@@ -8,13 +9,65 @@ import construct as cs
 import construct_typed as cst
 import wrapt
 
+import construct_editor.core.parse_cache as parse_cache
 
-class GuiMetaData(t.TypedDict):
-    byte_range: t.Tuple[int, int]
-    construct: cs.Construct
-    context: "cs.Context"
-    stream: io.BytesIO
-    child_gui_metadata: t.Optional["GuiMetaData"]
+
+class GuiMetaData:
+    """
+    GUI metadata of a parsed object.
+
+    The parse context is not stored, because it would keep all parsed objects
+    and intermediate values alive. Constructs that select their subcon from
+    the context (eg. `cs.Switch`) store the result of the selection in
+    `selector` instead (see `IncludeGuiMetaData`).
+
+    If nested constructs add metadata to the same object (eg. a `cs.Switch`
+    in a `cs.Select`), the metadata of the inner construct is saved in
+    `child_gui_metadata` (see `get_gui_metadata_of_construct`).
+    """
+
+    __slots__ = (
+        "offset_start",
+        "offset_end",
+        "construct",
+        "stream",
+        "selector",
+        "child_gui_metadata",
+    )
+
+    def __init__(
+        self,
+        offset_start: int,
+        offset_end: int,
+        construct: "cs.Construct[t.Any, t.Any]",
+        stream: io.BytesIO,
+        selector: t.Any = None,
+        child_gui_metadata: t.Optional["GuiMetaData"] = None,
+    ):
+        self.offset_start = offset_start
+        self.offset_end = offset_end
+        self.construct = construct
+        self.stream = stream
+        self.selector = selector
+        self.child_gui_metadata = child_gui_metadata
+
+    @property
+    def byte_range(self) -> t.Tuple[int, int]:
+        return (self.offset_start, self.offset_end)
+
+    def __reduce__(self):
+        # compact representation for pickling (eg. for the session cache)
+        return (
+            GuiMetaData,
+            (
+                self.offset_start,
+                self.offset_end,
+                self.construct,
+                self.stream,
+                self.selector,
+                self.child_gui_metadata,
+            ),
+        )
 
 
 class IntWithGuiMetadata(int):
@@ -50,6 +103,76 @@ class ObjProxyWithGuiMetaData(wrapt.ObjectProxy):
             self, "__construct_editor_metadata__", gui_metadata
         )
 
+    # object proxies cannot be pickled by default (eg. for the session cache)
+    def __reduce__(self):
+        return (
+            ObjProxyWithGuiMetaData,
+            (self.__wrapped__, self.__construct_editor_metadata__),
+        )
+
+    def __reduce_ex__(self, protocol):
+        return self.__reduce__()
+
+
+class LazyObj:
+    """
+    Parsed object of a `cs.Lazy`. The subcon is only parsed, when the object
+    is called the first time (see `resolve_lazy`). The result is cached, so
+    the subcon is never parsed twice.
+    """
+
+    __slots__ = ("_parsefunc", "_obj", "__construct_editor_metadata__")
+
+    def __init__(self, parsefunc: t.Callable[[], t.Any]):
+        self._parsefunc: t.Optional[t.Callable[[], t.Any]] = parsefunc
+        self._obj: t.Any = None
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._parsefunc is None
+
+    def __call__(self) -> t.Any:
+        if self._parsefunc is not None:
+            self._obj = self._parsefunc()
+            self._parsefunc = None  # release the stream and the context
+        return self._obj
+
+    def __repr__(self) -> str:
+        if self.is_parsed:
+            return f"<LazyObj: {self._obj!r}>"
+        return "<LazyObj: not parsed>"
+
+
+def resolve_lazy(obj: t.Any) -> t.Any:
+    """Get the parsed object, if the object is a `LazyObj` (parse it if not done yet)"""
+    if isinstance(obj, LazyObj):
+        return obj()
+    return obj
+
+
+class EditableLazyContainer(cs.LazyContainer):
+    """
+    `cs.LazyContainer` where values can be set. The original class only
+    reads the values from its cache, so setting an item has no effect.
+    """
+
+    def __setitem__(self, index, value):
+        if isinstance(index, str):
+            index = self._struct._subconsindexes[index]  # KeyError
+        self._values[index] = value
+
+
+class EditableLazyListContainer(cs.LazyListContainer):
+    """
+    `cs.LazyListContainer` where values can be set. The original class only
+    reads the values from its cache, so setting an item has no effect.
+    """
+
+    def __setitem__(self, index, value):
+        if not 0 <= index < len(self):
+            raise IndexError("list assignment index out of range")
+        self._values[index] = value  # type: ignore
+
 
 def get_gui_metadata(obj: t.Any) -> t.Optional[GuiMetaData]:
     """Get the GUI metadata if they are available"""
@@ -59,6 +182,20 @@ def get_gui_metadata(obj: t.Any) -> t.Optional[GuiMetaData]:
         return None
 
 
+def get_gui_metadata_of_construct(
+    obj: t.Any, construct: "cs.Construct[t.Any, t.Any]"
+) -> t.Optional[GuiMetaData]:
+    """
+    Get the GUI metadata, that was created while parsing the object with a
+    specific construct. This is needed when nested constructs add metadata
+    to the same object.
+    """
+    gui_metadata = get_gui_metadata(obj)
+    while gui_metadata is not None and gui_metadata.construct is not construct:
+        gui_metadata = gui_metadata.child_gui_metadata
+    return gui_metadata
+
+
 def add_gui_metadata(obj: t.Any, gui_metadata: GuiMetaData) -> t.Any:
     """
     Append the private field "__construct_editor_metadata__" to an object
@@ -78,6 +215,11 @@ def add_gui_metadata(obj: t.Any, gui_metadata: GuiMetaData) -> t.Any:
     elif obj_type is bytearray:
         obj = BytearrayWithGuiMetadata(obj)
         obj.__construct_editor_metadata__ = gui_metadata
+    elif obj_type is cs.EnumIntegerString:
+        # `cs.Enum` returns the same string for all objects with the same
+        # value, so the metadata must not be added to the original string.
+        obj = cs.EnumIntegerString.new(obj.intvalue, str(obj))
+        obj.__construct_editor_metadata__ = gui_metadata
     elif obj_type is str:
         obj = StrWithGuiMetadata(obj)
         obj.__construct_editor_metadata__ = gui_metadata
@@ -92,30 +234,44 @@ def add_gui_metadata(obj: t.Any, gui_metadata: GuiMetaData) -> t.Any:
     return obj
 
 
+# Function that selects the used subcon of a construct while parsing.
+# The arguments are the parse context (`cs.Context`, which is only available
+# for type annotations) and the GUI metadata of the parsed object (if the
+# object already has metadata from the subcon).
+SelectorFunc = t.Callable[[t.Any, t.Optional[GuiMetaData]], t.Any]
+
+
 class IncludeGuiMetaData(cs.Subconstruct):
     """Include GUI metadata to the parsed object"""
 
-    def __init__(self, subcon, bitwise: bool):
+    def __init__(self, subcon, bitwise: bool, selector: t.Optional[SelectorFunc] = None):
         super().__init__(subcon)  # type: ignore
         self.bitwise = bitwise
+        self.selector = selector
 
     def _parse(self, stream, context, path):
         offset_start = cs.stream_tell(stream, path)
         obj = self.subcon._parsereport(stream, context, path)  # type: ignore
         offset_end = cs.stream_tell(stream, path)
 
+        if self.bitwise is True:
+            stream._construct_bitstream_flag = True
+
         # Maybe the obj has already gui_metadata. Read it
         # out and save it in the parent gui_metadata object.
         child_gui_metadata = get_gui_metadata(obj)
 
-        if self.bitwise is True:
-            stream._construct_bitstream_flag = True
+        # Only the selected subcon is saved, not the whole context.
+        selector = None
+        if self.selector is not None:
+            selector = self.selector(context, child_gui_metadata)
 
         gui_metadata = GuiMetaData(
-            byte_range=(offset_start, offset_end),
+            offset_start=offset_start,
+            offset_end=offset_end,
             construct=self.subcon,
-            context=context,
             stream=stream,
+            selector=selector,
             child_gui_metadata=child_gui_metadata,
         )
 
@@ -130,6 +286,40 @@ class IncludeGuiMetaData(cs.Subconstruct):
         return getattr(self.subcon, name)
 
 # #############################################################################
+def _create_evaluate_selector(param: t.Any, ignore_errors: bool = False) -> SelectorFunc:
+    """Create a selector, that evaluates a param (eg. `cs.Switch.keyfunc`)"""
+
+    def selector(context: "cs.Context", child_gui_metadata: t.Optional[GuiMetaData]):
+        try:
+            return cs.evaluate(param, context)
+        except Exception:
+            if ignore_errors is False:
+                raise
+            return None
+
+    return selector
+
+
+def _create_select_selector(
+    subcons: t.List["cs.Construct[t.Any, t.Any]"],
+) -> SelectorFunc:
+    """Create a selector, that detects the index of the parsed option of a `cs.Select`"""
+    # map the ids of the options (and of all wrapped constructs) to the index
+    option_indexes: t.Dict[int, int] = {}
+    for idx, subcon in enumerate(subcons):
+        option_indexes.setdefault(id(subcon), idx)
+        while isinstance(subcon, (cs.Renamed, IncludeGuiMetaData)):
+            subcon = subcon.subcon
+            option_indexes.setdefault(id(subcon), idx)
+
+    def selector(context: "cs.Context", child_gui_metadata: t.Optional[GuiMetaData]):
+        if child_gui_metadata is None:
+            return None
+        return option_indexes.get(id(child_gui_metadata.construct))
+
+    return selector
+
+
 def include_metadata(
     constr: "cs.Construct[t.Any, t.Any]", bitwise: bool = False
 ) -> "cs.Construct[t.Any, t.Any]":
@@ -174,6 +364,93 @@ def include_metadata(
         constr.subcon = include_metadata(constr.subcon, bitwise=True)
         return IncludeGuiMetaData(constr, bitwise)
 
+    # Compressed ##############################################################
+    elif isinstance(constr, (cs.Compressed, cs.CompressedLZ4)):
+        constr = copy.copy(constr)  # constr is modified, so we have to make a copy
+        constr.subcon = include_metadata(constr.subcon, bitwise)
+
+        # decompress unchanged data only once (eg. on a re-parse)
+        decode = constr._decode
+
+        def decompress(data: parse_cache.BytesLike) -> t.Any:
+            # the decompression does not depend on the context
+            return decode(bytes(data), None, None)  # type: ignore
+
+        cached_decode = parse_cache.memoize_bytes_func(decompress)
+        constr._decode = lambda data, context, path: cached_decode(data)
+        return IncludeGuiMetaData(constr, bitwise)
+
+    # Lazy ####################################################################
+    elif isinstance(constr, cs.Lazy):
+        constr = copy.copy(constr)  # constr is modified, so we have to make a copy
+        constr.subcon = include_metadata(constr.subcon, bitwise)
+
+        # parse the subcon only once, when it is requested the first time
+        parse = constr._parse  # type: ignore
+        constr._parse = lambda stream, context, path: LazyObj(  # type: ignore
+            parse(stream, context, path)
+        )
+        return IncludeGuiMetaData(constr, bitwise)
+
+    # LazyStruct ##############################################################
+    elif isinstance(constr, cs.LazyStruct):
+        constr = copy.copy(constr)  # constr is modified, so we have to make a copy
+        new_subcons = []
+        for subcon in constr.subcons:
+            new_subcons.append(include_metadata(subcon, bitwise))
+        constr.subcons = new_subcons
+        constr._subcons = cs.Container((sc.name,sc) for sc in constr.subcons if sc.name)
+
+        parse = constr._parse
+
+        def parse_lazy_struct(stream, context, path):
+            obj = parse(stream, context, path)
+            return EditableLazyContainer(  # type: ignore
+                obj._struct,
+                obj._stream,
+                obj._offsets,
+                obj._values,
+                obj._context,
+                obj._path,
+            )
+
+        constr._parse = parse_lazy_struct  # type: ignore
+        return IncludeGuiMetaData(constr, bitwise)
+
+    # LazyArray ###############################################################
+    elif isinstance(constr, cs.LazyArray):
+        constr = copy.copy(constr)  # constr is modified, so we have to make a copy
+        constr.subcon = include_metadata(constr.subcon, bitwise)
+
+        parse = constr._parse  # type: ignore
+
+        def parse_lazy_array(stream, context, path):
+            obj = parse(stream, context, path)
+            return EditableLazyListContainer(  # type: ignore
+                obj._subcon,
+                obj._stream,
+                obj._count,
+                obj._offsets,
+                obj._values,
+                obj._context,
+                obj._path,
+            )
+
+        constr._parse = parse_lazy_array  # type: ignore
+        return IncludeGuiMetaData(constr, bitwise)
+
+    # LazyBound ###############################################################
+    elif isinstance(constr, cs.LazyBound):
+        constr = copy.copy(constr)  # constr is modified, so we have to make a copy
+
+        # The subcon is processed on the first use, because the processing
+        # would never end for recursive constructs otherwise.
+        subconfunc = constr.subconfunc
+        constr.subconfunc = functools.lru_cache(maxsize=None)(
+            lambda: include_metadata(subconfunc(), bitwise)
+        )
+        return constr
+
     # Subconstructs ###########################################################
     elif isinstance(
         constr,
@@ -220,7 +497,8 @@ def include_metadata(
             new_subcons.append(include_metadata(subcon, bitwise))
         constr.subcons = new_subcons
         constr._subcons = cs.Container((sc.name,sc) for sc in constr.subcons if sc.name)
-        return IncludeGuiMetaData(constr, bitwise)
+        selector = _create_evaluate_selector(constr.parsebuildfrom, ignore_errors=True)
+        return IncludeGuiMetaData(constr, bitwise, selector)
 
     # Select ##################################################################
     elif isinstance(constr, cs.Select):
@@ -229,14 +507,19 @@ def include_metadata(
         for subcon in constr.subcons:
             new_subcons.append(include_metadata(subcon, bitwise))
         constr.subcons = new_subcons
-        return IncludeGuiMetaData(constr, bitwise)
+        selector = _create_select_selector(constr.subcons)
+        return IncludeGuiMetaData(constr, bitwise, selector)
 
     # IfThenElse ##############################################################
     elif isinstance(constr, cs.IfThenElse):
         constr = copy.copy(constr)  # constr is modified, so we have to make a copy
         constr.thensubcon = include_metadata(constr.thensubcon, bitwise)
         constr.elsesubcon = include_metadata(constr.elsesubcon, bitwise)
-        return IncludeGuiMetaData(constr, bitwise)
+        condfunc = constr.condfunc
+        selector = _create_evaluate_selector(
+            lambda ctx: bool(cs.evaluate(condfunc, ctx)), ignore_errors=True
+        )
+        return IncludeGuiMetaData(constr, bitwise, selector)
 
     # Switch ##################################################################
     elif isinstance(constr, cs.Switch):
@@ -247,7 +530,8 @@ def include_metadata(
         constr.cases = new_cases
         if constr.default is not None:
             constr.default = include_metadata(constr.default, bitwise)
-        return IncludeGuiMetaData(constr, bitwise)
+        selector = _create_evaluate_selector(constr.keyfunc)
+        return IncludeGuiMetaData(constr, bitwise, selector)
 
     # Checksum #################################################################
     elif isinstance(constr, cs.Checksum):
@@ -286,7 +570,6 @@ def include_metadata(
     # # Grouping:
     # - Sequence
     # - Union
-    # - LazyStruct
 
     # # Grouping lists:
     # - Array
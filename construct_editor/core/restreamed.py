@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+import collections
+import io
+import typing as t
+
+import construct as cs
+
+# The decoded data is read in blocks of this size (in decoded bytes), so that
+# windows of nearby byte ranges are the same and can be reused from the cache.
+WINDOW_BLOCK_SIZE = 4096
+
+# Maximum number of decoded windows, that are cached
+MAX_CACHED_WINDOWS = 32
+
+_WindowKey = t.Tuple[bytes, t.Tuple[t.Tuple[t.Any, int], ...], int, int]
+
+_window_cache: "collections.OrderedDict[_WindowKey, io.BytesIO]" = (
+    collections.OrderedDict()
+)
+
+
+def get_restreamed_window(
+    stream: cs.RestreamedBytesIO, byte_range: t.Tuple[int, int]
+) -> t.Tuple[io.BytesIO, int]:
+    """
+    Get the decoded data of a `RestreamedBytesIO` around a byte range as a
+    normal `BytesIO`. This is eg. nessesary for:
+      - `cs.Bitwise(cs.GreedyRange(cs.Bit))`
+      - `cs.BitsSwapped(cs.Bitwise(cs.GreedyRange(cs.Bit)))`
+
+    Only the blocks around the byte range are decoded, because a decoded
+    stream can be much bigger than the original data (eg. a bitwise stream
+    is 8 times bigger).
+
+    The windows are cached by the underlying bytes of the window, so the
+    cache is also used after a re-parse, if these bytes have not changed.
+
+    :return: the decoded window and the offset of the window in the decoded stream
+    """
+    root, chain = _get_restreamed_chain(stream)
+    start, end = _get_window_bounds(byte_range[0], byte_range[1])
+    return _get_window(root, chain, start, end), start
+
+
+def get_packed_bits(
+    stream: t.Union[io.BytesIO, cs.RestreamedBytesIO], bit_range: t.Tuple[int, int]
+) -> t.Optional[t.Tuple[io.BytesIO, int]]:
+    """
+    Get the data of a bitstream (one byte per bit, see `cs.bytes2bits`) with
+    8 bits packed into one byte. For a `RestreamedBytesIO` the bitstream is
+    not decoded at all, only a window of the bytes below is read (see
+    `get_restreamed_window`).
+
+    :return: the packed data and the bit offset of the data in the bitstream,
+        or None if the stream can't be packed
+    """
+    if isinstance(stream, cs.RestreamedBytesIO):
+        root, chain = _get_restreamed_chain(stream)
+        outermost = chain[-1]
+        if outermost.decoder is not cs.bytes2bits or outermost.decoderunit != 1:
+            return None
+        start, end = _get_window_bounds(bit_range[0] // 8, -(-bit_range[1] // 8))
+        return _get_window(root, chain[:-1], start, end), start * 8
+
+    # A normal BytesIO (eg. of `cs.Transformed`) contains the whole bitstream,
+    # so it can only be packed completely.
+    packed: t.Optional[io.BytesIO] = getattr(stream, "_construct_packed_bits", None)
+    if packed is None:
+        try:
+            packed = io.BytesIO(cs.bits2bytes(stream.getvalue()))
+        except (ValueError, KeyError):
+            return None  # no valid bitstream
+        setattr(stream, "_construct_packed_bits", packed)
+    return packed, 0
+
+
+def _get_window_bounds(start: int, end: int) -> t.Tuple[int, int]:
+    """Extend a range to whole blocks, with one additional block before and after"""
+    start = max(start - WINDOW_BLOCK_SIZE, 0)
+    start -= start % WINDOW_BLOCK_SIZE
+    end = end + WINDOW_BLOCK_SIZE
+    end += -end % WINDOW_BLOCK_SIZE
+    return start, end
+
+
+def _get_window(
+    root: io.BytesIO, chain: t.List[cs.RestreamedBytesIO], start: int, end: int
+) -> io.BytesIO:
+    """Get the decoded bytes [start, end) of the outermost stream of the chain"""
+    decoder = _RangeDecoder(root, chain)
+    root_start, root_end = decoder.get_root_range(len(chain), start, end)
+    key: _WindowKey = (
+        root.getvalue()[root_start:root_end],
+        tuple((s.decoder, s.decoderunit) for s in chain),
+        start,
+        end,
+    )
+    window = _window_cache.get(key)
+    if window is not None:
+        _window_cache.move_to_end(key)
+        return window
+
+    window = io.BytesIO(decoder.read(len(chain), start, end))
+    _window_cache[key] = window
+    if len(_window_cache) > MAX_CACHED_WINDOWS:
+        _window_cache.popitem(last=False)
+    return window
+
+
+def clear_restreamed_cache() -> None:
+    """Remove all cached windows"""
+    _window_cache.clear()
+
+
+def clear_stream_cache(stream: io.BytesIO) -> None:
+    """
+    Remove the data, that is cached at a stream (see `get_packed_bits`),
+    eg. when data is appended to the stream.
+    """
+    vars(stream).pop("_construct_packed_bits", None)
+
+
+def _get_restreamed_chain(
+    stream: cs.RestreamedBytesIO,
+) -> t.Tuple[io.BytesIO, t.List[cs.RestreamedBytesIO]]:
+    """
+    Get the underlying `BytesIO` and all `RestreamedBytesIO`s above it
+    (from the innermost to the outermost).
+    """
+    chain: t.List[cs.RestreamedBytesIO] = []
+    substream: t.Any = stream
+    while isinstance(substream, cs.RestreamedBytesIO):
+        chain.insert(0, substream)
+        substream = substream.substream
+
+    if not isinstance(substream, io.BytesIO):
+        raise RuntimeError(
+            "stream.substream has to be io.BytesIO or cs.RestreamedBytesIO"
+        )
+    return substream, chain
+
+
+class _RangeDecoder:
+    """
+    Decode byte ranges of a chain of `RestreamedBytesIO`s, without decoding
+    the data before the range.
+
+    The decoder is called for every unit, like `RestreamedBytesIO.read` does.
+    The size of a decoded unit is assumed to be constant (which is true for
+    all decoders of construct, eg. `bytes2bits` and `swapbitsinbytes`).
+    """
+
+    def __init__(self, root: io.BytesIO, chain: t.List[cs.RestreamedBytesIO]):
+        self._root = root
+        self._chain = chain
+        self._decoded_unit_sizes: t.Dict[int, int] = {}
+
+    def _get_decoded_unit_size(self, level: int) -> int:
+        size = self._decoded_unit_sizes.get(level)
+        if size is None:
+            stream = self._chain[level - 1]
+            unit = self.read(level - 1, 0, stream.decoderunit)
+            size = len(stream.decoder(unit)) if unit else 0
+            self._decoded_unit_sizes[level] = size
+        return size
+
+    def get_root_range(self, level: int, start: int, end: int) -> t.Tuple[int, int]:
+        """
+        Get the range of the underlying `BytesIO`, that is read for the
+        decoded bytes [start, end) of a level (see `read`).
+        """
+        if level == 0:
+            return start, end
+
+        decoded_unit_size = self._get_decoded_unit_size(level)
+        if decoded_unit_size == 0 or start >= end:
+            return 0, 0
+
+        first_unit = start // decoded_unit_size
+        last_unit = -(-end // decoded_unit_size)
+        unit_size = self._chain[level - 1].decoderunit
+        return self.get_root_range(
+            level - 1, first_unit * unit_size, last_unit * unit_size
+        )
+
+    def read(self, level: int, start: int, end: int) -> bytes:
+        """
+        Read the decoded bytes [start, end) of a level
+        (0 = underlying `BytesIO`, len(chain) = outermost `RestreamedBytesIO`).
+        """
+        if level == 0:
+            return self._root.getvalue()[start:end]
+
+        stream = self._chain[level - 1]
+        decoded_unit_size = self._get_decoded_unit_size(level)
+        if decoded_unit_size == 0 or start >= end:
+            return b""
+
+        first_unit = start // decoded_unit_size
+        last_unit = -(-end // decoded_unit_size)
+        unit_size = stream.decoderunit
+        data = self.read(level - 1, first_unit * unit_size, last_unit * unit_size)
+        decoded = b"".join(
+            stream.decoder(data[idx : idx + unit_size])
+            for idx in range(0, len(data), unit_size)
+        )
+
+        offset = start - first_unit * decoded_unit_size
+        return decoded[offset : offset + (end - start)]
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+import bisect
+import enum
+import typing as t
+
+import construct as cs
+
+import construct_editor.core.entries as entries
+import construct_editor.core.model as model
+
+# Position of an entry in the tree (indexes of the subentries from the root).
+# Sorting the positions results in the same order as a depth-first search.
+PositionType = t.Tuple[int, ...]
+
+Number = t.Union[int, float]
+
+
+class _IndexedEntry(t.NamedTuple):
+    position: PositionType
+    name: str
+    path: str
+    value: t.Optional[str]
+    number: t.Optional[Number]
+
+
+def _get_number(obj: t.Any) -> t.Optional[Number]:
+    """
+    Get the numeric value of an object, if it has one.
+    """
+    if isinstance(obj, bool):
+        return int(obj)
+    if isinstance(obj, (int, float)):
+        return obj
+    if isinstance(obj, cs.EnumIntegerString):
+        return int(obj)
+    if isinstance(obj, enum.Enum) and isinstance(obj.value, int):
+        return obj.value
+    return None
+
+
+def _trigrams(s: str) -> t.Set[str]:
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted index over the names, paths and rendered values of all entries.
+
+    - names and paths are matched as case insensitive substrings.
+    - rendered values (`obj_str`) are matched as case insensitive substrings.
+      To avoid comparing all values, a trigram index over the distinct values
+      is used.
+    - numeric values are stored sorted, so that ranges can be found with a
+      binary search.
+
+    The index can be updated for single subtrees (see `update`), so that it
+    does not have to be rebuilt after each edit.
+    """
+
+    def __init__(self, model: "model.ConstructEditorModel"):
+        self.model = model
+
+        self._indexed: t.Dict["entries.EntryConstruct", _IndexedEntry] = {}
+        self._positions: t.List[PositionType] = []  # sorted
+        self._position_entries: t.Dict[PositionType, "entries.EntryConstruct"] = {}
+
+        self._names: t.Dict[str, t.Set["entries.EntryConstruct"]] = {}
+        self._values: t.Dict[str, t.Set["entries.EntryConstruct"]] = {}
+        self._value_trigrams: t.Dict[str, t.Set[str]] = {}
+        self._numbers: t.List[t.Tuple[Number, PositionType]] = []  # sorted
+
+        if model.root_entry is not None:
+            self._add_subtree(model.root_entry, (0,))
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    # Updating ################################################################
+    def update(self, entry: "entries.EntryConstruct") -> None:
+        """
+        Update the index for an entry and all of its subentries.
+        """
+        indexed = self._indexed.get(entry)
+        if indexed is None:
+            # the entry was not indexed yet (eg. new array items), so update
+            # the next parent that is already in the index.
+            parent = entry.parent
+            while parent is not None and parent not in self._indexed:
+                parent = parent.parent
+            if parent is None:
+                return
+            entry = parent
+            indexed = self._indexed[entry]
+
+        position = indexed.position
+        self._remove_subtree(position)
+        self._add_subtree(entry, position)
+
+    def _add_subtree(
+        self, root: "entries.EntryConstruct", root_position: PositionType
+    ) -> None:
+        positions: t.List[PositionType] = []
+        numbers: t.List[t.Tuple[Number, PositionType]] = []
+
+        stack = [(root, root_position)]
+        while stack:
+            entry, position = stack.pop()
+            number = self._add_entry(entry, position)
+            positions.append(position)
+            if number is not None:
+                numbers.append((number, position))
+
+            subentries = entry.subentries
+            if subentries is None:
+                continue
+            for idx in reversed(range(len(subentries))):
+                stack.append((subentries[idx], position + (idx,)))
+
+        # the positions of a subtree are always contiguous
+        insert_idx = bisect.bisect_left(self._positions, root_position)
+        self._positions[insert_idx:insert_idx] = positions
+
+        if len(numbers) > 0:
+            self._numbers.extend(numbers)
+            self._numbers.sort()
+
+    def _add_entry(
+        self, entry: "entries.EntryConstruct", position: PositionType
+    ) -> t.Optional[Number]:
+        name = entry.name
+        path = entries.create_path_str(entry.path)
+
+        value = None
+        number = None
+        if self.model.root_obj is not None and entry.subentries is None:
+            try:
+                number = _get_number(entry.obj)
+                value = entry.obj_str.lower()
+            except Exception:
+                pass
+
+        self._indexed[entry] = _IndexedEntry(
+            position, name.lower(), path.lower(), value, number
+        )
+        self._position_entries[position] = entry
+
+        if name != "":
+            self._names.setdefault(name.lower(), set()).add(entry)
+
+        if value is not None:
+            value_entries = self._values.get(value)
+            if value_entries is None:
+                value_entries = self._values[value] = set()
+                for trigram in _trigrams(value):
+                    self._value_trigrams.setdefault(trigram, set()).add(value)
+            value_entries.add(entry)
+
+        return number
+
+    def _remove_subtree(self, root_position: PositionType) -> None:
+        start = bisect.bisect_left(self._positions, root_position)
+        end = bisect.bisect_left(self._positions, root_position + (float("inf"),))
+        removed_positions = self._positions[start:end]
+        del self._positions[start:end]
+
+        removed_numbers = False
+        for position in removed_positions:
+            entry = self._position_entries.pop(position)
+            indexed = self._indexed.pop(entry)
+            removed_numbers = removed_numbers or (indexed.number is not None)
+
+            name_entries = self._names.get(indexed.name)
+            if name_entries is not None:
+                name_entries.discard(entry)
+                if len(name_entries) == 0:
+                    del self._names[indexed.name]
+
+            if indexed.value is not None:
+                value_entries = self._values[indexed.value]
+                value_entries.discard(entry)
+                if len(value_entries) == 0:
+                    del self._values[indexed.value]
+                    for trigram in _trigrams(indexed.value):
+                        trigram_values = self._value_trigrams[trigram]
+                        trigram_values.discard(indexed.value)
+                        if len(trigram_values) == 0:
+                            del self._value_trigrams[trigram]
+
+        if removed_numbers:
+            self._numbers = [
+                n for n in self._numbers if n[1][: len(root_position)] != root_position
+            ]
+
+    # Queries #################################################################
+    def find(
+        self,
+        name: t.Optional[str] = None,
+        value: t.Optional[str] = None,
+        min_value: t.Optional[Number] = None,
+        max_value: t.Optional[Number] = None,
+        path: t.Optional[str] = None,
+    ) -> t.List["entries.EntryConstruct"]:
+        """
+        Find all entries that match all given criterias.
+
+        :param name: substring of the name of the entry
+        :param value: substring of the rendered value of the entry
+        :param min_value: minimum numeric value of the entry (inclusive)
+        :param max_value: maximum numeric value of the entry (inclusive)
+        :param path: substring of the path of the entry (eg. "header.len")
+        :return: the matching entries in the order of the tree
+        """
+        candidates: t.Optional[t.Set["entries.EntryConstruct"]] = None
+
+        def intersect(found: t.Set["entries.EntryConstruct"]):
+            nonlocal candidates
+            candidates = found if candidates is None else (candidates & found)
+
+        if name is not None:
+            intersect(self._find_name(name.lower()))
+        if value is not None:
+            intersect(self._find_value(value.lower()))
+        if min_value is not None or max_value is not None:
+            intersect(self._find_number_range(min_value, max_value))
+        if path is not None:
+            path = path.lower()
+            pool = candidates if candidates is not None else self._indexed.keys()
+            intersect({e for e in pool if path in self._indexed[e].path})
+
+        if candidates is None:
+            return []
+        return sorted(candidates, key=lambda e: self._indexed[e].position)
+
+    def _find_name(self, name: str) -> t.Set["entries.EntryConstruct"]:
+        found: t.Set["entries.EntryConstruct"] = set()
+        for indexed_name, name_entries in self._names.items():
+            if name in indexed_name:
+                found.update(name_entries)
+        return found
+
+    def _find_value(self, value: str) -> t.Set["entries.EntryConstruct"]:
+        if len(value) < 3:
+            candidates: t.Iterable[str] = self._values.keys()
+        else:
+            # only values that contain all trigrams of the query can match
+            trigram_sets = []
+            for trigram in _trigrams(value):
+                trigram_values = self._value_trigrams.get(trigram)
+                if trigram_values is None:
+                    return set()
+                trigram_sets.append(trigram_values)
+            trigram_sets.sort(key=len)
+            candidates = set.intersection(*trigram_sets)
+
+        found: t.Set["entries.EntryConstruct"] = set()
+        for indexed_value in candidates:
+            if value in indexed_value:
+                found.update(self._values[indexed_value])
+        return found
+
+    def _find_number_range(
+        self, min_value: t.Optional[Number], max_value: t.Optional[Number]
+    ) -> t.Set["entries.EntryConstruct"]:
+        if min_value is None:
+            start = 0
+        else:
+            start = bisect.bisect_left(self._numbers, (min_value,))
+        if max_value is None:
+            end = len(self._numbers)
+        else:
+            end = bisect.bisect_right(self._numbers, (max_value, (float("inf"),)))
+        return {self._position_entries[p] for _, p in self._numbers[start:end]}
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import dataclasses
+import gc
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import types
+import typing as t
+
+import construct as cs
+
+from construct_editor.core.preprocessor import get_gui_metadata
+from construct_editor.version import version_string
+
+# Version of the format of the cache files. Increment this, when the format
+# of the cached data changes, so that old files are not used anymore.
+SESSION_CACHE_VERSION = 1
+
+# Maximum number of sessions, that are stored on disk
+MAX_CACHED_SESSIONS = 16
+
+_MAGIC = b"CESESS"
+
+# Modification time (in ns) and size of a file, when it was read
+FileStamp = t.Tuple[int, int]
+
+# (file path, mtime, size, construct fingerprint, contextkw)
+_SessionKey = t.Tuple[str, int, int, str, str]
+
+
+@dataclasses.dataclass
+class ListViewSettings:
+    path_str: str
+    filter_expression: t.Optional[str]
+    sort: t.Optional[t.Tuple[int, bool]]  # (column, descending)
+
+
+@dataclasses.dataclass
+class Session:
+    """Parsed object and view state of a file"""
+
+    root_obj: t.Any
+    expanded_paths: t.List[str]
+    list_views: t.List[ListViewSettings]
+
+
+def get_file_stamp(file_path: str) -> t.Optional[FileStamp]:
+    """Get the modification time and the size of a file (or None, if it does not exist)"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_file(file_path: str) -> t.Tuple[bytes, t.Optional[FileStamp]]:
+    """
+    Read a file and get the stamp of the read content (see `SessionCache`).
+    The stamp is None, if the file was changed while it was read.
+
+    :raises OSError: if the file cannot be read
+    """
+    stamp = get_file_stamp(file_path)
+    with open(file_path, "rb") as f:
+        binary = f.read()
+    if stamp is None or get_file_stamp(file_path) != stamp or stamp[1] != len(binary):
+        return binary, None
+    return binary, stamp
+
+
+def get_default_cache_dir() -> str:
+    """Get the default directory of the session cache (eg. ~/.cache/construct_editor/sessions)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "construct_editor", "sessions")
+
+
+class SessionCache:
+    """
+    Cache for the parsed objects and the view state of files on disk, so that
+    reopening a large file does not need to parse it again.
+
+    A session is only used, if the file (path, modification time and size),
+    the construct and the context are the same as when it was saved. The
+    stamp of the file (see `read_file`) has to be recorded when the file is
+    read, so that the session of a file, that was changed while it was
+    opened, is not saved for the new content.
+
+    The object tree is stored with `pickle`, where all references to the
+    construct and to the stream of the file are replaced by references, which
+    are resolved again when loading. Sessions that contain other objects,
+    that cannot be pickled (eg. objects of `cs.Lazy`), are not cached.
+    """
+
+    def __init__(
+        self,
+        cache_dir: t.Optional[str] = None,
+        max_sessions: int = MAX_CACHED_SESSIONS,
+    ):
+        self.cache_dir = cache_dir if cache_dir is not None else get_default_cache_dir()
+        self.max_sessions = max_sessions
+
+    def save(
+        self,
+        file_path: str,
+        file_stamp: FileStamp,
+        constr: "cs.Construct[t.Any, t.Any]",
+        contextkw: t.Dict[str, t.Any],
+        session: Session,
+    ) -> bool:
+        """
+        Save the session of a file. `file_stamp` has to be the stamp of the
+        file, when it was read (see `read_file`). `constr` has to be the
+        construct, that was used for parsing (with the GUI metadata, see
+        `include_metadata`).
+
+        :return: True if the session was saved, False eg. if the file has
+            changed since it was read
+        """
+        if get_file_stamp(file_path) != file_stamp:
+            return False
+        key = _create_key(file_path, file_stamp, constr, contextkw)
+
+        root_metadata = get_gui_metadata(session.root_obj)
+        root_stream = root_metadata.stream if root_metadata is not None else None
+
+        f = io.BytesIO()
+        f.write(_MAGIC)
+        pickle.dump((SESSION_CACHE_VERSION, version_string, key), f)
+        try:
+            with _gc_disabled():
+                _SessionPickler(f, constr, root_stream).dump(session)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False  # eg. objects of `cs.Lazy` cannot be pickled
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(f.getbuffer())
+            os.replace(temp_path, self._get_session_path(file_path))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            return False
+
+        self._remove_old_sessions()
+        return True
+
+    def load(
+        self,
+        file_path: str,
+        file_stamp: FileStamp,
+        constr: "cs.Construct[t.Any, t.Any]",
+        contextkw: t.Dict[str, t.Any],
+        binary: bytes,
+    ) -> t.Optional[Session]:
+        """
+        Load the session of a file, that was saved with `save`. `binary` has
+        to be the content of the file and `file_stamp` its stamp (see
+        `read_file`). The binary is used as stream of the objects.
+
+        :return: the session or None, if no valid session is cached
+        """
+        key = _create_key(file_path, file_stamp, constr, contextkw)
+
+        try:
+            with open(self._get_session_path(file_path), "rb") as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    return None
+                if pickle.load(f) != (SESSION_CACHE_VERSION, version_string, key):
+                    return None  # outdated session
+                with _gc_disabled():
+                    session = _SessionUnpickler(f, constr, binary).load()
+        except Exception:
+            return None  # eg. no session cached or the file is corrupted
+
+        if not isinstance(session, Session):
+            return None
+        return session
+
+    def clear(self) -> None:
+        """Remove all cached sessions"""
+        for path in self._get_session_paths():
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+    def _get_session_path(self, file_path: str) -> str:
+        name = hashlib.blake2b(
+            os.path.abspath(file_path).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.session")
+
+    def _get_session_paths(self) -> t.List[str]:
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in names
+            if name.endswith(".session")
+        ]
+
+    def _remove_old_sessions(self) -> None:
+        """Remove the least recently saved sessions, if there are too many"""
+        paths = self._get_session_paths()
+        if len(paths) <= self.max_sessions:
+            return
+
+        def get_mtime(path: str) -> float:
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+
+        paths.sort(key=get_mtime)
+        for path in paths[: len(paths) - self.max_sessions]:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+
+# #############################################################################
+def _create_key(
+    file_path: str,
+    file_stamp: FileStamp,
+    constr: "cs.Construct[t.Any, t.Any]",
+    contextkw: t.Dict[str, t.Any],
+) -> _SessionKey:
+    return (
+        os.path.abspath(file_path),
+        file_stamp[0],
+        file_stamp[1],
+        get_construct_fingerprint(constr),
+        repr(sorted(contextkw.items())),
+    )
+
+
+def get_construct_fingerprint(constr: "cs.Construct[t.Any, t.Any]") -> str:
+    """
+    Get a hash of the structure of a construct, that is the same each time
+    the program runs (other than the ids of the objects). Functions (eg.
+    lambdas) are hashed by their code.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _FingerprintWalker(hasher).add(constr)
+    return hasher.hexdigest()
+
+
+class _FingerprintWalker:
+    def __init__(self, hasher: "hashlib.blake2b"):
+        self._hasher = hasher
+        self._seen: t.Dict[int, int] = {}
+
+    def _write(self, s: str) -> None:
+        self._hasher.update(s.encode("utf-8", "backslashreplace"))
+        self._hasher.update(b"\0")
+
+    def add(self, obj: t.Any) -> None:
+        # objects, that were already added, are only referenced by their
+        # number (eg. recursive constructs)
+        if id(obj) in self._seen:
+            self._write(f"ref:{self._seen[id(obj)]}")
+            return
+
+        if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+            self._write(f"{type(obj).__name__}:{obj!r}")
+        elif isinstance(obj, (list, tuple)):
+            self._write(f"{type(obj).__name__}:{len(obj)}")
+            for item in obj:
+                self.add(item)
+        elif isinstance(obj, dict):
+            self._write(f"{type(obj).__name__}:{len(obj)}")
+            for key, value in obj.items():
+                if type(key) is int and key in self._seen:
+                    # ids of objects, that were already added (eg. the
+                    # options of the `cs.Select` selector), differ each run
+                    self._write(f"idref:{self._seen[key]}")
+                else:
+                    self.add(key)
+                self.add(value)
+        elif isinstance(obj, type):
+            self._write(f"type:{obj.__module__}.{obj.__qualname__}")
+        elif isinstance(obj, cs.Construct):
+            self._seen[id(obj)] = len(self._seen)
+            self._write(f"construct:{type(obj).__module__}.{type(obj).__qualname__}")
+            for name, value in vars(obj).items():
+                self._write(name)
+                self.add(value)
+        elif isinstance(obj, types.FunctionType):
+            self._seen[id(obj)] = len(self._seen)
+            self._add_code(obj.__code__)
+            for cell in obj.__closure__ or ():
+                self.add(cell.cell_contents if _is_cell_filled(cell) else None)
+        elif isinstance(obj, types.MethodType):
+            self._write(f"method:{obj.__func__.__qualname__}")
+            self.add(obj.__self__)
+        elif isinstance(obj, cs.ExprMixin):
+            # expressions have to be checked before `__wrapped__`, because
+            # they create paths for all attributes (eg. `this.length`)
+            self._write(f"expr:{obj!r}")
+        elif hasattr(obj, "__wrapped__"):  # eg. `functools.lru_cache`
+            self._write("wrapped")
+            self.add(obj.__wrapped__)
+        else:
+            self._write(f"object:{type(obj).__module__}.{type(obj).__qualname__}")
+
+    def _add_code(self, code: types.CodeType) -> None:
+        self._write(f"code:{code.co_name}")
+        self._hasher.update(code.co_code)
+        self._write(repr(code.co_names))
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                self._add_code(const)
+            else:
+                self._write(repr(const))
+
+
+def _is_cell_filled(cell: types.CellType) -> bool:
+    try:
+        cell.cell_contents
+    except ValueError:
+        return False
+    return True
+
+
+def _get_constructs(
+    constr: "cs.Construct[t.Any, t.Any]",
+) -> t.List["cs.Construct[t.Any, t.Any]"]:
+    """Get all constructs, that are reachable from a construct (always in the same order)"""
+    constructs: t.List["cs.Construct[t.Any, t.Any]"] = []
+    seen: t.Set[int] = set()
+    stack: t.List[t.Any] = [constr]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, cs.Construct):
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            constructs.append(obj)
+            stack.extend(reversed(list(vars(obj).values())))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(reversed(obj))
+        elif isinstance(obj, dict):
+            stack.extend(reversed(list(obj.values())))
+    return constructs
+
+
+# References, that are resolved by `_SessionUnpickler.find_class`
+def _construct_ref(index: int) -> t.Any:
+    raise RuntimeError("only used while unpickling a session")
+
+
+def _root_stream_ref() -> t.Any:
+    raise RuntimeError("only used while unpickling a session")
+
+
+class _SessionPickler(pickle.Pickler):
+    def __init__(
+        self,
+        file: t.BinaryIO,
+        constr: "cs.Construct[t.Any, t.Any]",
+        root_stream: t.Optional[io.BytesIO],
+    ):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._construct_indexes = {
+            id(c): idx for idx, c in enumerate(_get_constructs(constr))
+        }
+        self._root_stream = root_stream
+
+    def reducer_override(self, obj: t.Any) -> t.Any:
+        if obj is self._root_stream:
+            return (_root_stream_ref, ())
+        if isinstance(obj, cs.Construct):
+            index = self._construct_indexes.get(id(obj))
+            if index is None:
+                raise pickle.PicklingError(f"unknown construct {obj!r}")
+            return (_construct_ref, (index,))
+        return NotImplemented
+
+
+class _SessionUnpickler(pickle.Unpickler):
+    def __init__(
+        self,
+        file: t.BinaryIO,
+        constr: "cs.Construct[t.Any, t.Any]",
+        binary: bytes,
+    ):
+        super().__init__(file)
+        self._constructs = _get_constructs(constr)
+        self._root_stream = io.BytesIO(binary)
+
+    def find_class(self, module: str, name: str) -> t.Any:
+        if module == __name__ and name == "_construct_ref":
+            return self._constructs.__getitem__
+        if module == __name__ and name == "_root_stream_ref":
+            return lambda: self._root_stream
+        return super().find_class(module, name)
+
+
+@contextlib.contextmanager
+def _gc_disabled() -> t.Iterator[None]:
+    """
+    Disable the garbage collector, because it is triggered again and again
+    while (un)pickling lots of objects, which is very slow.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import collections
+import dataclasses
+import typing as t
+
+import construct_editor.core.array_table as array_table
+import construct_editor.core.entries as entries
+import construct_editor.core.list_view as list_view
+import construct_editor.core.model as model
+
+if t.TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # numpy is optional, without it the statistics are calculated in pure python
+        np = None
+
+
+@dataclasses.dataclass
+class Histogram:
+    counts: t.List[int]
+    bin_edges: t.List[float]
+
+
+@dataclasses.dataclass
+class FieldStatistics:
+    name: str
+    count: int
+    minimum: t.Optional[t.Union[int, float]] = None
+    maximum: t.Optional[t.Union[int, float]] = None
+    mean: t.Optional[float] = None
+    distinct_count: int = 0
+    histogram: t.Optional[Histogram] = None
+
+    # most frequent enum values (name, count)
+    top_values: t.List[t.Tuple[str, int]] = dataclasses.field(default_factory=list)
+
+
+def compute_array_statistics(
+    model: "model.ConstructEditorModel",
+    entry: "entries.EntryArray",
+    bins: int = 10,
+    top: int = 5,
+) -> t.List[FieldStatistics]:
+    """
+    Compute the aggregates of all fields (the list view columns) of an array.
+
+    If the array can be shown as table, the raw table columns are used, so
+    that no entries for the elements have to be created.
+    """
+    table = model.get_array_table(entry)
+    if table is None and model.root_obj is not None:
+        table = array_table.create_array_table(model, entry)
+
+    if table is not None:
+        rows = []  # rows are not needed, if the table is available
+        row_count = len(table)
+    else:
+        rows = list(entry.subentries or [])
+        row_count = len(rows)
+
+    columns = list_view.ListViewColumns(model, entry, rows, table)
+    statistics = []
+    for name in columns.column_names:
+        column = columns.get_column(name)
+        if np is not None:
+            field_statistics = _compute_vectorized(column, row_count, bins, top)
+        else:
+            field_statistics = _compute_python(column, row_count, bins, top)
+        statistics.append(field_statistics)
+    return statistics
+
+
+def _compute_vectorized(
+    column: "list_view.ListViewColumn", row_count: int, bins: int, top: int
+) -> FieldStatistics:
+    values = np.asarray(column.values)
+    stats = FieldStatistics(column.name, row_count)
+
+    if values.dtype.kind in "iufb":
+        if values.dtype.kind == "f":
+            values = values[np.isfinite(values)]
+        if len(values) > 0:
+            stats.minimum = values.min().item()
+            stats.maximum = values.max().item()
+            stats.mean = float(values.mean())
+        unique_values, unique_counts = np.unique(values, return_counts=True)
+        stats.distinct_count = len(unique_values)
+        if values.dtype.kind != "b" and len(values) > 0:
+            counts, bin_edges = np.histogram(
+                values, bins=max(1, min(bins, stats.distinct_count))
+            )
+            stats.histogram = Histogram(counts.tolist(), bin_edges.tolist())
+    else:
+        stats.distinct_count = len(set(values.tolist()))
+
+    if column.names is not None:
+        names = np.asarray(column.names, dtype=object)
+        names = np.where(names == None, "?", names)  # noqa: E711
+        unique_names, unique_counts = np.unique(names.astype(str), return_counts=True)
+        order = np.argsort(-unique_counts, kind="stable")[:top]
+        stats.top_values = [
+            (str(unique_names[i]), int(unique_counts[i])) for i in order
+        ]
+    return stats
+
+
+def _compute_python(
+    column: "list_view.ListViewColumn", row_count: int, bins: int, top: int
+) -> FieldStatistics:
+    values = list(column.values)
+    stats = FieldStatistics(column.name, row_count)
+
+    numbers = [v for v in values if isinstance(v, (int, float))]
+    if len(numbers) > 0 and len(numbers) == len(values):
+        stats.minimum = min(numbers)
+        stats.maximum = max(numbers)
+        stats.mean = sum(numbers) / len(numbers)
+        if not any(isinstance(v, bool) for v in numbers):
+            stats.histogram = _histogram(
+                numbers, stats.minimum, stats.maximum, bins
+            )
+
+    try:
+        stats.distinct_count = len(set(values))
+    except TypeError:  # unhashable values
+        stats.distinct_count = len(set(repr(v) for v in values))
+
+    if column.names is not None:
+        counter = collections.Counter(
+            "?" if name is None else str(name) for name in column.names
+        )
+        stats.top_values = counter.most_common(top)
+    return stats
+
+
+def _histogram(
+    numbers: t.List[t.Union[int, float]],
+    minimum: t.Union[int, float],
+    maximum: t.Union[int, float],
+    bins: int,
+) -> Histogram:
+    bins = max(1, min(bins, len(set(numbers))))
+    if minimum == maximum:
+        minimum, maximum = minimum - 0.5, maximum + 0.5
+    width = (maximum - minimum) / bins
+    bin_edges = [float(minimum + i * width) for i in range(bins)] + [float(maximum)]
+    counts = [0] * bins
+    for number in numbers:
+        index = min(int((number - minimum) / width), bins - 1)
+        counts[index] += 1
+    return Histogram(counts, bin_edges)
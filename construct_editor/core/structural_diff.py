@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+import dataclasses
+import enum
+import io
+import typing as t
+import weakref
+
+import construct as cs
+import construct_typed as cst
+
+import construct_editor.core.entries as entries
+from construct_editor.core.preprocessor import (
+    GuiMetaData,
+    IncludeGuiMetaData,
+    get_gui_metadata,
+    resolve_lazy,
+)
+
+ByteRange = t.Tuple[int, int]
+
+# Keys of the parsed containers, that are no fields
+_IGNORED_KEYS = ("_io", "__construct_editor_metadata__")
+
+
+class DiffKind(enum.Enum):
+    Changed = enum.auto()
+    OnlyInA = enum.auto()  # removed in B
+    OnlyInB = enum.auto()  # added in B
+
+
+@dataclasses.dataclass
+class DiffItem:
+    path_str: str
+    kind: DiffKind
+    obj_a: t.Any
+    obj_b: t.Any
+
+    # Byte ranges of the objects in the root streams (None, if the object does
+    # not exist). Objects in nested streams (eg. of `cs.Compressed`) have the
+    # byte range of the next parent in the root stream.
+    byte_range_a: t.Optional[ByteRange]
+    byte_range_b: t.Optional[ByteRange]
+
+    @property
+    def is_value_change(self) -> bool:
+        """Check if only the value has changed and not the objects it contains"""
+        return (
+            self.kind is DiffKind.Changed
+            and _get_children(self.obj_a) is None
+            and _get_children(self.obj_b) is None
+        )
+
+
+class StructuralDiff:
+    """
+    Differences between two objects, that were parsed with the same
+    construct (eg. two captures of the same format).
+
+    The objects are compared by their path (see `entries.create_path_str`).
+    Subtrees that were parsed from the same bytes are skipped without
+    comparing all of their fields, if they do not depend on the context
+    (see `_is_context_free`).
+    """
+
+    def __init__(self, root_path_str: str, obj_a: t.Any, obj_b: t.Any):
+        self.items: t.List[DiffItem] = []
+        self._items_by_path: t.Dict[str, DiffItem] = {}
+
+        # path strings of all objects, that contain a changed object
+        self._changed_parents: t.Set[str] = set()
+
+        self._root_stream_a = _get_stream(get_gui_metadata(obj_a))
+        self._root_stream_b = _get_stream(get_gui_metadata(obj_b))
+
+        self._compare(entries.parse_path_str(root_path_str), obj_a, obj_b)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get_item(self, path_str: str) -> t.Optional[DiffItem]:
+        """Get the difference of a path (or None, if the object has not changed)"""
+        return self._items_by_path.get(path_str)
+
+    def contains_changes(self, path_str: str) -> bool:
+        """Check if an object of a path contains changed objects"""
+        return path_str in self._changed_parents
+
+    def get_byte_ranges_a(self) -> t.List[ByteRange]:
+        """Get the byte ranges of all changed objects in the root stream of A"""
+        return [i.byte_range_a for i in self.items if i.byte_range_a is not None]
+
+    def get_byte_ranges_b(self) -> t.List[ByteRange]:
+        """Get the byte ranges of all changed objects in the root stream of B"""
+        return [i.byte_range_b for i in self.items if i.byte_range_b is not None]
+
+    def _compare(self, root_path: "entries.PathType", obj_a: t.Any, obj_b: t.Any):
+        # (path, obj_a, obj_b, parent_range_a, parent_range_b, kind), where
+        # kind is None, if the objects still have to be compared
+        stack: t.List[
+            t.Tuple[
+                "entries.PathType",
+                t.Any,
+                t.Any,
+                t.Optional[ByteRange],
+                t.Optional[ByteRange],
+                t.Optional[DiffKind],
+            ]
+        ] = [(root_path, obj_a, obj_b, None, None, None)]
+
+        while stack:
+            path, obj_a, obj_b, range_a, range_b, kind = stack.pop()
+
+            # objects that only exist on one side are not compared any further
+            if kind is DiffKind.OnlyInA:
+                range_a = self._get_byte_range_a(obj_a, range_a)
+                self._add_item(path, kind, obj_a, None, range_a, None)
+                continue
+            if kind is DiffKind.OnlyInB:
+                range_b = self._get_byte_range_b(obj_b, range_b)
+                self._add_item(path, kind, None, obj_b, None, range_b)
+                continue
+
+            # objects, that were parsed from the same bytes, are the same
+            # (this is checked first, so that lazy objects are not parsed)
+            if _has_same_bytes(get_gui_metadata(obj_a), get_gui_metadata(obj_b)):
+                continue
+
+            obj_a = resolve_lazy(obj_a)
+            obj_b = resolve_lazy(obj_b)
+            range_a = self._get_byte_range_a(obj_a, range_a)
+            range_b = self._get_byte_range_b(obj_b, range_b)
+
+            children_a = _get_children(obj_a)
+            children_b = _get_children(obj_b)
+            if children_a is None or children_b is None:
+                if (children_a is not None) or (children_b is not None) or (
+                    obj_a != obj_b
+                ):
+                    self._add_item(
+                        path, DiffKind.Changed, obj_a, obj_b, range_a, range_b
+                    )
+                continue
+
+            # push in reverse order, so that the items are sorted like the tree
+            new_items = []
+            for name, child_a in children_a.items():
+                if name in children_b:
+                    child_b = children_b[name]
+                    new_items.append(
+                        (path + [name], child_a, child_b, range_a, range_b, None)
+                    )
+                else:
+                    new_items.append(
+                        (path + [name], child_a, None, range_a, None, DiffKind.OnlyInA)
+                    )
+            for name, child_b in children_b.items():
+                if name not in children_a:
+                    new_items.append(
+                        (path + [name], None, child_b, None, range_b, DiffKind.OnlyInB)
+                    )
+            stack.extend(reversed(new_items))
+
+    def _get_byte_range_a(
+        self, obj: t.Any, parent_range: t.Optional[ByteRange]
+    ) -> t.Optional[ByteRange]:
+        return _get_byte_range(get_gui_metadata(obj), self._root_stream_a, parent_range)
+
+    def _get_byte_range_b(
+        self, obj: t.Any, parent_range: t.Optional[ByteRange]
+    ) -> t.Optional[ByteRange]:
+        return _get_byte_range(get_gui_metadata(obj), self._root_stream_b, parent_range)
+
+    def _add_item(
+        self,
+        path: "entries.PathType",
+        kind: DiffKind,
+        obj_a: t.Any,
+        obj_b: t.Any,
+        range_a: t.Optional[ByteRange],
+        range_b: t.Optional[ByteRange],
+    ):
+        path_str = entries.create_path_str(path)
+        item = DiffItem(path_str, kind, obj_a, obj_b, range_a, range_b)
+        self.items.append(item)
+        self._items_by_path[path_str] = item
+
+        # mark all parents, till one is already marked
+        for idx in reversed(range(1, len(path))):
+            parent_path_str = entries.create_path_str(path[:idx])
+            if parent_path_str in self._changed_parents:
+                break
+            self._changed_parents.add(parent_path_str)
+
+
+def _get_stream(metadata: t.Optional[GuiMetaData]) -> t.Optional[io.BytesIO]:
+    if metadata is None:
+        return None
+    return metadata.stream
+
+
+def _get_byte_range(
+    metadata: t.Optional[GuiMetaData],
+    root_stream: t.Optional[io.BytesIO],
+    parent_range: t.Optional[ByteRange],
+) -> t.Optional[ByteRange]:
+    """Get the byte range in the root stream (or the range of the parent)"""
+    if metadata is not None and metadata.stream is root_stream:
+        return metadata.byte_range
+    return parent_range
+
+
+def _has_same_bytes(
+    metadata_a: t.Optional[GuiMetaData], metadata_b: t.Optional[GuiMetaData]
+) -> bool:
+    """
+    Check if two objects were parsed from the same (not empty) bytes, so that
+    they are the same objects.
+    """
+    if metadata_a is None or metadata_b is None:
+        return False
+
+    # the same bytes can be parsed to different objects, if the construct
+    # depends on the context (eg. the key of a `cs.Switch`)
+    if metadata_a.construct is not metadata_b.construct:
+        return False
+    if not _is_context_free(metadata_a.construct):
+        return False
+    start_a, end_a = metadata_a.byte_range
+    start_b, end_b = metadata_b.byte_range
+    if end_a - start_a != end_b - start_b or end_a <= start_a:
+        return False
+
+    # only streams with a buffer can be compared without reading them
+    stream_a, stream_b = metadata_a.stream, metadata_b.stream
+    if not isinstance(stream_a, io.BytesIO) or not isinstance(stream_b, io.BytesIO):
+        return False
+    return stream_a.getvalue()[start_a:end_a] == stream_b.getvalue()[start_b:end_b]
+
+
+# Constructs, whose parsed object only depends on the bytes of their subcon
+_CONTEXT_FREE_WRAPPERS = (
+    cs.Renamed,
+    IncludeGuiMetaData,
+    cs.Const,
+    cs.Enum,
+    cs.FlagsEnum,
+    cs.StringEncoded,
+    cs.NullStripped,
+    cs.Hex,
+    cs.HexDump,
+    cs.GreedyRange,
+    cs.Transformed,
+    cs.Restreamed,
+    cs.Compressed,
+    cs.Lazy,
+    cst.TEnum,
+    cst.TFlagsEnum,
+    cst.DataclassStruct,
+)
+
+# Cache for `_is_context_free`
+_context_free_constructs: "weakref.WeakKeyDictionary[t.Any, bool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _is_context_free(constr: "cs.Construct[t.Any, t.Any]") -> bool:
+    """
+    Check if the parsed object of a construct only depends on its bytes and
+    not on the context (eg. on the value of another field).
+
+    Only known constructs without context dependent parameters (eg. a length
+    of `cs.this.count`) are context free, all others are treated as context
+    dependent.
+    """
+    try:
+        return _context_free_constructs[constr]
+    except KeyError:
+        pass
+
+    leaf_types = (cs.FormatField, type(cs.GreedyBytes), type(cs.Flag), type(cs.Pass))
+    if isinstance(constr, leaf_types):
+        context_free = True
+    elif isinstance(constr, (cs.BytesInteger, cs.BitsInteger)):
+        context_free = isinstance(constr.length, int) and isinstance(
+            constr.swapped, bool
+        )
+    elif isinstance(constr, cs.Bytes):
+        context_free = isinstance(constr.length, int)
+    elif isinstance(constr, (cs.Array, cs.Padded, cs.FixedSized)):
+        length = constr.count if isinstance(constr, cs.Array) else constr.length
+        context_free = isinstance(length, int) and _is_context_free(constr.subcon)
+    elif isinstance(constr, cs.NullTerminated):
+        context_free = _is_context_free(constr.subcon)
+    elif isinstance(constr, cs.Prefixed):
+        context_free = _is_context_free(constr.lengthfield) and _is_context_free(
+            constr.subcon
+        )
+    elif isinstance(constr, (cs.Struct, cs.Sequence)):
+        context_free = all(_is_context_free(subcon) for subcon in constr.subcons)
+    elif isinstance(constr, _CONTEXT_FREE_WRAPPERS):
+        context_free = _is_context_free(constr.subcon)  # type: ignore
+    else:
+        context_free = False
+
+    _context_free_constructs[constr] = context_free
+    return context_free
+
+
+def _get_children(obj: t.Any) -> t.Optional[t.Dict[t.Any, t.Any]]:
+    """Get the children of an object by their names (None, if it has no children)"""
+    if isinstance(obj, dict):
+        return {
+            name: obj[name] for name in obj.keys() if name not in _IGNORED_KEYS
+        }
+    if isinstance(obj, cst.DataclassMixin):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, list):
+        return {entries.ListIndexName(f"[{idx}]"): obj[idx] for idx in range(len(obj))}
+    return None
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+import abc
+import typing as t
+
+from construct_editor.core.commands import get_object_size
+from construct_editor.core.preprocessor import (
+    NoneWithGuiMetadata,
+    add_gui_metadata,
+    get_gui_metadata,
+)
+
+# Approximate memory of the delta objects itself (without the saved values)
+_DELTA_OVERHEAD = 64
+
+
+class ValueDelta:
+    """
+    Difference between an old and a new value, that can be applied in both
+    directions. This is used by the undo history, so that only the changed
+    parts of large values (eg. bytes) have to be saved.
+    """
+
+    @abc.abstractmethod
+    def apply(self, current_value: t.Any) -> t.Any:
+        """Create the new value from the current (old) value."""
+        ...
+
+    @abc.abstractmethod
+    def revert(self, current_value: t.Any) -> t.Any:
+        """Create the old value from the current (new) value."""
+        ...
+
+    @abc.abstractmethod
+    def matches(self, current_value: t.Any, revert: bool) -> bool:
+        """
+        Check if the current value is the value, that the delta expects (the
+        old value for `apply` and the new value for `revert`).
+        """
+        ...
+
+    @abc.abstractmethod
+    def get_size(self) -> int:
+        """Approximate memory, that is needed for this delta (in bytes)."""
+        ...
+
+
+class FullValueDelta(ValueDelta):
+    """Delta that saves the whole old and new value."""
+
+    def __init__(self, old_value: t.Any, new_value: t.Any):
+        self.old_value = old_value
+        self.new_value = new_value
+
+        # the nested values of a large value are only counted once
+        self._size: t.Optional[int] = None
+
+    def apply(self, current_value: t.Any) -> t.Any:
+        return self.new_value
+
+    def revert(self, current_value: t.Any) -> t.Any:
+        return self.old_value
+
+    def matches(self, current_value: t.Any, revert: bool) -> bool:
+        expected_value = self.new_value if revert else self.old_value
+        return _is_equal(current_value, expected_value)
+
+    def get_size(self) -> int:
+        if self._size is None:
+            self._size = _DELTA_OVERHEAD + get_object_size(
+                self.old_value, self.new_value
+            )
+        return self._size
+
+
+class BytesDelta(ValueDelta):
+    """
+    Delta of a `bytes` or `bytearray` value, that only saves the changed
+    range (everything between the common prefix and the common suffix).
+    """
+
+    def __init__(
+        self,
+        old_value: t.Union[bytes, bytearray],
+        new_value: t.Union[bytes, bytearray],
+    ):
+        old_view = memoryview(old_value).cast("B")
+        new_view = memoryview(new_value).cast("B")
+        max_len = min(len(old_view), len(new_view))
+
+        start = _common_len(old_view, new_view, max_len, reverse=False)
+        suffix = _common_len(
+            old_view[start:], new_view[start:], max_len - start, reverse=True
+        )
+
+        self.start = start
+        self.old_part = bytes(old_view[start : len(old_view) - suffix])
+        self.new_part = bytes(new_view[start : len(new_view) - suffix])
+        self.old_len = len(old_view)
+        self.new_len = len(new_view)
+
+    def _replace(
+        self, value: t.Union[bytes, bytearray], removed_len: int, inserted: bytes
+    ) -> t.Union[bytes, bytearray]:
+        end = self.start + removed_len
+        if isinstance(value, bytearray):
+            return bytearray(value[: self.start]) + inserted + value[end:]
+        return bytes(value[: self.start]) + inserted + bytes(value[end:])
+
+    def apply(self, current_value: t.Union[bytes, bytearray]) -> t.Any:
+        return self._replace(current_value, len(self.old_part), self.new_part)
+
+    def revert(self, current_value: t.Union[bytes, bytearray]) -> t.Any:
+        return self._replace(current_value, len(self.new_part), self.old_part)
+
+    def matches(self, current_value: t.Any, revert: bool) -> bool:
+        if not isinstance(current_value, (bytes, bytearray)):
+            return False
+        expected_len = self.new_len if revert else self.old_len
+        expected_part = self.new_part if revert else self.old_part
+        end = self.start + len(expected_part)
+        return (
+            len(current_value) == expected_len
+            and current_value[self.start : end] == expected_part
+        )
+
+    def get_size(self) -> int:
+        return _DELTA_OVERHEAD + len(self.old_part) + len(self.new_part)
+
+
+def _common_len(
+    a: memoryview, b: memoryview, max_len: int, reverse: bool, block_size: int = 4096
+) -> int:
+    """
+    Get the length of the common prefix (or suffix if `reverse` is True) of
+    two byte views. Large blocks are compared first, so that most of the
+    comparison is not done byte by byte in python.
+    """
+
+    def get_slice(view: memoryview, pos: int, size: int) -> memoryview:
+        if reverse:
+            return view[len(view) - pos - size : len(view) - pos]
+        return view[pos : pos + size]
+
+    pos = 0
+    while pos + block_size <= max_len and get_slice(a, pos, block_size) == get_slice(
+        b, pos, block_size
+    ):
+        pos += block_size
+    while pos < max_len and get_slice(a, pos, 1) == get_slice(b, pos, 1):
+        pos += 1
+    return pos
+
+
+class ListDelta(ValueDelta):
+    """
+    Delta of a `list` value (eg. of an array) with the same length, that only
+    saves the changed items.
+    """
+
+    def __init__(self, old_value: t.List[t.Any], new_value: t.List[t.Any]):
+        self.changes: t.List[t.Tuple[int, t.Any, t.Any]] = [
+            (index, old_item, new_item)
+            for index, (old_item, new_item) in enumerate(zip(old_value, new_value))
+            if old_item is not new_item
+        ]
+        self.length = len(old_value)
+        self._size: t.Optional[int] = None
+
+    def apply(self, current_value: t.List[t.Any]) -> t.Any:
+        value = type(current_value)(current_value)
+        for index, _, new_item in self.changes:
+            value[index] = new_item
+        return value
+
+    def revert(self, current_value: t.List[t.Any]) -> t.Any:
+        value = type(current_value)(current_value)
+        for index, old_item, _ in self.changes:
+            value[index] = old_item
+        return value
+
+    def matches(self, current_value: t.Any, revert: bool) -> bool:
+        if not isinstance(current_value, list) or len(current_value) != self.length:
+            return False
+        for index, old_item, new_item in self.changes:
+            expected_item = new_item if revert else old_item
+            if not _is_equal(current_value[index], expected_item):
+                return False
+        return True
+
+    def get_size(self) -> int:
+        if self._size is None:
+            self._size = _DELTA_OVERHEAD + get_object_size(self.changes)
+        return self._size
+
+
+def _is_equal(a: t.Any, b: t.Any) -> bool:
+    """
+    Compare two values. The values may be different objects with the same
+    value, eg. when the binary data was parsed again after a build.
+    """
+    if a is b:
+        return True
+    if isinstance(a, NoneWithGuiMetadata):
+        a = None
+    if isinstance(b, NoneWithGuiMetadata):
+        b = None
+    try:
+        return bool(a == b)
+    except Exception:  # eg. objects without a clear truth value
+        return False
+
+
+def create_value_delta(old_value: t.Any, new_value: t.Any) -> ValueDelta:
+    """
+    Create the most compact delta between two values.
+    """
+    bytes_types = (bytes, bytearray)
+    if isinstance(old_value, bytes_types) and isinstance(new_value, bytes_types):
+        return BytesDelta(old_value, new_value)
+    if (
+        isinstance(old_value, list)
+        and isinstance(new_value, list)
+        and len(old_value) == len(new_value)
+    ):
+        return ListDelta(old_value, new_value)
+    return FullValueDelta(old_value, new_value)
+
+
+def apply_value_delta(delta: ValueDelta, current_value: t.Any, revert: bool) -> t.Any:
+    """
+    Apply a delta to the current value (or revert it), while keeping the GUI
+    metadata of the current value.
+    """
+    if revert:
+        value = delta.revert(current_value)
+    else:
+        value = delta.apply(current_value)
+
+    if not isinstance(delta, FullValueDelta):
+        metadata = get_gui_metadata(current_value)
+        if metadata is not None:
+            value = add_gui_metadata(value, metadata)
+    return value
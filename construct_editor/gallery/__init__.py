@@ -1,4 +1,5 @@
 import dataclasses
+import importlib
 import construct as cs
 import typing as t
 
@@ -8,3 +9,13 @@ class GalleryItem:
     construct: "cs.Construct[t.Any, t.Any]"
     contextkw: t.Dict[str, t.Any] = dataclasses.field(default_factory=dict)
     example_binarys: t.Dict[str, bytes] = dataclasses.field(default_factory=dict)
+
+
+def load_gallery_item(module_name: str) -> GalleryItem:
+    """
+    Load the gallery item of a module of the gallery (eg. "test_array").
+    The modules are imported on first use, because some of them create big
+    constructs or example binaries.
+    """
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return module.gallery_item
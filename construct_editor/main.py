@@ -6,49 +6,17 @@ from types import TracebackType
 import wx
 from wx.lib.embeddedimage import PyEmbeddedImage
 
-import construct_editor.gallery.example_cmd_resp
-import construct_editor.gallery.example_ipstack
-import construct_editor.gallery.example_pe32coff
-import construct_editor.gallery.test_aligned
-import construct_editor.gallery.test_array
-import construct_editor.gallery.test_bits_swapped_bitwise
-import construct_editor.gallery.test_bitwise
-import construct_editor.gallery.test_bytes_greedybytes
-import construct_editor.gallery.test_checksum
-import construct_editor.gallery.test_compressed
-import construct_editor.gallery.test_computed
-import construct_editor.gallery.test_const
-import construct_editor.gallery.test_dataclass_bit_struct
-import construct_editor.gallery.test_dataclass_struct
-import construct_editor.gallery.test_enum
-import construct_editor.gallery.test_fixedsized
-import construct_editor.gallery.test_flag
-import construct_editor.gallery.test_flagsenum
-import construct_editor.gallery.test_focusedseq
-import construct_editor.gallery.test_greedyrange
-import construct_editor.gallery.test_ifthenelse
-import construct_editor.gallery.test_ifthenelse_nested_switch
-import construct_editor.gallery.test_nullstripped
-import construct_editor.gallery.test_nullterminated
-import construct_editor.gallery.test_padded
-import construct_editor.gallery.test_padded_string
-import construct_editor.gallery.test_pass
-import construct_editor.gallery.test_pointer_peek_seek_tell
-import construct_editor.gallery.test_renamed
-import construct_editor.gallery.test_select
-import construct_editor.gallery.test_select_complex
-import construct_editor.gallery.test_stringencodded
-import construct_editor.gallery.test_switch
-import construct_editor.gallery.test_switch_dataclass
-import construct_editor.gallery.test_tenum
-import construct_editor.gallery.test_tflagsenum
-import construct_editor.gallery.test_timestamp
+from construct_editor.core.session_cache import SessionCache
+from construct_editor.gallery import GalleryItem, load_gallery_item
 from construct_editor.wx_widgets import WxConstructHexEditor
 from construct_editor.wx_widgets.wx_exception_dialog import (
     ExceptionInfo,
     WxExceptionDialog,
 )
 
+# Number of records, that are shown while following a file
+FOLLOW_MAX_RECORDS = 10000
+
 
 class ConstructGalleryFrame(wx.Frame):
     def __init__(self, *args, **kwargs):
@@ -66,6 +34,13 @@ class ConstructGalleryFrame(wx.Frame):
 
         self.status_bar: wx.StatusBar = self.CreateStatusBar()
 
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+    def on_close(self, event: wx.CloseEvent):
+        # save the view of the opened file, so that it opens faster next time
+        self.main_panel.construct_hex_editor.save_session()
+        event.Skip()
+
     def on_uncaught_exception(
         self, etype: t.Type[BaseException], value: BaseException, trace: TracebackType
     ):
@@ -90,85 +65,87 @@ class ConstructGallery(wx.Panel):
         super().__init__(parent)
 
         # Define all galleries ############################################
-        self.construct_gallery = {
+        # (the modules of the gallery items are only imported, when they are
+        # selected, see `get_gallery_item`)
+        self.construct_gallery: t.Dict[str, t.Optional[str]] = {
             "################ EXAMPLES ################": None,
-            "Example: pe32coff": construct_editor.gallery.example_pe32coff.gallery_item,
-            "Example: ipstack": construct_editor.gallery.example_ipstack.gallery_item,
-            "Example: Cmd/Resp": construct_editor.gallery.example_cmd_resp.gallery_item,
+            "Example: pe32coff": "example_pe32coff",
+            "Example: ipstack": "example_ipstack",
+            "Example: Cmd/Resp": "example_cmd_resp",
             "################ TESTS ####################": None,
             # "## bytes and bits ################": None,
-            "Test: Bytes/GreedyBytes": construct_editor.gallery.test_bytes_greedybytes.gallery_item,
+            "Test: Bytes/GreedyBytes": "test_bytes_greedybytes",
             # "## integers and floats ###########": None,
             # "Test: FormatField (TODO)": None,
             # "Test: BytesInteger (TODO)": None,
             # "Test: BitsInteger (TODO)": None,
-            "Test: Bitwiese": construct_editor.gallery.test_bitwise.gallery_item,
-            "Test: BitsSwapped/Bitwiese": construct_editor.gallery.test_bits_swapped_bitwise.gallery_item,
+            "Test: Bitwiese": "test_bitwise",
+            "Test: BitsSwapped/Bitwiese": "test_bits_swapped_bitwise",
             "## strings #######################": None,
-            "Test: StringEncoded": construct_editor.gallery.test_stringencodded.gallery_item,
-            "Test: PaddedString": construct_editor.gallery.test_padded_string.gallery_item,
+            "Test: StringEncoded": "test_stringencodded",
+            "Test: PaddedString": "test_padded_string",
             "## mappings ######################": None,
-            "Test: Flag": construct_editor.gallery.test_flag.gallery_item,
-            "Test: Enum": construct_editor.gallery.test_enum.gallery_item,
-            "Test: FlagsEnum": construct_editor.gallery.test_flagsenum.gallery_item,
-            "Test: TEnum": construct_editor.gallery.test_tenum.gallery_item,
-            "Test: TFlagsEnum": construct_editor.gallery.test_tflagsenum.gallery_item,
+            "Test: Flag": "test_flag",
+            "Test: Enum": "test_enum",
+            "Test: FlagsEnum": "test_flagsenum",
+            "Test: TEnum": "test_tenum",
+            "Test: TFlagsEnum": "test_tflagsenum",
             # "Test: Mapping (TODO)": None,
             "## structures and sequences ######": None,
             # "Test: Struct (TODO)": None,
             # "Test: Sequence (TODO)": None,
-            "Test: DataclassStruct": construct_editor.gallery.test_dataclass_struct.gallery_item,
-            "Test: DataclassBitStruct": construct_editor.gallery.test_dataclass_bit_struct.gallery_item,
+            "Test: DataclassStruct": "test_dataclass_struct",
+            "Test: DataclassBitStruct": "test_dataclass_bit_struct",
             "## arrays ranges and repeaters ######": None,
-            "Test: Array": construct_editor.gallery.test_array.gallery_item,
-            "Test: GreedyRange": construct_editor.gallery.test_greedyrange.gallery_item,
+            "Test: Array": "test_array",
+            "Test: GreedyRange": "test_greedyrange",
             # "Test: RepeatUntil (TODO)": None,
             "## specials ##########################": None,
-            "Test: Renamed": construct_editor.gallery.test_renamed.gallery_item,
+            "Test: Renamed": "test_renamed",
             "## miscellaneous ##########################": None,
-            "Test: Const": construct_editor.gallery.test_const.gallery_item,
-            "Test: Computed": construct_editor.gallery.test_computed.gallery_item,
+            "Test: Const": "test_const",
+            "Test: Computed": "test_computed",
             # "Test: Index (TODO)": None,
             # "Test: Rebuild (TODO)": None,
             # "Test: Default (TODO)": None,
             # "Test: Check (TODO)": None,
             # "Test: Error (TODO)": None,
-            "Test: FocusedSeq": construct_editor.gallery.test_focusedseq.gallery_item,
+            "Test: FocusedSeq": "test_focusedseq",
             # "Test: Pickled (TODO)": None,
             # "Test: Numpy (TODO)": None,
             # "Test: NamedTuple (TODO)": None,
-            "Test: TimestampAdapter": construct_editor.gallery.test_timestamp.gallery_item,
+            "Test: TimestampAdapter": "test_timestamp",
             # "Test: Hex (TODO)": None,
             # "Test: HexDump (TODO)": None,
             "## conditional ##########################": None,
             # "Test: Union (TODO)": None,
-            "Test: Select": construct_editor.gallery.test_select.gallery_item,
-            "Test: Select (Complex)": construct_editor.gallery.test_select_complex.gallery_item,
-            "Test: IfThenElse": construct_editor.gallery.test_ifthenelse.gallery_item,
-            "Test: IfThenElse (Nested Switch)": construct_editor.gallery.test_ifthenelse_nested_switch.gallery_item,
-            "Test: Switch": construct_editor.gallery.test_switch.gallery_item,
-            "Test: Switch (Dataclass)": construct_editor.gallery.test_switch_dataclass.gallery_item,
+            "Test: Select": "test_select",
+            "Test: Select (Complex)": "test_select_complex",
+            "Test: IfThenElse": "test_ifthenelse",
+            "Test: IfThenElse (Nested Switch)": "test_ifthenelse_nested_switch",
+            "Test: Switch": "test_switch",
+            "Test: Switch (Dataclass)": "test_switch_dataclass",
             # "Test: StopIf (TODO)": None,
             "## alignment and padding ##########################": None,
-            "Test: Padded": construct_editor.gallery.test_padded.gallery_item,
-            "Test: Aligned": construct_editor.gallery.test_aligned.gallery_item,
+            "Test: Padded": "test_padded",
+            "Test: Aligned": "test_aligned",
             "## stream manipulation ##########################": None,
-            "Test: Pointer/Peek/Seek/Tell": construct_editor.gallery.test_pointer_peek_seek_tell.gallery_item,
-            "Test: Pass": construct_editor.gallery.test_pass.gallery_item,
+            "Test: Pointer/Peek/Seek/Tell": "test_pointer_peek_seek_tell",
+            "Test: Pass": "test_pass",
             # "Test: Terminated (TODO)": None,
             "## tunneling and byte/bit swapping ##########################": None,
             # "Test: RawCopy (TODO)": None,
             # "Test: Prefixed (TODO)": None,
-            "Test: FixedSized": construct_editor.gallery.test_fixedsized.gallery_item,
-            "Test: NullTerminated": construct_editor.gallery.test_nullterminated.gallery_item,
-            "Test: NullStripped": construct_editor.gallery.test_nullstripped.gallery_item,
+            "Test: FixedSized": "test_fixedsized",
+            "Test: NullTerminated": "test_nullterminated",
+            "Test: NullStripped": "test_nullstripped",
             # "Test: RestreamData (TODO)": None,
             # "Test: Transformed (TODO)": None,
             # "Test: Restreamed (TODO)": None,
             # "Test: ProcessXor (TODO)": None,
             # "Test: ProcessRotateLeft (TODO)": None,
-            "Test: Checksum": construct_editor.gallery.test_checksum.gallery_item,
-            "Test: Compressed": construct_editor.gallery.test_compressed.gallery_item,
+            "Test: Checksum": "test_checksum",
+            "Test: Compressed": "test_compressed",
             # "Test: CompressedLZ4 (TODO)": None,
             # "Test: Rebuffered (TODO)": None,
             # "## lazy equivalents ##########################": None,
@@ -185,7 +162,8 @@ class ConstructGallery(wx.Panel):
         }
         self.gallery_selection = 1
         default_gallery = list(self.construct_gallery.keys())[self.gallery_selection]
-        default_gallery_item = self.construct_gallery[default_gallery]
+        default_gallery_item = self.get_gallery_item(default_gallery)
+        assert default_gallery_item is not None  # the default is no heading
 
         # Define GUI elements #############################################
         self.sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -246,6 +224,47 @@ class ConstructGallery(wx.Panel):
         )
         vsizer.Add(self.load_binary_file_btn, 0, wx.ALL | wx.EXPAND, 1)
 
+        # watch the loaded file for changes (eg. appended records)
+        self.watch_binary_file_cbx = wx.CheckBox(
+            self, wx.ID_ANY, "Watch Loaded File", wx.DefaultPosition, wx.DefaultSize, 0
+        )
+        vsizer.Add(self.watch_binary_file_cbx, 0, wx.ALL | wx.EXPAND, 1)
+
+        # compare with binary from file
+        self.compare_binary_file_btn = wx.Button(
+            self,
+            wx.ID_ANY,
+            "Compare with Binary File",
+            wx.DefaultPosition,
+            wx.DefaultSize,
+            0,
+        )
+        vsizer.Add(self.compare_binary_file_btn, 0, wx.ALL | wx.EXPAND, 1)
+
+        # end compare
+        self.end_compare_btn = wx.Button(
+            self, wx.ID_ANY, "End Compare", wx.DefaultPosition, wx.DefaultSize, 0
+        )
+        vsizer.Add(self.end_compare_btn, 0, wx.ALL | wx.EXPAND, 1)
+
+        # follow a file or a pipe, that is still written
+        self.follow_file_btn = wx.Button(
+            self,
+            wx.ID_ANY,
+            "Follow File/Pipe",
+            wx.DefaultPosition,
+            wx.DefaultSize,
+            0,
+        )
+        vsizer.Add(self.follow_file_btn, 0, wx.ALL | wx.EXPAND, 1)
+
+        # stop following
+        self.stop_follow_btn = wx.Button(
+            self, wx.ID_ANY, "Stop Following", wx.DefaultPosition, wx.DefaultSize, 0
+        )
+        self.stop_follow_btn.Disable()
+        vsizer.Add(self.stop_follow_btn, 0, wx.ALL | wx.EXPAND, 1)
+
         self.sizer.Add(vsizer, 0, wx.ALL | wx.EXPAND, 0)
 
         self.sizer.Add(
@@ -261,6 +280,7 @@ class ConstructGallery(wx.Panel):
             construct=default_gallery_item.construct,
             contextkw=default_gallery_item.contextkw,
         )
+        self.construct_hex_editor.session_cache = SessionCache()
         # self.construct_hex_editor.construct_editor.expand_all()
         self.sizer.Add(self.construct_hex_editor, 1, wx.ALL | wx.EXPAND, 0)
 
@@ -277,13 +297,39 @@ class ConstructGallery(wx.Panel):
         )
 
         self.load_binary_file_btn.Bind(wx.EVT_BUTTON, self.on_load_binary_file_clicked)
+        self.watch_binary_file_cbx.Bind(
+            wx.EVT_CHECKBOX, self.on_watch_binary_file_changed
+        )
+        self.construct_hex_editor.on_watching_changed.append(
+            self.watch_binary_file_cbx.SetValue
+        )
+        self.compare_binary_file_btn.Bind(
+            wx.EVT_BUTTON, self.on_compare_binary_file_clicked
+        )
+        self.follow_file_btn.Bind(wx.EVT_BUTTON, self.on_follow_file_clicked)
+        self.stop_follow_btn.Bind(
+            wx.EVT_BUTTON, lambda event: self.construct_hex_editor.stop_follow()
+        )
+        self.construct_hex_editor.on_following_changed.append(
+            self.stop_follow_btn.Enable
+        )
+        self.end_compare_btn.Bind(
+            wx.EVT_BUTTON, lambda event: self.construct_hex_editor.compare(None)
+        )
 
         # Emulate Selection Click
         self.on_gallery_selection_changed(None)
 
+    def get_gallery_item(self, selection: str) -> t.Optional[GalleryItem]:
+        """Get the gallery item of a selection (or None for the headings)"""
+        module_name = self.construct_gallery[selection]
+        if module_name is None:
+            return None
+        return load_gallery_item(module_name)
+
     def on_gallery_selection_changed(self, event):
         selection = self.gallery_selector_lbx.GetStringSelection()
-        gallery_item = self.construct_gallery[selection]
+        gallery_item = self.get_gallery_item(selection)
         if gallery_item is None:
             self.gallery_selector_lbx.SetSelection(
                 self.gallery_selection
@@ -303,7 +349,7 @@ class ConstructGallery(wx.Panel):
             )
 
             example = self.example_selector_lbx.GetStringSelection()
-            example_binary = self.construct_gallery[selection].example_binarys[example]
+            example_binary = gallery_item.example_binarys[example]
         else:
             example_binary = bytes(0)
 
@@ -322,7 +368,10 @@ class ConstructGallery(wx.Panel):
     def on_example_selection_changed(self, event):
         selection = self.gallery_selector_lbx.GetStringSelection()
         example = self.example_selector_lbx.GetStringSelection()
-        example_binary = self.construct_gallery[selection].example_binarys[example]
+        gallery_item = self.get_gallery_item(selection)
+        if gallery_item is None:
+            return
+        example_binary = gallery_item.example_binarys[example]
 
         # Set example binary
         self.construct_hex_editor.binary = example_binary
@@ -340,10 +389,69 @@ class ConstructGallery(wx.Panel):
                 return  # the user changed their mind
 
             # Proceed loading the file chosen by the user
+            pathname = Path(fileDialog.GetPath())
+            self.construct_hex_editor.open_file(str(pathname))
+
+    def on_watch_binary_file_changed(self, event):
+        if not self.watch_binary_file_cbx.GetValue():
+            self.construct_hex_editor.stop_watching()
+            return
+
+        if not self.construct_hex_editor.start_watching():
+            self.watch_binary_file_cbx.SetValue(False)
+            wx.MessageBox(
+                "Load an unmodified binary file to watch it for changes.",
+                "Watch File",
+                wx.OK | wx.ICON_INFORMATION,
+            )
+
+    def on_follow_file_clicked(self, event):
+        with wx.FileDialog(
+            self,
+            "Open file or pipe to follow",
+            wildcard="binary files (*.*)|*.*",
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+        ) as fileDialog:
+
+            if fileDialog.ShowModal() == wx.ID_CANCEL:
+                return  # the user changed their mind
+
+            pathname = Path(fileDialog.GetPath())
+
+        try:
+            self.construct_hex_editor.start_follow(
+                str(pathname), max_records=FOLLOW_MAX_RECORDS
+            )
+        except (ValueError, OSError) as e:
+            wx.MessageBox(
+                f"Error while following the file: {type(e).__name__}\n{str(e)}",
+                "Follow Error",
+                wx.OK | wx.ICON_ERROR,
+            )
+
+    def on_compare_binary_file_clicked(self, event):
+        with wx.FileDialog(
+            self,
+            "Open binary file to compare",
+            wildcard="binary files (*.*)|*.*",
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+        ) as fileDialog:
+
+            if fileDialog.ShowModal() == wx.ID_CANCEL:
+                return  # the user changed their mind
+
             pathname = Path(fileDialog.GetPath())
             with open(pathname, "rb") as file:
-                self.construct_hex_editor.binary = file.read()
-                self.construct_hex_editor.refresh()
+                binary = file.read()
+
+        try:
+            self.construct_hex_editor.compare(binary)
+        except Exception as e:
+            wx.MessageBox(
+                f"Error while parsing the binary data to compare: {type(e).__name__}\n{str(e)}",
+                "Compare Error",
+                wx.OK | wx.ICON_ERROR,
+            )
 
 
 icon = PyEmbeddedImage(
@@ -1,7 +1,22 @@
-from construct_editor.wx_widgets.wx_construct_editor import WxConstructEditor
-from construct_editor.wx_widgets.wx_construct_hex_editor import WxConstructHexEditor
-from construct_editor.wx_widgets.wx_hex_editor import WxHexEditor
-from construct_editor.wx_widgets.wx_python_code_editor import WxPythonCodeEditor
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from construct_editor.wx_widgets.wx_construct_editor import WxConstructEditor
+    from construct_editor.wx_widgets.wx_construct_hex_editor import (
+        WxConstructHexEditor,
+    )
+    from construct_editor.wx_widgets.wx_hex_editor import WxHexEditor
+    from construct_editor.wx_widgets.wx_python_code_editor import WxPythonCodeEditor
+
+# The widgets are imported on first access, so that only the needed widgets
+# are imported (eg. `WxPythonCodeEditor` imports the Scintilla library).
+_WIDGET_MODULES = {
+    "WxConstructEditor": "wx_construct_editor",
+    "WxConstructHexEditor": "wx_construct_hex_editor",
+    "WxHexEditor": "wx_hex_editor",
+    "WxPythonCodeEditor": "wx_python_code_editor",
+}
 
 __all__ = [
     "WxConstructEditor",
@@ -9,3 +24,17 @@ __all__ = [
     "WxHexEditor",
     "WxPythonCodeEditor",
 ]
+
+
+def __getattr__(name: str) -> t.Any:
+    module_name = _WIDGET_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    widget = getattr(module, name)
+    globals()[name] = widget
+    return widget
+
+
+def __dir__() -> t.List[str]:
+    return sorted(list(globals().keys()) + __all__)
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import dataclasses
-import textwrap
 import typing as t
 
 import construct as cs
@@ -8,8 +7,15 @@ import wx
 import wx.dataview as dv
 
 from construct_editor.core.construct_editor import ConstructEditor
-from construct_editor.core.entries import EntryConstruct, EntryFlag
+from construct_editor.core.entries import (
+    EntryArray,
+    EntryConstruct,
+    EntryFlag,
+    create_path_str,
+)
+from construct_editor.core.list_view import ListViewFilterError
 from construct_editor.core.model import ConstructEditorColumn, ConstructEditorModel
+from construct_editor.core.structural_diff import DiffKind
 from construct_editor.wx_widgets.wx_context_menu import WxContextMenu
 from construct_editor.wx_widgets.wx_obj_view import (
     WxObjEditor,
@@ -18,6 +24,19 @@ from construct_editor.wx_widgets.wx_obj_view import (
     create_obj_renderer_helper,
 )
 from construct_editor.wx_widgets.wx_exception_dialog import WxExceptionDialog
+from construct_editor.wx_widgets.wx_statistics_dialog import WxStatisticsDialog
+
+
+# Colours of the differences to a compared binary
+DIFF_CHANGED_COLOUR = wx.Colour(255, 200, 200)
+DIFF_REMOVED_COLOUR = wx.Colour(255, 225, 170)
+DIFF_PARENT_COLOUR = wx.Colour(192, 0, 0)
+
+# The rows of a table have no entries (see `ConstructEditorModel.get_table_rows`),
+# so the IDs of their dvc items are made of the number of the table and the
+# index of the row. The IDs of the items of objects (see `ObjectToItem`) are
+# memory addresses, which are always even, so the odd IDs are used for rows.
+TABLE_ROW_BITS = 32
 
 
 @dataclasses.dataclass
@@ -38,10 +57,14 @@ class ObjectRenderer(dv.DataViewCustomRenderer):
         self.entry_renderer_helper: t.Optional[WxObjRendererHelper] = None
         self.EnableEllipsize(wx.ELLIPSIZE_END)
 
-    def SetValue(self, value: EntryConstruct):
+    def SetValue(self, value: t.Optional[EntryConstruct]):
         self.entry = value
+        if value is None:
+            # the rows of a table have no value (see `get_table_value`)
+            self.entry_renderer_helper = None
+            return True
         self.entry_renderer_helper = create_obj_renderer_helper(
-            self.entry.obj_view_settings
+            value.obj_view_settings
         )
         return True
 
@@ -49,11 +72,15 @@ class ObjectRenderer(dv.DataViewCustomRenderer):
         return self.entry
 
     def GetSize(self):
+        if self.entry is None:
+            return wx.Size(2, 2)
         if self.entry_renderer_helper is None:
             raise ValueError("`entry_renderer_helper` not set")
         return self.entry_renderer_helper.get_size(self)
 
     def Render(self, rect: wx.Rect, dc: wx.DC, state):
+        if self.entry is None:
+            return True
         if self.entry_renderer_helper is None:
             raise ValueError("`entry_renderer_helper` not set")
         return self.entry_renderer_helper.render(self, rect, dc, state)
@@ -157,13 +184,23 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
         # WeakValueDictionary instead.
         # self.UseWeakRefs(True)  # weak refs are slower when creating a large number of items
 
+        # arrays that are shown as table and their numbers in the IDs of the
+        # table rows (see `table_row_to_dvc_item`)
+        self._tables: t.List[EntryConstruct] = []
+        self._table_numbers: t.Dict[EntryConstruct, int] = {}
+
     # #################################################################################################################
     # Helper ##########################################################################################################
     # #################################################################################################################
     def dvc_item_to_entry(self, dvc_item: dv.DataViewItem) -> EntryConstruct:
         """
         Convert an Entry to an dvc item.
+        The rows of a table have no entries, so the array of the table is used.
         """
+        table_row = self.dvc_item_to_table_row(dvc_item)
+        if table_row is not None:
+            return table_row[0]
+
         entry = self.ItemToObject(dvc_item)
         if not isinstance(entry, EntryConstruct):
             raise ValueError(f"{repr(entry)} is no valid entry")
@@ -175,12 +212,41 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
         An dvc item always represents an visible row in the view. So if
         an entry is not visible, the corresponding visible entry is used.
         """
+        # elements of an array, that is shown as table, are rows of the table
+        table_row = self.get_table_row(entry)
+        if table_row is not None:
+            return self.table_row_to_dvc_item(*table_row)
+
         visible_row_entry = entry.get_visible_row_entry()
         if visible_row_entry is None:
             return dv.NullDataViewItem
         dvc_item = self.ObjectToItem(visible_row_entry)
         return dvc_item
 
+    def dvc_item_to_table_row(
+        self, dvc_item: dv.DataViewItem
+    ) -> t.Optional[t.Tuple[EntryConstruct, int]]:
+        """
+        Convert an dvc item to the array and the index of a table row.
+        Returns None, if the dvc item is no row of a table.
+        """
+        item_id = dvc_item.GetID()
+        if item_id is None or (int(item_id) & 1) == 0:
+            return None
+        number, row = divmod(int(item_id) >> 1, 1 << TABLE_ROW_BITS)
+        return self._tables[number], row
+
+    def table_row_to_dvc_item(self, entry: EntryConstruct, row: int) -> dv.DataViewItem:
+        """
+        Convert a row of an array, that is shown as table, to an dvc item.
+        """
+        number = self._table_numbers.get(entry)
+        if number is None:
+            number = len(self._tables)
+            self._tables.append(entry)
+            self._table_numbers[entry] = number
+        return dv.DataViewItem((((number << TABLE_ROW_BITS) | row) << 1) | 1)
+
     # #################################################################################################################
     # ConstructEditorModel Interface ##################################################################################
     # #################################################################################################################
@@ -209,9 +275,17 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
         if not parent:
             # hidden root
             entry = None
+        elif self.dvc_item_to_table_row(parent) is not None:
+            return 0  # the rows of a table have no children
         else:
             entry = self.dvc_item_to_entry(parent)
 
+        # the rows of a table are only indexes (see `get_table_rows`)
+        if entry is not None and self.get_array_table(entry) is not None:
+            for row in self.get_table_rows(entry):
+                children.append(self.table_row_to_dvc_item(entry, row))
+            return len(children)
+
         childs = self.get_children(entry)
         for child in childs:
             dvc_item = self.entry_to_dvc_item(child)
@@ -225,12 +299,12 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
         if not item:
             return True
 
-        entry = self.dvc_item_to_entry(item)
-
-        if entry.subentries is None:
+        # The rows of a table are no containers
+        if self.dvc_item_to_table_row(item) is not None:
             return False
 
-        return True
+        entry = self.dvc_item_to_entry(item)
+        return self.is_container(entry)
 
     def HasContainerColumns(self, item):
         # Retrun Ture, because containers (eg. Struct, Array) should have also values in all columns.
@@ -241,6 +315,9 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
 
         if not item:
             entry = None  # Root object
+        elif self.dvc_item_to_table_row(item) is not None:
+            # the parent of a row is the array of the table
+            return self.entry_to_dvc_item(self.dvc_item_to_entry(item))
         else:
             entry = self.dvc_item_to_entry(item)
 
@@ -252,13 +329,23 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
         return parent_item
 
     def GetValue(self, item: dv.DataViewItem, col: int):
+        table_row = self.dvc_item_to_table_row(item)
+        if table_row is not None:
+            return self.get_table_value(table_row[0], table_row[1], col)
+
         entry = self.dvc_item_to_entry(item)
 
         return self.get_value(entry, col)
 
+    def IsEnabled(self, item: dv.DataViewItem, col: int):
+        # the rows of a table cannot be edited
+        return self.dvc_item_to_table_row(item) is None
+
     def SetValue(self, value: ValueFromEditorCtrl, item: dv.DataViewItem, col: int):
         if not isinstance(value, ValueFromEditorCtrl):
             raise ValueError(f"value has the wrong type ({value})")
+        if self.dvc_item_to_table_row(item) is not None:
+            return False
 
         entry = self.dvc_item_to_entry(item)
         self.set_value(value.new_obj, entry, col)
@@ -266,6 +353,9 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
         return True
 
     def GetAttr(self, item, col, attr):
+        if self.dvc_item_to_table_row(item) is not None:
+            return False
+
         entry = self.dvc_item_to_entry(item)
 
         if entry is self.root_entry:
@@ -273,6 +363,18 @@ class WxConstructEditorModel(dv.PyDataViewModel, ConstructEditorModel):
             attr.SetBold(True)
             return True
 
+        # highlight the differences to the compared binary (see `compare`)
+        diff_kind = self.get_diff_kind(entry)
+        if diff_kind is DiffKind.Changed:
+            attr.SetBackgroundColour(DIFF_CHANGED_COLOUR)
+            return True
+        if diff_kind is DiffKind.OnlyInA:
+            attr.SetBackgroundColour(DIFF_REMOVED_COLOUR)
+            return True
+        if self.contains_diff(entry):
+            attr.SetColour(DIFF_PARENT_COLOUR)
+            return True
+
         return False
 
 
@@ -349,6 +451,9 @@ class WxConstructEditor(wx.Panel, ConstructEditor):
         self._dvc.Bind(dv.EVT_DATAVIEW_ITEM_CONTEXT_MENU, self._on_dvc_right_clicked)
         self._dvc.Bind(dv.EVT_DATAVIEW_ITEM_EXPANDED, self._on_dvc_item_expanded)
         self._dvc.Bind(dv.EVT_DATAVIEW_ITEM_COLLAPSED, self._on_dvc_item_collapsed)
+        self._dvc.Bind(
+            dv.EVT_DATAVIEW_COLUMN_HEADER_CLICK, self._on_dvc_column_header_clicked
+        )
 
         self._dvc_main_window: wx.Window = self._dvc.GetMainWindow()
         self._dvc_main_window.Bind(wx.EVT_MOTION, self._on_dvc_motion)
@@ -426,8 +531,10 @@ class WxConstructEditor(wx.Panel, ConstructEditor):
         """
         Select an entry programmatically.
         """
+        self.expand_parents(entry)
         dvc_item = self._model.entry_to_dvc_item(entry)
         self._dvc.Select(dvc_item)
+        self._dvc.EnsureVisible(dvc_item)
 
         # calling "Select" dont trigger an dv.EVT_DATAVIEW_SELECTION_CHANGED event, so call
         # it manually
@@ -453,6 +560,48 @@ class WxConstructEditor(wx.Panel, ConstructEditor):
         dvc_item = self._model.entry_to_dvc_item(entry)
         self._dvc.Collapse(dvc_item)
 
+    def show_array_statistics(self, entry: EntryArray):
+        """
+        Show the statistics of all fields of an array to the user.
+        """
+        try:
+            with wx.BusyCursor():
+                statistics = self._model.get_array_statistics(entry)
+        except Exception as e:
+            dial = WxExceptionDialog(None, "Statistics error", e)
+            dial.ShowModal()
+            return
+
+        dial = WxStatisticsDialog(
+            self,
+            f"Statistics of '{create_path_str(entry.path)}'",
+            statistics,
+            self._model.integer_format,
+        )
+        dial.ShowModal()
+
+    def edit_list_view_filter(self, entry: EntryConstruct):
+        """
+        Let the user edit the filter expression of a list viewed entry.
+        """
+        expression = self.get_list_view_filter(entry) or ""
+        while True:
+            with wx.TextEntryDialog(
+                self,
+                "Filter expression (eg. `len > 1400 and proto == 6`):",
+                "Filter List View",
+                expression,
+            ) as dlg:
+                if dlg.ShowModal() != wx.ID_OK:
+                    return
+                expression = dlg.GetValue()
+
+            try:
+                self.filter_list_view(entry, expression)
+                return
+            except ListViewFilterError as e:
+                wx.MessageBox(str(e), "Invalid Filter", wx.OK | wx.ICON_WARNING)
+
     # Internals ###############################################################
     def _reload_dvc_columns(self):
         """
@@ -547,6 +696,29 @@ class WxConstructEditor(wx.Panel, ConstructEditor):
             # event has completed
             wx.CallAfter(self.on_root_obj_changed.fire, self._model.root_obj)
 
+    def _on_dvc_column_header_clicked(self, event: dv.DataViewEvent):
+        """
+        This method is called, if a column header of the dvc is clicked.
+
+        Then the list viewed entry of the selected row is sorted by this column.
+        """
+        column = event.GetDataViewColumn()
+        if column is None or column.ModelColumn < len(ConstructEditorColumn):
+            event.Skip()
+            return
+
+        # get the list viewed entry, that should be sorted
+        entry = self.get_selected_entry()
+        list_viewed_entries = self._model.list_viewed_entries
+        if entry is not None and entry.parent in list_viewed_entries:
+            entry = entry.parent
+        elif entry not in list_viewed_entries:
+            if len(list_viewed_entries) != 1:
+                return
+            entry = list_viewed_entries[0]
+
+        self.sort_list_view(entry, column.ModelColumn - len(ConstructEditorColumn))
+
     def _on_dvc_motion(self, event: wx.MouseEvent):
         # this is a mouse event, so we have to calculate the position of
         # the item where the mouse is manually.
@@ -561,14 +733,12 @@ class WxConstructEditor(wx.Panel, ConstructEditor):
         if col.ModelColumn == ConstructEditorColumn.Name:
             # only set tooltip if the obj changed. this prevents flickering
             if self._last_tooltip != (entry, ConstructEditorColumn.Name):
-                self._dvc_main_window.SetToolTip(
-                    textwrap.dedent(entry.docs or entry.name).strip()
-                )
+                self._dvc_main_window.SetToolTip(entry.name_tooltip)
             self._last_tooltip = (entry, ConstructEditorColumn.Name)
         elif col.ModelColumn == ConstructEditorColumn.Type:
             # only set tooltip if the obj changed. this prevents flickering
             if self._last_tooltip != (entry, ConstructEditorColumn.Type):
-                self._dvc_main_window.SetToolTip(str(entry.construct))
+                self._dvc_main_window.SetToolTip(entry.type_tooltip)
             self._last_tooltip = (entry, ConstructEditorColumn.Type)
         else:
             self._dvc_main_window.SetToolTip("")
@@ -600,11 +770,11 @@ class WxConstructEditor(wx.Panel, ConstructEditor):
 
         # Ctrl+Z
         elif event.ControlDown() and event.GetKeyCode() == ord("Z"):
-            self._model.command_processor.undo()
+            self.undo()
 
         # Ctrl+Y
         elif event.ControlDown() and event.GetKeyCode() == ord("Y"):
-            self._model.command_processor.redo()
+            self.redo()
 
         # Ctrl+C
         elif event.ControlDown() and event.GetKeyCode() == ord("C"):
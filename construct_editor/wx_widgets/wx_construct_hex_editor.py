@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
+import io
 import typing as t
 
 import construct as cs
 import wx
 
+from construct_editor.core.callbacks import CallbackList
 from construct_editor.core.entries import EntryConstruct, StreamInfo
+from construct_editor.core.file_watcher import FileChange, FileWatcher
+from construct_editor.core.follow import FollowSource, FollowWindow
 from construct_editor.core.model import ConstructEditorModel
-from construct_editor.wx_widgets.wx_construct_editor import WxConstructEditor
+from construct_editor.core.session_cache import FileStamp, SessionCache, read_file
+from construct_editor.wx_widgets.wx_construct_editor import (
+    DIFF_CHANGED_COLOUR,
+    WxConstructEditor,
+)
 from construct_editor.wx_widgets.wx_hex_editor import HexEditorFormat, WxHexEditor
 
 
@@ -50,8 +58,13 @@ class HexEditorPanel(wx.SplitterWindow):
 
         self.Initialize(panel)
 
+        self.panel_name = name
+        self.bitwise = bitwiese
         self.sub_panel: t.Optional["HexEditorPanel"] = None
 
+        # stream, that is currently shown in this panel (see `show_stream`)
+        self._stream: t.Optional[io.BytesIO] = None
+
     def clear_sub_panels(self):
         """Clears all sub-panels recursivly"""
         if self.sub_panel is not None:
@@ -59,6 +72,34 @@ class HexEditorPanel(wx.SplitterWindow):
             self.sub_panel.Destroy()
             self.sub_panel = None
 
+    def show_stream(
+        self, stream: io.BytesIO, offset: int = 0, packed_bits: bool = False
+    ):
+        """
+        Show the data of a stream. The data is not copied, the Hex Editor only
+        gets a read-only view of the stream buffer.
+
+        `offset` is the address of the first byte of the stream, if the stream
+        is only a part of the whole stream (see `StreamInfo.offset`).
+        If `packed_bits` is True, the stream is shown bit by bit.
+        """
+        if stream is self._stream:
+            return  # already shown
+        self._stream = stream
+        self.hex_editor.show_view(memoryview(stream.getvalue()), offset, packed_bits)
+
+    def get_sub_panel(self, name: str, bitwise: bool) -> "HexEditorPanel":
+        """Get the sub-panel, if it matches the arguments. Otherwise a new one is created."""
+        sub_panel = self.sub_panel
+        if (
+            sub_panel is not None
+            and sub_panel.panel_name == name
+            and sub_panel.bitwise == bitwise
+        ):
+            return sub_panel
+        self.clear_sub_panels()
+        return self.create_sub_panel(name, bitwise)
+
     def create_sub_panel(self, name: str, bitwise: bool) -> "HexEditorPanel":
         """Create a new sub-panel"""
         if self.sub_panel is None:
@@ -83,6 +124,29 @@ class WxConstructHexEditor(wx.Panel):
 
         self._contextkw = contextkw
 
+        # Cache for the sessions of opened files (see `open_file`)
+        self.session_cache: t.Optional[SessionCache] = None
+
+        # Path of the opened file, as long as the binary data is not modified
+        self._file_path: t.Optional[str] = None
+
+        # Stamp of the opened file, when it was read (None, if it was changed
+        # while reading, then no session is saved)
+        self._file_stamp: t.Optional[FileStamp] = None
+
+        # Watcher of the opened file (see `start_watching`)
+        self._file_watcher: t.Optional[FileWatcher] = None
+        self._watch_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_watch_timer, self._watch_timer)
+        self.on_watching_changed: CallbackList[[bool]] = CallbackList()
+
+        # Followed stream (see `start_follow`)
+        self._follow_source: t.Optional[FollowSource] = None
+        self._follow_window: t.Optional[FollowWindow] = None
+        self._follow_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_follow_timer, self._follow_timer)
+        self.on_following_changed: CallbackList[[bool]] = CallbackList()
+
         hsizer = wx.BoxSizer(wx.HORIZONTAL)
         self._init_gui_hex_editor_splitter(hsizer, binary)
         self._init_gui_hex_visibility(hsizer)
@@ -105,9 +169,16 @@ class WxConstructHexEditor(wx.Panel):
         # Init Root HexEditor
         self.hex_panel.hex_editor.binary = binary
         self.hex_panel.hex_editor.on_binary_changed.append(
-            lambda _: self._convert_binary_to_struct()
+            lambda _: self._on_binary_changed()
         )
 
+        # Create HexEditor for the compared binary (see `compare`)
+        self.compare_panel: HexEditorPanel = HexEditorPanel(
+            self, "Compared Binary", read_only=True
+        )
+        hsizer.Add(self.compare_panel, 0, wx.EXPAND, 0)
+        self.compare_panel.Hide()
+
     def _init_gui_hex_visibility(self, hsizer: wx.BoxSizer):
         self.toggle_hex_visibility_btn = wx.Button(
             self, wx.ID_ANY, "«", size=wx.Size(12, -1)
@@ -139,10 +210,12 @@ class WxConstructHexEditor(wx.Panel):
         """Toggle the visibility of the HexEditor"""
         if self._hex_editor_visible:
             self.hex_panel.HideWithEffect(wx.SHOW_EFFECT_ROLL_TO_LEFT)
+            self.compare_panel.Hide()
             self.toggle_hex_visibility_btn.SetLabelText("»")
             self._hex_editor_visible = False
         else:
             self.hex_panel.ShowWithEffect(wx.SHOW_EFFECT_ROLL_TO_RIGHT)
+            self.compare_panel.Show(self.model.compare_root_obj is not None)
             self.toggle_hex_visibility_btn.SetLabelText("«")
             self._hex_editor_visible = True
         self.Freeze()
@@ -154,8 +227,17 @@ class WxConstructHexEditor(wx.Panel):
         """
         Change the construct format, that is used for building/parsing.
         """
+        # the parsed data of the opened file is replaced
+        self.stop_follow()
+        self.save_session()
+        self._file_path = None
+
         self.construct_editor.change_construct(constr)
 
+        # the compared binary was parsed with the old construct
+        if self.compare_panel.IsShown():
+            self.compare(None)
+
     def change_contextkw(self, contextkw: dict):
         """
         Change the contextkw used for building/parsing.
@@ -166,9 +248,179 @@ class WxConstructHexEditor(wx.Panel):
         """
         Change the binary data, that should be displayed.
         """
+        self._end_follow()
+        self.save_session()
         self.hex_panel.clear_sub_panels()
         self.hex_panel.hex_editor.binary = binary
 
+    def open_file(self, file_path: str):
+        """
+        Open a binary file, that should be displayed.
+
+        If a session of the file is cached in `session_cache` (see
+        `save_session`), the parsed data and the view state are restored
+        from the cache instead of parsing the file again.
+        """
+        binary, file_stamp = read_file(file_path)
+
+        self._end_follow()
+        self.save_session()
+        try:
+            self.Freeze()
+            self.hex_panel.clear_sub_panels()
+
+            # the binary is not parsed, when the session can be restored
+            self._converting = True
+            try:
+                self.hex_panel.hex_editor.binary = binary
+            finally:
+                self._converting = False
+
+            restored = False
+            if self.session_cache is not None and file_stamp is not None:
+                restored = self.construct_editor.restore_session(
+                    self.session_cache,
+                    file_path,
+                    file_stamp,
+                    binary,
+                    **self._contextkw,
+                )
+            if restored:
+                if self.model.diff is not None:
+                    self._on_entry_selected(self.construct_editor.get_selected_entry())
+            else:
+                self._convert_binary_to_struct()
+            self._file_path = file_path
+            self._file_stamp = file_stamp
+        finally:
+            self.Thaw()
+
+    def start_watching(self, interval_ms: int = 1000) -> bool:
+        """
+        Watch the opened file (see `open_file`) for changes. When data is
+        appended to the file, only the new data is parsed, if possible (see
+        `ConstructEditor.parse_append`). Otherwise the file is parsed again.
+
+        Watching is stopped, when the binary data is modified or another
+        binary is shown.
+
+        :return: True if the file is watched
+        """
+        if self._file_path is None:
+            return False
+        self._file_watcher = FileWatcher(self._file_path, self.binary)
+        self._watch_timer.Start(interval_ms)
+        self.on_watching_changed.fire(True)
+        return True
+
+    def stop_watching(self):
+        """Stop watching the opened file (see `start_watching`)"""
+        if self._file_watcher is None:
+            return
+        self._watch_timer.Stop()
+        self._file_watcher = None
+        self.on_watching_changed.fire(False)
+
+    @property
+    def is_watching(self) -> bool:
+        """Check if the opened file is watched for changes"""
+        return self._file_watcher is not None
+
+    def start_follow(
+        self,
+        path: str,
+        max_records: t.Optional[int] = None,
+        max_bytes: t.Optional[int] = None,
+        from_end: bool = False,
+        interval_ms: int = 500,
+    ):
+        """
+        Follow a never-ending stream, eg. a file that a logger is still writing
+        or a named pipe (FIFO). Only the last `max_records` records or
+        `max_bytes` bytes are shown, older records are evicted (see
+        `follow.FollowWindow`). The HexEditor is read-only while following.
+
+        Following is stopped, when the data is modified or another binary is
+        shown.
+
+        :raises ValueError: if the construct has no top-level `cs.GreedyRange`
+        :raises OSError: if the stream cannot be opened
+        """
+        window = FollowWindow(
+            self.construct, max_records, max_bytes, **self._contextkw
+        )
+        source = FollowSource(path, from_end)
+
+        self._end_follow()
+        self.stop_watching()
+        self.save_session()
+        self._file_path = None
+
+        self._follow_source = source
+        self._follow_window = window
+        self.hex_panel.hex_editor.read_only = True
+        self._show_follow_window()
+        self._follow_timer.Start(interval_ms)
+        self.on_following_changed.fire(True)
+
+    def stop_follow(self):
+        """
+        Stop following the stream (see `start_follow`). The last records
+        remain and can be edited.
+        """
+        window = self._end_follow()
+        if window is None:
+            return
+
+        # show an editable copy of the data without the evicted records
+        self.hex_panel.hex_editor.binary = window.binary[window.window_start :]
+
+    @property
+    def is_following(self) -> bool:
+        """Check if a stream is followed (see `start_follow`)"""
+        return self._follow_window is not None
+
+    def save_session(self) -> bool:
+        """
+        Save the parsed data and the view state of the opened file (see
+        `open_file`) to `session_cache`. Nothing is saved, if the binary data
+        was modified or if the file has changed since it was read.
+
+        :return: True if the session was saved
+        """
+        if (
+            self.session_cache is None
+            or self._file_path is None
+            or self._file_stamp is None
+        ):
+            return False
+        return self.construct_editor.save_session(
+            self.session_cache, self._file_path, self._file_stamp, **self._contextkw
+        )
+
+    def compare(self, binary: t.Optional[bytes]):
+        """
+        Compare the binary data with another binary of the same format (eg. a
+        second capture). The changed fields are highlighted in the tree and in
+        the HexEditors of both binaries. Pass None to end the compare mode.
+
+        :raises Exception: if the other binary cannot be parsed
+        """
+        try:
+            self.Freeze()
+            self.construct_editor.compare(binary, **self._contextkw)
+            if binary is None:
+                self.compare_panel.hex_editor.binary = b""
+                self.compare_panel.Hide()
+                self.hex_panel.hex_editor.colorise_ranges([])
+            else:
+                self.compare_panel.hex_editor.binary = binary
+                self.compare_panel.Show(self._hex_editor_visible)
+            self.Layout()
+            self._on_entry_selected(self.construct_editor.get_selected_entry())
+        finally:
+            self.Thaw()
+
     @property
     def construct(self) -> cs.Construct:
         """
@@ -229,6 +481,97 @@ class WxConstructHexEditor(wx.Panel):
         return self.construct_editor.model
 
     # Internals ###############################################################
+    def _end_follow(self) -> t.Optional[FollowWindow]:
+        """Stop following without changing the shown data (see `stop_follow`)"""
+        window = self._follow_window
+        if window is None:
+            return None
+        self._follow_timer.Stop()
+        if self._follow_source is not None:
+            self._follow_source.close()
+        self._follow_source = None
+        self._follow_window = None
+        self.hex_panel.hex_editor.read_only = False
+        self.on_following_changed.fire(False)
+        return window
+
+    def _on_follow_timer(self, event: wx.TimerEvent):
+        source = self._follow_source
+        window = self._follow_window
+        if source is None or window is None:
+            return
+
+        # read at most a few chunks, so that the GUI stays responsive
+        changed = False
+        for _ in range(4):
+            data = source.read()
+            if len(data) == 0:
+                break
+            changed |= window.feed(data)
+        if changed:
+            self._show_follow_window()
+
+    def _show_follow_window(self):
+        window = self._follow_window
+        if window is None:
+            return
+        try:
+            self.Freeze()
+            self._converting = True
+            try:
+                self.hex_panel.hex_editor.show_view(
+                    memoryview(window.binary), address_offset=window.base_offset
+                )
+            finally:
+                self._converting = False
+            self.construct_editor.show_follow_window(window)
+            self._on_entry_selected(self.construct_editor.get_selected_entry())
+        finally:
+            self.Thaw()
+
+    def _on_watch_timer(self, event: wx.TimerEvent):
+        watcher = self._file_watcher
+        if watcher is None:
+            return
+
+        # the shown binary data is not the watched file anymore
+        if self._file_path != watcher.file_path:
+            self.stop_watching()
+            return
+
+        change = watcher.check()
+        if change is None or change is FileChange.Removed:
+            return
+
+        try:
+            self.Freeze()
+            self._converting = True
+            try:
+                if change is FileChange.Appended:
+                    self.hex_panel.hex_editor.append_binary(watcher.appended)
+                else:
+                    self.hex_panel.hex_editor.binary = bytes(watcher.binary)
+            finally:
+                self._converting = False
+
+            appended = change is FileChange.Appended and (
+                self.construct_editor.parse_append(watcher.binary, **self._contextkw)
+            )
+            if appended:
+                self._on_entry_selected(self.construct_editor.get_selected_entry())
+            else:
+                self.hex_panel.clear_sub_panels()
+                self._convert_binary_to_struct()
+            self._file_path = watcher.file_path
+            self._file_stamp = watcher.file_stamp
+        finally:
+            self.Thaw()
+
+    def _on_binary_changed(self):
+        # the binary data does not match the opened file anymore
+        self._file_path = None
+        self._convert_binary_to_struct()
+
     def _convert_binary_to_struct(self):
         """Convert binary to construct object"""
         if self._converting:
@@ -239,12 +582,16 @@ class WxConstructHexEditor(wx.Panel):
             self.construct_editor.parse(
                 self.hex_panel.hex_editor.binary, **self._contextkw
             )
+            if self.model.diff is not None:
+                self._on_entry_selected(self.construct_editor.get_selected_entry())
         finally:
             self.Thaw()
             self._converting = False
 
     def _convert_struct_to_binary(self):
         """Convert construct object to binary"""
+        # the edited records are not part of the followed stream anymore
+        self._end_follow()
         try:
             self._converting = True
             self.Freeze()
@@ -260,8 +607,10 @@ class WxConstructHexEditor(wx.Panel):
     def _on_entry_selected(self, entry: t.Optional[EntryConstruct]):
         try:
             self.Freeze()
-            self.hex_panel.clear_sub_panels()
-            if entry is not None:
+            if entry is None:
+                self.hex_panel.clear_sub_panels()
+                self._show_diff(root_colorised=False)
+            else:
                 stream_infos = entry.get_stream_infos()
                 self._show_stream_infos(stream_infos)
         finally:
@@ -271,25 +620,71 @@ class WxConstructHexEditor(wx.Panel):
         hex_pnl = self.hex_panel
         panel_stream_mapping: t.List[t.Tuple[HexEditorPanel, StreamInfo]] = []
 
-        # Create all Sub-Panels
+        # Create all Sub-Panels. Sub-Panels of the last selection are reused and
+        # the data is only updated, when the substream has changed.
         for idx, stream_info in enumerate(stream_infos):
             if idx != 0:  # dont create Sub-Panel for the root stream
-                hex_pnl = hex_pnl.create_sub_panel(
+                hex_pnl = hex_pnl.get_sub_panel(
                     stream_info.path_str, stream_info.bitstream
                 )
-                hex_pnl.hex_editor.binary = stream_info.stream.getvalue()
+                hex_pnl.show_stream(
+                    stream_info.stream, stream_info.offset, stream_info.packed_bits
+                )
 
             panel_stream_mapping.append((hex_pnl, stream_info))
+        hex_pnl.clear_sub_panels()  # remove Sub-Panels, that are not needed anymore
 
         # Mark to correct bytes in the stream.
         # Can only be made when alls sub-panels are created. Otherwise "scroll_to_idx"
         # does not work properly because the size of the HexEditorPanel may change.
-        for hex_pnl, stream_info in panel_stream_mapping:
-            start = stream_info.byte_range[0]
-            end = stream_info.byte_range[1]
-
-            # Show the byte range in the corresponding HexEditor
-            hex_pnl.hex_editor.colorise(start, end, refresh=False)
+        for idx, (hex_pnl, stream_info) in enumerate(panel_stream_mapping):
+            start = stream_info.byte_range[0] - stream_info.offset
+            end = stream_info.byte_range[1] - stream_info.offset
+
+            # Show the byte range in the corresponding HexEditor (the root
+            # HexEditor also shows the differences to the compared binary)
+            ranges: t.List[t.Tuple[int, int, wx.Colour]] = []
+            if idx == 0 and self.model.diff is not None:
+                ranges = self._get_diff_ranges(self.model.diff.get_byte_ranges_a())
+            ranges.append((start, end, hex_pnl.hex_editor.colorise_color))
+            hex_pnl.hex_editor.colorise_ranges(ranges, refresh=False)
             hex_pnl.hex_editor.scroll_to_idx(end - 1, refresh=False)
             hex_pnl.hex_editor.scroll_to_idx(start, refresh=False)
             hex_pnl.hex_editor.refresh()
+
+        self._show_diff(root_colorised=len(panel_stream_mapping) > 0)
+
+    def _show_diff(self, root_colorised: bool):
+        """
+        Show the differences in the HexEditor of the compared binary (and in
+        the root HexEditor, if it is not colorised already).
+        """
+        diff = self.model.diff
+        if diff is None:
+            return
+
+        if not root_colorised:
+            self.hex_panel.hex_editor.colorise_ranges(
+                self._get_diff_ranges(diff.get_byte_ranges_a())
+            )
+
+        ranges = self._get_diff_ranges(diff.get_byte_ranges_b())
+        selected_entry = self.construct_editor.get_selected_entry()
+        byte_range = None
+        if selected_entry is not None:
+            byte_range = self.model.get_compare_byte_range(selected_entry)
+        compare_editor = self.compare_panel.hex_editor
+        if byte_range is not None:
+            start, end = byte_range
+            ranges.append((start, end, compare_editor.colorise_color))
+            compare_editor.colorise_ranges(ranges, refresh=False)
+            compare_editor.scroll_to_idx(end - 1, refresh=False)
+            compare_editor.scroll_to_idx(start, refresh=False)
+            compare_editor.refresh()
+        else:
+            compare_editor.colorise_ranges(ranges)
+
+    def _get_diff_ranges(
+        self, byte_ranges: t.List[t.Tuple[int, int]]
+    ) -> t.List[t.Tuple[int, int, wx.Colour]]:
+        return [(start, end, DIFF_CHANGED_COLOUR) for start, end in byte_ranges]
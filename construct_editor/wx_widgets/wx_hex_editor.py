@@ -1,24 +1,155 @@
 # -*- coding: utf-8 -*-
+import bisect
 import dataclasses
-import logging
+import heapq
 import math
 import re
+import sys
 import typing as t
 
 import wx
-import wx.grid as Grid
 import wx.lib.newevent
-import wx.stc
 
 from construct_editor.core.callbacks import CallbackList
-
-logger = logging.getLogger("my-logger")
-logger.propagate = False
+from construct_editor.core.commands import Command, CommandProcessor
 
 
 # #####################################################################################################################
 # ############################################## HexEditorBinaryData ##################################################
 # #####################################################################################################################
+class _OverwriteAllCmd(Command):
+    """
+    Replace the complete data.
+
+    The data is not copied for the undo history. Instead a new buffer is
+    created for the new data and the old buffer is kept unchanged for undo
+    (copy-on-write). Swapping the buffers is always possible, because all
+    later commands are undone before this command is undone.
+    """
+
+    def __init__(self, binary_data: "HexEditorBinaryData", byts: bytes):
+        super().__init__(True, "Overwrite All")
+        self._binary_data = binary_data
+        self._other_binary = bytearray(byts)
+
+    def _swap(self) -> bool:
+        binary_data = self._binary_data
+        binary_data._binary, self._other_binary = self._other_binary, binary_data._binary
+        binary_data.on_binary_changed.fire(binary_data)
+        return True
+
+    def do(self) -> bool:
+        return self._swap()
+
+    def undo(self) -> bool:
+        return self._swap()
+
+    def get_size(self) -> int:
+        return sys.getsizeof(self) + len(self._other_binary)
+
+
+class _OverwriteRangeCmd(Command):
+    """
+    Overwrite a byte range. Only the changed span is saved for undo.
+
+    Single bytes, that are typed one after another, are merged into one
+    command. Other overwrites (eg. pasted data) are always undone separately.
+    """
+
+    def __init__(
+        self,
+        binary_data: "HexEditorBinaryData",
+        idx: int,
+        byts: bytes,
+        typing: bool = False,
+    ):
+        super().__init__(True, f"Overwrite Range (Index: {idx}, Length: {len(byts)})")
+        self._binary_data = binary_data
+        self._idx = idx
+        self._new_range = bytes(byts)
+        self._old_range = b""
+        self._typing = typing
+
+    def do(self) -> bool:
+        binary = self._binary_data._binary
+        end = self._idx + len(self._new_range)
+        self._old_range = bytes(binary[self._idx : end])
+        binary[self._idx : end] = self._new_range
+        self._binary_data.on_binary_changed.fire(self._binary_data)
+        return True
+
+    def undo(self) -> bool:
+        binary = self._binary_data._binary
+        binary[self._idx : self._idx + len(self._new_range)] = self._old_range
+        self._binary_data.on_binary_changed.fire(self._binary_data)
+        return True
+
+    def get_size(self) -> int:
+        return sys.getsizeof(self) + len(self._old_range) + len(self._new_range)
+
+    def merge(self, command: Command) -> bool:
+        if not isinstance(command, _OverwriteRangeCmd):
+            return False
+        if command._binary_data is not self._binary_data:
+            return False
+
+        # only merge a typed byte, that directly follows the typed bytes
+        if not (self._typing and command._typing and len(command._new_range) == 1):
+            return False
+        if command._idx != self._idx + len(self._new_range):
+            return False
+
+        self._old_range += command._old_range
+        self._new_range += command._new_range
+        self.name = f"Overwrite Range (Index: {self._idx}, Length: {len(self._new_range)})"
+        return True
+
+
+class _InsertRangeCmd(Command):
+    def __init__(self, binary_data: "HexEditorBinaryData", idx: int, byts: bytes):
+        super().__init__(True, f"Insert Range (Index: {idx}, Length: {len(byts)})")
+        self._binary_data = binary_data
+        self._idx = idx
+        self._byts = bytes(byts)
+
+    def do(self) -> bool:
+        self._binary_data._editable_binary[self._idx : self._idx] = self._byts
+        self._binary_data.on_binary_changed.fire(self._binary_data)
+        return True
+
+    def undo(self) -> bool:
+        del self._binary_data._editable_binary[self._idx : self._idx + len(self._byts)]
+        self._binary_data.on_binary_changed.fire(self._binary_data)
+        return True
+
+    def get_size(self) -> int:
+        return sys.getsizeof(self) + len(self._byts)
+
+
+class _RemoveRangeCmd(Command):
+    def __init__(self, binary_data: "HexEditorBinaryData", idx: int, length: int):
+        super().__init__(True, f"Remove Range (Index: {idx}, Length: {length})")
+        self._binary_data = binary_data
+        self._idx = idx
+        self._length = length
+        self._range_backup = b""
+
+    def do(self) -> bool:
+        binary = self._binary_data._editable_binary
+        self._range_backup = bytes(binary[self._idx : self._idx + self._length])
+        del binary[self._idx : self._idx + self._length]
+        self._binary_data.on_binary_changed.fire(self._binary_data)
+        return True
+
+    def undo(self) -> bool:
+        self._binary_data._editable_binary[self._idx : self._idx] = self._range_backup
+        self._binary_data.on_binary_changed.fire(self._binary_data)
+        return True
+
+    def get_size(self) -> int:
+        return sys.getsizeof(self) + len(self._range_backup)
+
+
 class HexEditorBinaryData:
     """
     Binary Data, which is shown in the HexEditor.
@@ -26,102 +157,62 @@ class HexEditorBinaryData:
     """
 
     def __init__(self, binary: bytes) -> None:
-        self._binary = bytearray(binary)
+        self._binary: t.Union[bytearray, memoryview] = bytearray(binary)
 
         self.on_binary_changed: "CallbackList[[HexEditorBinaryData]]" = CallbackList()
-        self.command_processor = wx.CommandProcessor()
+
+        # The history is not limited, because only the changed spans are saved
+        # (see `_OverwriteRangeCmd` and `_OverwriteAllCmd`).
+        self.command_processor = CommandProcessor()
 
     def overwrite_all(self, byts: bytes):
         """overwrite the complete data with the new ones"""
-        obj = self
-
-        class Cmd(wx.Command):
-            def __init__(self):
-                super().__init__(True, "Overwrite All")
-
-            def Do(self):
-                self._binary_backup = obj._binary
-                obj._binary.clear()
-                obj._binary[0:0] = byts
-                obj.on_binary_changed.fire(obj)
-                return True
-
-            def Undo(self):
-                obj._binary.clear()
-                obj._binary[0:0] = self._binary_backup
-                obj.on_binary_changed.fire(obj)
-                return True
-
-        self.command_processor.Submit(Cmd())
-
-    def overwrite_range(self, idx: int, byts: bytes):
-        """overwrite byte range beginning from the given index"""
-        obj = self
-
-        class Cmd(wx.Command):
-            def __init__(self):
-                super().__init__(
-                    True, f"Overwrite Range (Index: {idx}, Length: {len(byts)})"
-                )
+        self.command_processor.submit(_OverwriteAllCmd(self, byts))
 
-            def Do(self):
-                self._range_backup = obj._binary[idx : idx + len(byts)]
-                if obj._binary[idx : idx + len(byts)] == byts:
-                    return False
-                obj._binary[idx : idx + len(byts)] = byts
-                obj.on_binary_changed.fire(obj)
-                return True
+    def append(self, byts: bytes):
+        """
+        Append data from external (eg. of a file, that is still written).
+        The history is cleared, like when all data is set from external.
+        """
+        if isinstance(self._binary, bytearray):
+            self._binary += byts
+        else:
+            self._binary = bytearray(self._binary) + byts
+        self.command_processor.clear_commands()
+        self.on_binary_changed.fire(self)
+
+    @property
+    def _editable_binary(self) -> bytearray:
+        # the data of a view (see `set_view`) is read-only
+        if not isinstance(self._binary, bytearray):
+            raise TypeError("the data of a view cannot be edited")
+        return self._binary
 
-            def Undo(self):
-                obj._binary[idx : idx + len(byts)] = self._range_backup
-                obj.on_binary_changed.fire(obj)
-                return True
+    def set_view(self, view: memoryview):
+        """
+        Show a read-only view of external data, without copying the data.
+        The history is cleared, because the view can't be edited.
+        """
+        self._binary = view.toreadonly().cast("B")
+        self.command_processor.clear_commands()
+        self.on_binary_changed.fire(self)
 
-        self.command_processor.Submit(Cmd())
+    def overwrite_range(self, idx: int, byts: bytes, typing: bool = False):
+        """
+        overwrite byte range beginning from the given index
+        (typed bytes are undone together, see `_OverwriteRangeCmd`)
+        """
+        if self._binary[idx : idx + len(byts)] == byts:
+            return
+        self.command_processor.submit(_OverwriteRangeCmd(self, idx, byts, typing))
 
     def insert_range(self, idx: int, byts: bytes):
         """inserts byte range at the given index"""
-        obj = self
-
-        class Cmd(wx.Command):
-            def __init__(self):
-                super().__init__(
-                    True, f"Insert Range (Index: {idx}, Length: {len(byts)})"
-                )
-
-            def Do(self):
-                obj._binary[idx:idx] = byts
-                obj.on_binary_changed.fire(obj)
-                return True
-
-            def Undo(self):
-                del obj._binary[idx : idx + len(byts)]
-                obj.on_binary_changed.fire(obj)
-                return True
-
-        self.command_processor.Submit(Cmd())
+        self.command_processor.submit(_InsertRangeCmd(self, idx, byts))
 
     def remove_range(self, idx: int, length: int):
         """remove the bytes at at the given range"""
-        obj = self
-
-        class Cmd(wx.Command):
-            def __init__(self):
-                super().__init__(True, f"Remove Range (Index: {idx}, Length: {length})")
-                super().__init__(True, "Overwrite Range")
-
-            def Do(self):
-                self._range_backup = obj._binary[idx : idx + length]
-                del obj._binary[idx : idx + length]
-                obj.on_binary_changed.fire(obj)
-                return True
-
-            def Undo(self):
-                obj._binary[idx:idx] = self._range_backup
-                obj.on_binary_changed.fire(obj)
-                return True
-
-        self.command_processor.Submit(Cmd())
+        self.command_processor.submit(_RemoveRangeCmd(self, idx, length))
 
     def get_value(self, idx: int):
         """get the value at the given index"""
@@ -140,7 +231,7 @@ class HexEditorBinaryData:
 
 
 # #####################################################################################################################
-# ############################################## Grid.GridTableBase ###################################################
+# ############################################## HexEditorFormat ######################################################
 # #####################################################################################################################
 
 
@@ -150,113 +241,102 @@ class HexEditorFormat:
     label_base: int = 16
 
 
-class HexEditorTable(Grid.GridTableBase):
-    def __init__(self, editor: "WxHexEditor", binary_data: HexEditorBinaryData):
-        super().__init__()
+# Range of bytes (start, end) with the value, that is used for these bytes
+ColorRange = t.Tuple[int, int, t.Any]
 
-        self._editor = editor
-        self._binary_data = binary_data
 
-        self._rows: int = 0
-        self._cols: int = self._editor.format.width
-
-        self.font = wx.Font(
-            10, wx.FONTFAMILY_MODERN, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL
-        )
-
-        self._attr_default = Grid.GridCellAttr()
-        self._attr_default.SetFont(self.font)
-        self._attr_default.SetBackgroundColour("white")
-
-        self._attr_selected = Grid.GridCellAttr()
-        self._attr_selected.SetFont(self.font)
-        self._attr_selected.SetBackgroundColour(wx.Colour(200, 200, 200))
-
-        self.selections: t.List[t.Tuple[int, int]] = []
-
-    def get_next_cursor_rowcol(self, row: int, col: int):
-        idx = self.get_byte_idx(row, col)
-        if idx < len(self._binary_data):  # one index further than len(binary) is okay.
-            idx += 1
-        return self.get_byte_rowcol(idx)
+class _IntervalMap:
+    """
+    Map from byte indexes to values, that is created from (possibly
+    overlapping) ranges. When ranges overlap, the range that comes later in
+    the list wins.
 
-    def get_prev_cursor_rowcol(self, row: int, col: int):
-        idx = self.get_byte_idx(row, col)
-        if idx > 0:
-            idx -= 1
-        return self.get_byte_rowcol(idx)
+    The ranges are flattened to sorted, non-overlapping segments, so that a
+    lookup is only a binary search (O(log n)). The values of the columns of a
+    row are precomputed once per row, because the view is painted row by row.
+    """
 
-    def get_byte_rowcol(self, idx: int):
-        col = idx % self._cols
-        row = math.floor(idx / self._cols)
-        return (row, col)
+    _MAX_CACHED_ROWS = 512
 
-    def get_byte_idx(self, row: int, col: int):
-        idx = (row * self._cols) + col
-        return idx
+    def __init__(self, ranges: t.Sequence[ColorRange] = ()):
+        self._starts: t.List[int] = []
+        self._ends: t.List[int] = []
+        self._values: t.List[t.Any] = []
+        self._row_cache: t.Dict[t.Tuple[int, int], t.List[t.Any]] = {}
+        self._flatten(ranges)
 
-    def refresh_rows_cols(self):
-        self._rows = math.ceil(len(self._binary_data) / self._editor.format.width)
-        if (len(self._binary_data) % self._editor.format.width) == 0:
-            self._rows += 1
-        self._cols = self._editor.format.width
+    def __len__(self) -> int:
+        return len(self._starts)
 
-    # ############################################ GridTableBase Interface ############################################
-    def SetValue(self, row: int, col: int, value: str):
-        byte_idx = self.get_byte_idx(row, col)
-        if value == "" and byte_idx >= len(self._binary_data):
+    def _add_segment(self, start: int, end: int, value: t.Any) -> None:
+        if start >= end:
             return
-        try:
-            self._binary_data.overwrite_range(byte_idx, bytes([int(value, 16)]))
-        except Exception:
+        if self._ends and self._ends[-1] == start and self._values[-1] is value:
+            self._ends[-1] = end  # merge with the previous segment
             return
+        self._starts.append(start)
+        self._ends.append(end)
+        self._values.append(value)
+
+    def _flatten(self, ranges: t.Sequence[ColorRange]) -> None:
+        # sweep over all boundaries and keep the active ranges in a heap,
+        # where the range with the highest priority (latest in the list) is
+        # on top. Ranges, that are already finished, are removed lazily.
+        events = sorted(
+            (start, prio) for prio, (start, end, _) in enumerate(ranges) if start < end
+        )
+        active: t.List[t.Tuple[int, int]] = []  # (-prio, end)
+        event_idx = 0
+        pos = events[0][0] if events else 0
+        while event_idx < len(events) or active:
+            while event_idx < len(events) and events[event_idx][0] <= pos:
+                prio = events[event_idx][1]
+                heapq.heappush(active, (-prio, ranges[prio][1]))
+                event_idx += 1
+            while active and active[0][1] <= pos:
+                heapq.heappop(active)
+            if not active:
+                if event_idx < len(events):
+                    pos = events[event_idx][0]
+                continue
 
-    def GetValue(self, row: int, col: int):
-        byte_idx = self.get_byte_idx(row, col)
-        if byte_idx < len(self._binary_data):
-            return f"{self._binary_data.get_value(byte_idx):02x}"
-        else:
-            return ""
-
-    def IsEmptyCell(self, row: int, col: int):
-        byte_idx = self.get_byte_idx(row, col)
-        if byte_idx >= len(self._binary_data):
-            return True
-        else:
-            return False
-
-    def GetColLabelValue(self, col: int):
-        return f"{col:X}"
-
-    def GetNumberCols(self):
-        return self._cols
-
-    def GetNumberRows(self):
-        return self._rows
-
-    def GetRowLabelValue(self, row: int):
-        return f"{row * self._cols:04X}"
-
-    def SetAttr(self, attr, row, col):
-        # SetAttr not supported
-        raise ValueError("SetAttr is not supported")
-
-    def GetAttr(self, row, col, kind):
-        byte_idx = self.get_byte_idx(row, col)
-
-        selected = False
-        for sel in self.selections:
-            if sel[0] <= byte_idx < sel[1]:
-                selected = True
-                break
-
-        if selected:
-            attr = self._attr_selected
-        else:
-            attr = self._attr_default
-
-        attr.IncRef()  # increment reference count (https://stackoverflow.com/a/14213641)
-        return attr
+            # the top range is valid until it ends or until the next range
+            # starts (which may have a higher priority)
+            neg_prio, end = active[0]
+            if event_idx < len(events):
+                end = min(end, events[event_idx][0])
+            self._add_segment(pos, end, ranges[-neg_prio][2])
+            pos = end
+
+    def get(self, idx: int, default: t.Any = None) -> t.Any:
+        """Get the value of a byte index"""
+        pos = bisect.bisect_right(self._starts, idx) - 1
+        if pos >= 0 and idx < self._ends[pos]:
+            return self._values[pos]
+        return default
+
+    def get_row(self, row: int, cols: int, default: t.Any = None) -> t.List[t.Any]:
+        """Get the values of all columns of a row"""
+        key = (row, cols)
+        row_values = self._row_cache.get(key)
+        if row_values is not None:
+            return row_values
+
+        row_start = row * cols
+        row_end = row_start + cols
+        row_values = [default] * cols
+        pos = max(bisect.bisect_right(self._starts, row_start) - 1, 0)
+        while pos < len(self._starts) and self._starts[pos] < row_end:
+            start = max(self._starts[pos], row_start)
+            end = min(self._ends[pos], row_end)
+            for idx in range(start, end):
+                row_values[idx - row_start] = self._values[pos]
+            pos += 1
+
+        if len(self._row_cache) >= self._MAX_CACHED_ROWS:
+            self._row_cache.clear()
+        self._row_cache[key] = row_values
+        return row_values
 
 
 _KEYPAD = [
@@ -273,15 +353,6 @@ _KEYPAD = [
 ]
 
 
-def _is_valid_hex_digit(key):
-    return (
-        key in _KEYPAD
-        or (key >= ord("0") and key <= ord("9"))
-        or (key >= ord("A") and key <= ord("F"))
-        or (key >= ord("a") and key <= ord("f"))
-    )
-
-
 def _get_valid_hex_digit(key):
     if key in _KEYPAD:
         return chr(ord("0") + key - wx.WXK_NUMPAD0)
@@ -295,310 +366,6 @@ def _get_valid_hex_digit(key):
         return None
 
 
-# #####################################################################################################################
-# ############################################## wx.TextCtrl ##########################################################
-# #####################################################################################################################
-class HexTextCtrl(wx.TextCtrl):
-    def __init__(self, parent, id, parentgrid):
-        # Don't use the validator here, because apparently we can't
-        # reset the validator based on the columns.  We have to do the
-        # validation ourselves using EVT_KEY_DOWN.
-        wx.TextCtrl.__init__(
-            self, parent, id, style=wx.TE_PROCESS_TAB | wx.TE_PROCESS_ENTER
-        )
-        logger.debug("parent=%s" % parent)
-        self.SetInsertionPoint(0)
-        self.Bind(wx.EVT_TEXT, self.on_text)
-        self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
-        self.parentgrid = parentgrid
-        self.set_mode("hex")
-        self.startValue = None
-
-    def set_mode(self, mode):
-        self.mode = mode
-        if mode == "hex":
-            self.SetMaxLength(2)
-            self.autoadvance = 2
-        elif mode == "char":
-            self.SetMaxLength(1)
-            self.autoadvance = 1
-        else:
-            self.SetMaxLength(0)
-            self.autoadvance = 0
-        self.userpressed = False
-
-    def editing_new_cell(self, value, mode="hex"):
-        """
-        Begin editing a new cell by determining the edit mode and
-        setting the initial value.
-        """
-        # Set the mode before setting the value, otherwise on_text gets
-        # triggered before self.userpressed is set to false.  When
-        # operating in char mode (i.e. autoadvance=1), this causes the
-        # editor to skip every other cell.
-        self.set_mode(mode)
-        self.startValue = value
-        self.SetValue(value)
-        self.SetFocus()
-        self.SetInsertionPoint(0)
-        self.SetSelection(-1, -1)  # select the text
-
-    def insert_first_key(self, key):
-        """
-        Check for a valid initial keystroke, and insert it into the
-        text ctrl if it is one.
-
-        @param key: keystroke
-        @type key: int
-
-        @returns: True if keystroke was valid, False if not.
-        """
-        ch = None
-        if self.mode == "hex":
-            ch = _get_valid_hex_digit(key)
-        elif key >= wx.WXK_SPACE and key <= 255:
-            ch = chr(key)
-
-        if ch is not None:
-            # set self.userpressed before SetValue, because it appears
-            # that the on_text callback happens immediately and the
-            # keystroke won't be flagged as one that the user caused.
-            self.userpressed = True
-            self.SetValue(ch)
-            self.SetInsertionPointEnd()
-            return True
-
-        return False
-
-    def on_key_down(self, evt):
-        """
-        Keyboard handler to process command keys before they are
-        inserted.  Tabs, arrows, ESC, return, etc. should be handled
-        here.  If the key is to be processed normally, evt.Skip must
-        be called.  Otherwise, the event is eaten here.
-
-        @param evt: key event to process
-        """
-        logger.debug("key down before evt=%s" % evt.GetKeyCode())
-        key = evt.GetKeyCode()
-
-        if key == wx.WXK_BACK or key == wx.WXK_DELETE:
-            self.SetValue(self.startValue)
-            self.Clear()
-
-        if key == wx.WXK_TAB:
-            wx.CallAfter(self.parentgrid._advance_cursor)
-            return
-        if (
-            key == wx.WXK_ESCAPE
-            or key == wx.WXK_UP
-            or key == wx.WXK_DOWN
-            or key == wx.WXK_LEFT
-            or key == wx.WXK_RIGHT
-        ):
-            self.SetValue(self.startValue)
-            wx.CallAfter(self.parentgrid._abort_edit)
-            return
-        elif self.mode == "hex":
-            if _is_valid_hex_digit(key):
-                self.userpressed = True
-            else:
-                return
-        elif self.mode != "hex":
-            self.userpressed = True
-        evt.Skip()
-
-    def on_text(self, evt):
-        """
-        Callback used to automatically advance to the next edit field.
-        If self.autoadvance > 0, this number is used as the max number
-        of characters in the field.  Once the text string hits this
-        number, the field is processed and advanced to the next
-        position.
-
-        @param evt: CommandEvent
-        """
-        logger.debug(
-            "evt=%s str=%s cursor=%d" % (evt, evt.GetString(), self.GetInsertionPoint())
-        )
-
-        # NOTE: we check that GetInsertionPoint returns 1 less than
-        # the desired number because the insertion point hasn't been
-        # updated yet and won't be until after this event handler
-        # returns.
-        if self.autoadvance and self.userpressed:
-            if (
-                len(evt.GetString()) >= self.autoadvance
-                and self.GetInsertionPoint() >= self.autoadvance - 1
-            ):
-                # FIXME: problem here with a bunch of really quick
-                # keystrokes -- the interaction with the
-                # underlyingSTCChanged callback causes a cell's
-                # changes to be skipped over.  Need some flag in grid
-                # to see if we're editing, or to delay updates until a
-                # certain period of calmness, or something.
-                wx.CallAfter(self.parentgrid._advance_cursor)
-
-
-# #####################################################################################################################
-# ############################################## Grid.GridCellEditor ##################################################
-# #####################################################################################################################
-class HexCellEditor(Grid.GridCellEditor):
-    """
-    Cell editor for the grid, based on GridCustEditor.py from the
-    wxPython demo.
-    """
-
-    def __init__(self, grid: "HexEditorGrid"):
-        super().__init__()
-        self.parentgrid = grid
-
-    def Create(self, parent, id, evtHandler):
-        """
-        Called to create the control, which must derive from wx.Control.
-        *Must Override*
-        """
-        logger.debug("")
-        self._tc = HexTextCtrl(parent, id, self.parentgrid)
-        self.SetControl(self._tc)
-
-        if evtHandler:
-            self._tc.PushEventHandler(evtHandler)
-
-    def SetSize(self, rect):
-        """
-        Called to position/size the edit control within the cell rectangle.
-        If you don't fill the cell (the rect) then be sure to override
-        PaintBackground and do something meaningful there.
-        """
-        logger.debug("rect=%s\n" % rect)
-        self._tc.SetSize(
-            rect.x - 4, rect.y, rect.width + 8, rect.height + 2, wx.SIZE_ALLOW_MINUS_ONE
-        )
-
-    def Show(self, show, attr):
-        """
-        Show or hide the edit control.  You can use the attr (if not None)
-        to set colours or fonts for the control.
-        """
-        logger.debug("show=%s, attr=%s" % (show, attr))
-        Grid.PyGridCellEditor.Show(self, show, attr)
-
-    def PaintBackground(self, dc, rectCell, attr):
-        """
-        Draws the part of the cell not occupied by the edit control.  The
-        base  class version just fills it with background colour from the
-        attribute.  In this class the edit control fills the whole cell so
-        don't do anything at all in order to reduce flicker.
-        """
-        logger.debug("MyCellEditor: PaintBackground\n")
-
-    def BeginEdit(self, row, col, grid):
-        """
-        Fetch the value from the table and prepare the edit control
-        to begin editing.  Set the focus to the edit control.
-        *Must Override*
-        """
-        logger.debug("row,col=(%d,%d)" % (row, col))
-        self.startValue = grid.GetTable().GetValue(row, col)
-        mode = "hex"
-        self._tc.editing_new_cell(self.startValue, mode)
-
-    def EndEdit(self, row, col, grid, oldval):
-        """
-        End editing the cell.
-
-        This function must check if the current value of the editing cell
-        is valid and different from the original value in its string
-        form. If not then simply return None.  If it has changed then
-        this method should save the new value so that ApplyEdit can
-        apply it later and the string representation of the new value
-        should be returned.
-
-        Notice that this method shoiuld not modify the grid as the
-        change could still be vetoed.
-        """
-        logger.debug("row,col=(%d,%d)" % (row, col))
-        changed = False
-
-        val = self._tc.GetValue()
-
-        if val != self.startValue:
-            changed = True
-
-        return changed
-
-    def ApplyEdit(self, row, col, grid):
-        """
-        ApplyEdit(row, col, grid)
-
-        Effectively save the changes in the grid.
-        """
-        val = self._tc.GetValue()
-
-        grid.GetTable().SetValue(row, col, val)  # update the table
-
-        self.startValue = ""
-        self._tc.SetValue("")
-
-    def Reset(self):
-        """
-        Reset the value in the control back to its starting value.
-        *Must Override*
-        """
-        logger.debug("")
-        self._tc.SetValue(self.startValue)
-        self._tc.SetInsertionPointEnd()
-
-    def IsAcceptedKey(self, evt):
-        """
-        Return True to allow the given key to start editing: the base class
-        version only checks that the event has no modifiers.  F2 is special
-        and will always start the editor.
-        """
-        logger.debug("keycode=%d" % (evt.GetKeyCode()))
-
-        # We can ask the base class to do it
-        # return self.base_IsAcceptedKey(evt)
-
-        # or do it ourselves
-        return (
-            not (evt.ControlDown() or evt.AltDown())
-            and evt.GetKeyCode() != wx.WXK_SHIFT
-        )
-
-    def StartingKey(self, evt):
-        """
-        If the editor is enabled by pressing keys on the grid, this will be
-        called to let the editor do something about that first key if desired.
-        """
-        logger.debug("keycode=%d" % evt.GetKeyCode())
-        key = evt.GetKeyCode()
-        if not self._tc.insert_first_key(key):
-            evt.Skip()
-
-    def StartingClick(self):
-        """
-        If the editor is enabled by clicking on the cell, this method will be
-        called to allow the editor to simulate the click on the control if
-        needed.
-        """
-        logger.debug("")
-
-    def Destroy(self):
-        """final cleanup"""
-        logger.debug("")
-        Grid.PyGridCellEditor.Destroy(self)
-
-    def Clone(self):
-        """
-        Create a new object which is the copy of this one
-        *Must Override*
-        """
-        logger.debug("")
-        return HexCellEditor(self.parentgrid)
-
-
 @dataclasses.dataclass
 class ContextMenuItem:
     wx_id: int
@@ -614,230 +381,434 @@ class ContextMenuItem:
 
 
 # #####################################################################################################################
-# ############################################## Grid.Grid ############################################################
+# ############################################## wx.ScrolledCanvas ####################################################
 # #####################################################################################################################
-class HexEditorGrid(Grid.Grid):
+class HexEditorView(wx.ScrolledCanvas):
     """
-    Grid for editing in hexidecimal notation.
+    Custom drawn view for editing in hexidecimal notation.
+
+    Only the visible rows are drawn. Each row is drawn with a single
+    `DrawText` call from a cached row string, so that the view stays fast
+    even for files with millions of rows.
     """
 
+    _MAX_CACHED_ROWS = 512
+
     def __init__(
         self,
         editor: "WxHexEditor",
-        table: HexEditorTable,
         binary_data: HexEditorBinaryData,
         read_only: bool = False,
     ):
-        super().__init__(editor)
+        super().__init__(
+            editor, style=wx.VSCROLL | wx.HSCROLL | wx.WANTS_CHARS | wx.BORDER_NONE
+        )
         self._editor = editor
-        self._table = table
         self._binary_data = binary_data
         self.read_only = read_only
         self.on_selection_changed: "CallbackList[[int, t.Optional[int]]]" = (
             CallbackList()
         )
 
-        # The second parameter means that the grid is to take
-        # ownership of the table and will destroy it when done.
-        # Otherwise you would need to keep a reference to it and call
-        # its Destroy method later.
-        self.SetTable(self._table, True)
-        self.SetMargins(wx.SYS_VSCROLL_X - 10, wx.SYS_HSCROLL_Y - 10)
-        self.SetColMinimalAcceptableWidth(10)
-        self.EnableDragGridSize(False)
-        self.EnableDragRowSize(False)
-        self.EnableDragColSize(False)
-        self.EnableEditing(not self.read_only)
+        self._rows: int = 0
+        self._cols: int = self._editor.format.width
+
+        self._selection: t.Tuple[t.Optional[int], t.Optional[int]] = (None, None)
+        self._cursor_idx: int = 0
+        self._edit_nibble: t.Optional[str] = None  # first hex digit while editing
+        self._drag_anchor: t.Optional[int] = None
 
-        self.SetRowLabelSize(50)
-        self.SetColLabelSize(20)
+        self._row_str_cache: t.Dict[int, str] = {}
+        self._colors = _IntervalMap()
+        self._brush_pool: t.Dict[int, wx.Brush] = {}
 
-        self.RegisterDataType(Grid.GRID_VALUE_STRING, None, None)
-        self.SetDefaultEditor(HexCellEditor(self))
+        self.colorise_color = wx.Colour(200, 200, 200)
+        self._brush_default = wx.Brush(wx.Colour("white"))
+        self._brush_selected = wx.Brush(wx.Colour(153, 201, 239))
+        self._brush_label = wx.Brush(wx.SystemSettings.GetColour(wx.SYS_COLOUR_BTNFACE))
+        self._pen_cursor = wx.Pen(wx.Colour("black"), 2)
 
+        # the font is measured only once, because it is monospaced
+        self.font = wx.Font(
+            10, wx.FONTFAMILY_MODERN, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL
+        )
+        self.SetFont(self.font)
+        self._char_width, self._char_height = self.GetTextExtent("M")
+        self._row_height = self._char_height + 2
+        self._header_height = self._row_height
+        self._label_chars = 4
+
+        # Layout of the columns. In the bit view each column is one bit and
+        # the 8 bits of a byte are grouped (see `refresh`).
+        self._cell_chars = 2
+        self._group_cols = 1
+
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        # The header and the row labels are not scrolled, so the whole
+        # visible area is redrawn on scrolling (only the visible rows are drawn).
+        self.EnableScrolling(False, False)
         self.ShowScrollbars(wx.SHOW_SB_ALWAYS, wx.SHOW_SB_ALWAYS)
 
-        self.GetGridWindow().Bind(wx.EVT_LEFT_DOWN, self._on_mouse_left_down)
+        self.Bind(wx.EVT_PAINT, self._on_paint)
+        self.Bind(wx.EVT_LEFT_DOWN, self._on_mouse_left_down)
+        self.Bind(wx.EVT_LEFT_UP, self._on_mouse_left_up)
+        self.Bind(wx.EVT_MOTION, self._on_mouse_motion)
+        self.Bind(wx.EVT_RIGHT_DOWN, self._on_mouse_right_down)
         self.Bind(wx.EVT_KEY_DOWN, self._on_key_down)
-        self.Bind(Grid.EVT_GRID_SELECT_CELL, self._on_select_cell)
-        self.Bind(Grid.EVT_GRID_RANGE_SELECTING, self._on_range_selecting_mouse)
-        self.Bind(Grid.EVT_GRID_CELL_RIGHT_CLICK, self._on_cell_right_click)
+        self.Bind(wx.EVT_KILL_FOCUS, self._on_kill_focus)
 
         self.Show(True)
 
         self.refresh()
 
-        self._selection: t.Tuple[t.Optional[int], t.Optional[int]] = (None, None)
+    # ############################################ Layout #############################################################
+    def _get_len(self) -> int:
+        """Number of cells (bytes, or bits in the bit view)"""
+        if self._editor.bit_view:
+            return len(self._binary_data) * 8
+        return len(self._binary_data)
 
-    def refresh(self):
-        """
-        (Grid) -> Reset the grid view.   Call this to
-        update the grid if rows and columns have been added or deleted
-        """
-        oldrows = self._table.GetNumberRows()
-        oldcols = self._table.GetNumberCols()
+    def _is_editable(self) -> bool:
+        return not (self.read_only or self._editor.bit_view)
 
-        self._table.refresh_rows_cols()
+    def get_next_cursor_idx(self, idx: int) -> int:
+        if idx < self._get_len():  # one index further than len(binary) is okay.
+            idx += 1
+        return idx
 
-        newrows = self._table.GetNumberRows()
-        newcols = self._table.GetNumberCols()
+    def get_prev_cursor_idx(self, idx: int) -> int:
+        if idx > 0:
+            idx -= 1
+        return idx
 
-        self.BeginBatch()
-        for current, new, delmsg, addmsg in [
-            (
-                oldrows,
-                newrows,
-                Grid.GRIDTABLE_NOTIFY_ROWS_DELETED,
-                Grid.GRIDTABLE_NOTIFY_ROWS_APPENDED,
-            ),
-            (
-                oldcols,
-                newcols,
-                Grid.GRIDTABLE_NOTIFY_COLS_DELETED,
-                Grid.GRIDTABLE_NOTIFY_COLS_APPENDED,
-            ),
-        ]:
-            if new < current:
-                msg = Grid.GridTableMessage(self._table, delmsg, new, current - new)
-                self.ProcessTableMessage(msg)
-            elif new > current:
-                msg = Grid.GridTableMessage(self._table, addmsg, new - current)
-                self.ProcessTableMessage(msg)
-                # This sends an event to the grid table to update all of the displayed values
-                msg = Grid.GridTableMessage(
-                    self._table, Grid.GRIDTABLE_REQUEST_VIEW_GET_VALUES
-                )
-                self.ProcessTableMessage(msg)
-        self.EndBatch()
-
-        # update the scrollbars and the displayed part of the grid
-        self.SetColMinimalAcceptableWidth(0)
-
-        # get height of a the biggest char of the font
-        dc = wx.MemoryDC()
-        dc.SetFont(self._table.font)
-        (char_width, char_height) = dc.GetTextExtent("M")
-        self.SetDefaultRowSize(char_height + 2)
-
-        # settings for each column
-        hexcol_width = (char_width * 2) + 5
-        for col in range(newcols):
-            logger.debug("hexcol %d width=%d" % (col, hexcol_width))
-            self.SetColMinimalWidth(col, 0)
-            self.SetColSize(col, hexcol_width)
-
-        self.AdjustScrollbars()
-        self.ForceRefresh()
-
-    def _advance_cursor(self):
-        self.DisableCellEditControl()
-        # FIXME: moving from the hex region to the value region using
-        # self.MoveCursorRight(False) causes a segfault, so make sure
-        # to stay in the same region
-        (row, col) = self.GetTable().get_next_cursor_rowcol(
-            self.GetGridCursorRow(), self.GetGridCursorCol()
+    def get_byte_rowcol(self, idx: int) -> t.Tuple[int, int]:
+        return divmod(idx, self._cols)
+
+    def get_byte_idx(self, row: int, col: int) -> int:
+        return (row * self._cols) + col
+
+    def _get_label_width(self) -> int:
+        return (self._label_chars + 2) * self._char_width
+
+    def _get_col_x(self, col: int) -> int:
+        """x position (unscrolled) of the first char of a column"""
+        chars = 1 + col * self._cell_chars + col // self._group_cols
+        return self._get_label_width() + chars * self._char_width
+
+    def _get_cell_padding(self) -> int:
+        """Padding of the cell background, so that the gaps between cells are filled"""
+        if self._group_cols == 1:
+            return self._char_width // 2
+        return 0
+
+    def _get_row_y(self, row: int) -> int:
+        """y position (unscrolled) of a row"""
+        return self._header_height + row * self._row_height
+
+    def _get_visible_rows(self) -> int:
+        client_height = self.GetClientSize()[1] - self._header_height
+        return max(client_height // self._row_height, 1)
+
+    def _hit_test(self, pos: wx.Point, clamp: bool = False) -> t.Optional[int]:
+        """Get the byte index of a position in client coordinates"""
+        if not clamp and (pos.x < self._get_label_width() or pos.y < self._header_height):
+            return None
+
+        x, y = self.CalcUnscrolledPosition(pos.x, pos.y)
+        if clamp:
+            view_y = self.CalcUnscrolledPosition(0, 0)[1]
+            y = max(y, view_y + self._header_height)
+        row = (y - self._header_height) // self._row_height
+        chars = (x - self._get_col_x(0) + self._get_cell_padding()) // self._char_width
+        group_chars = self._group_cols * self._cell_chars + 1
+        group, group_char = divmod(chars, group_chars)
+        col = group * self._group_cols + min(
+            group_char // self._cell_chars, self._group_cols - 1
         )
-        self.SetGridCursor(row, col)
-        self.EnableCellEditControl()
+        row = min(max(row, 0), self._rows - 1)
+        col = min(max(col, 0), self._cols - 1)
+        return min(self.get_byte_idx(row, col), self._get_len())
 
-    def _abort_edit(self):
-        self.DisableCellEditControl()
+    def refresh(self):
+        """
+        Update the view, when the binary data or the format has changed.
+        """
+        self._row_str_cache.clear()
 
-    def _on_mouse_left_down(self, event):
-        if event.AltDown() or event.ShiftDown() or event.ControlDown():
-            # don't support selecting multiple ranges with ATL/SHIFT/CTRL.
-            self._on_range_selecting_mouse(None)
-            return
+        if self._editor.bit_view:
+            # 8 bits for every 4 bytes of the format width
+            self._cols = 8 * max(self._editor.format.width // 4, 1)
+            self._cell_chars = 1
+            self._group_cols = 8
         else:
-            event.Skip()
+            self._cols = self._editor.format.width
+            self._cell_chars = 2
+            self._group_cols = 1
 
-    def _on_select_cell(self, event: Grid.GridEvent):
-        """Single cell selected"""
-        idx = self._table.get_byte_idx(event.GetRow(), event.GetCol())
-        self.ClearSelection()
-        self._selection = (idx, None)
-        self.on_selection_changed.fire(idx, None)
-
-    def _on_range_selecting_mouse(self, event):
-        """Change selection from a rectangular block to a range between two indexes"""
-        # get the first selected item
-        row1, col1 = self.GetGridCursorCoords()
-
-        # get the current mouse position
-        x, y = self.CalcUnscrolledPosition(
-            self.GetGridWindow().ScreenToClient(wx.GetMousePosition())
+        length = self._get_len()
+        self._rows = math.ceil(length / self._cols)
+        if (length % self._cols) == 0:
+            self._rows += 1
+        last_address = self._editor.address_offset + length
+        self._label_chars = max(4, len(f"{last_address:X}"))
+
+        if self._cursor_idx > length:
+            self._cursor_idx = length
+
+        virtual_width = self._get_col_x(self._cols) + self._char_width
+        virtual_height = self._get_row_y(self._rows)
+        if self.GetVirtualSize() != (virtual_width, virtual_height):
+            self.SetScrollRate(self._char_width, self._row_height)
+            self.SetVirtualSize(virtual_width, virtual_height)
+        self.Refresh()
+
+    def make_idx_visible(self, idx: int):
+        """Scroll to a specific byte index (if it is not already visible)"""
+        row, _ = self.get_byte_rowcol(idx)
+        view_x, view_row = self.GetViewStart()
+        visible_rows = self._get_visible_rows()
+        if row < view_row:
+            self.Scroll(view_x, row)
+        elif row >= view_row + visible_rows:
+            self.Scroll(view_x, row - visible_rows + 1)
+
+    # ############################################ Colors #############################################################
+    def _get_color_brush(self, color: wx.Colour) -> wx.Brush:
+        """Get a (shared) brush for a background colour"""
+        key = color.GetRGBA()
+        brush = self._brush_pool.get(key)
+        if brush is None:
+            brush = wx.Brush(color)
+            self._brush_pool[key] = brush
+        return brush
+
+    def set_color_ranges(self, ranges: t.Sequence[t.Tuple[int, int, wx.Colour]]):
+        """
+        Set the background colours of byte ranges (start, end, colour).
+        Overlapping ranges are allowed, later ranges are drawn over earlier ranges.
+        """
+        self._colors = _IntervalMap(
+            [(start, end, self._get_color_brush(color)) for start, end, color in ranges]
         )
-        row2 = self.YToRow(y)
-        col2 = self.XToCol(x)
-
-        idx1 = self._table.get_byte_idx(row1, col1)
-        idx2 = self._table.get_byte_idx(row2, col2)
+        self.Refresh()
+
+    # ############################################ Painting ###########################################################
+    def _get_row_str(self, row: int) -> str:
+        """Get the text of all bytes of a row (eg. "00 01 02 ..." or "00000000 00000001 ...")"""
+        row_str = self._row_str_cache.get(row)
+        if row_str is None:
+            if self._editor.bit_view:
+                byte_cols = self._cols // 8
+                byts = self._binary_data.get_range(row * byte_cols, byte_cols)
+                row_str = " ".join(f"{byte:08b}" for byte in byts)
+            else:
+                byts = self._binary_data.get_range(row * self._cols, self._cols)
+                row_str = bytes(byts).hex(" ")
+            if len(self._row_str_cache) >= self._MAX_CACHED_ROWS:
+                self._row_str_cache.clear()
+            self._row_str_cache[row] = row_str
+        return row_str
+
+    def _draw_cols_background(
+        self, dc: wx.DC, y: int, col_start: int, col_end: int, brush: wx.Brush
+    ):
+        padding = self._get_cell_padding()
+        x = self._get_col_x(col_start) - padding
+        x_end = self._get_col_x(col_end - 1) + self._cell_chars * self._char_width
+        width = x_end + padding - x
+        dc.SetBrush(brush)
+        dc.DrawRectangle(x, y, width, self._row_height)
+
+    def _draw_row(self, dc: wx.DC, row: int):
+        y = self._get_row_y(row)
+        row_start = self.get_byte_idx(row, 0)
+
+        # colorised ranges (consecutive columns with the same colour are drawn at once)
+        if len(self._colors) > 0:
+            brushes = self._colors.get_row(row, self._cols)
+            col_start = 0
+            for col in range(1, self._cols + 1):
+                if col == self._cols or brushes[col] is not brushes[col_start]:
+                    if brushes[col_start] is not None:
+                        self._draw_cols_background(
+                            dc, y, col_start, col, brushes[col_start]
+                        )
+                    col_start = col
+
+        # selection
+        sel_start, sel_end = self._selection
+        if sel_start is not None and sel_end is not None:
+            col_start = min(max(sel_start - row_start, 0), self._cols)
+            col_end = min(max(sel_end + 1 - row_start, 0), self._cols)
+            if col_start < col_end:
+                self._draw_cols_background(
+                    dc, y, col_start, col_end, self._brush_selected
+                )
 
-        self.select_range(idx1, idx2)
+        dc.DrawText(self._get_row_str(row), self._get_col_x(0), y + 1)
 
-    def _on_range_selecting_keyboard(self, row_diff: int = 0, col_diff: int = 0):
+        # cursor
+        cursor_row, cursor_col = self.get_byte_rowcol(self._cursor_idx)
+        if cursor_row == row:
+            if self._edit_nibble is not None:
+                self._draw_cols_background(
+                    dc, y, cursor_col, cursor_col + 1, self._brush_default
+                )
+                dc.DrawText(self._edit_nibble, self._get_col_x(cursor_col), y + 1)
+            dc.SetPen(self._pen_cursor)
+            self._draw_cols_background(
+                dc, y, cursor_col, cursor_col + 1, wx.TRANSPARENT_BRUSH
+            )
+            dc.SetPen(wx.TRANSPARENT_PEN)
+
+    def _draw_labels(self, dc: wx.DC, first_row: int, last_row: int):
+        """Draw the column and row labels, which are not scrolled"""
+        view_x, view_y = self.CalcUnscrolledPosition(0, 0)
+        client_width, client_height = self.GetClientSize()
+        label_width = self._get_label_width()
+
+        dc.SetBrush(self._brush_label)
+        dc.DrawRectangle(view_x, view_y, label_width, client_height)
+        for row in range(first_row, last_row):
+            address = self._editor.address_offset + row * self._cols
+            label = f"{address:0{self._label_chars}X}"
+            dc.DrawText(label, view_x + self._char_width, self._get_row_y(row) + 1)
+
+        dc.DrawRectangle(view_x, view_y, client_width, self._header_height)
+        dc.SetClippingRegion(
+            view_x + label_width, view_y, client_width - label_width, self._header_height
+        )
+        group_chars = self._group_cols * self._cell_chars
+        for col in range(0, self._cols, self._group_cols):
+            label = f"{col:X}"
+            x = self._get_col_x(col) + (group_chars - len(label)) * self._char_width // 2
+            dc.DrawText(label, x, view_y + 1)
+        dc.DestroyClippingRegion()
+
+    def _on_paint(self, event: wx.PaintEvent):
+        dc = wx.AutoBufferedPaintDC(self)
+        self.DoPrepareDC(dc)
+        dc.SetBackground(self._brush_default)
+        dc.Clear()
+        dc.SetFont(self.font)
+        dc.SetPen(wx.TRANSPARENT_PEN)
+
+        # only draw the visible rows
+        view_y = self.CalcUnscrolledPosition(0, 0)[1]
+        client_height = self.GetClientSize()[1]
+        first_row = max((view_y - self._header_height) // self._row_height, 0)
+        last_row = min(
+            (view_y + client_height - self._header_height) // self._row_height + 1,
+            self._rows,
+        )
+        for row in range(first_row, last_row):
+            self._draw_row(dc, row)
+
+        self._draw_labels(dc, first_row, last_row)
+
+    # ############################################ Selection ##########################################################
+    def set_cursor(self, idx: int, keep_selection: bool = False):
+        """Move the cursor to a byte index and make it visible."""
+        idx = min(max(idx, 0), self._get_len())
+        self._edit_nibble = None
+        self._cursor_idx = idx
+        if not keep_selection:
+            self._selection = (idx, None)
+            self.on_selection_changed.fire(idx, None)
+        self.make_idx_visible(idx)
+        self.Refresh()
+
+    def _on_range_selecting_keyboard(self, diff: int = 0):
         """Change selection from the keyboard"""
         sel = self._selection
         if sel[0] is None:
             return  # nothing is currently selected
 
-        cursor_row, cursor_col = self.GetGridCursorCoords()
-        cursor_idx = self._table.get_byte_idx(cursor_row, cursor_col)
-
         if sel[1] is None:
-            other_idx = cursor_idx
+            other_idx = self._cursor_idx
         else:
-            if sel[0] == cursor_idx:
+            if sel[0] == self._cursor_idx:
                 other_idx = sel[1]
             else:
                 other_idx = sel[0]
 
-        cursor_row += row_diff
-        if cursor_row < 0:
+        cursor_idx = self._cursor_idx + diff
+        if cursor_idx < 0:
             return
 
-        cursor_col += col_diff
-        if cursor_col < 0:
-            return
-
-        cursor_idx = self._table.get_byte_idx(cursor_row, cursor_col)
-
-        self.SetGridCursor(cursor_row, cursor_col)
-
-        self.select_range(cursor_idx, other_idx)
+        self.set_cursor(cursor_idx, keep_selection=True)
+        self.select_range(self._cursor_idx, other_idx)
 
     def select_range(self, idx1: int, idx2: int):
         """Select the range between two byte indexes."""
         if idx1 < 0 or idx2 < 0:
             return
-        idx1 = min(idx1, len(self._binary_data) - 1)
-        idx2 = min(idx2, len(self._binary_data) - 1)
+        idx1 = min(idx1, self._get_len() - 1)
+        idx2 = min(idx2, self._get_len() - 1)
         if idx1 > idx2:
             idx1, idx2 = idx2, idx1
-        start_row, start_col = self._table.get_byte_rowcol(idx1)
-        end_row, end_col = self._table.get_byte_rowcol(idx2)
-        if start_row < 0 or end_row < 0:
+        if idx1 < 0:
             return
 
-        first_col = 0
-        last_col = self._table.GetNumberCols() - 1
-        row_dist = end_row - start_row
+        self._selection = (idx1, idx2)
+        self.on_selection_changed.fire(idx1, idx2)
+        self.Refresh()
+
+    def _on_mouse_left_down(self, event: wx.MouseEvent):
+        self.SetFocus()
+        idx = self._hit_test(event.GetPosition())
+        if idx is None:
+            return
 
-        self.ClearSelection()
-        if row_dist == 0:
-            # start and end are in the same row
-            self.SelectBlock(start_row, start_col, end_row, end_col, True)
+        if event.ShiftDown() and self._selection[0] is not None:
+            # extend the selection from the cursor
+            self._drag_anchor = self._cursor_idx
+            self.set_cursor(idx, keep_selection=True)
+            self.select_range(self._drag_anchor, idx)
         else:
-            # start and end are in different rows
-            self.SelectBlock(start_row, start_col, start_row, last_col, True)
-            self.SelectBlock(end_row, first_col, end_row, end_col, True)
+            self.set_cursor(idx)
+            self._drag_anchor = self._cursor_idx
+        self.CaptureMouse()
 
-        if row_dist > 1:
-            # select body
-            self.SelectBlock(start_row + 1, first_col, end_row - 1, last_col, True)
+    def _on_mouse_motion(self, event: wx.MouseEvent):
+        if not (event.Dragging() and event.LeftIsDown() and self.HasCapture()):
+            return
+        if self._drag_anchor is None:
+            return
+        idx = self._hit_test(event.GetPosition(), clamp=True)
+        if idx is None or idx == self._cursor_idx:
+            return
+        self.set_cursor(idx, keep_selection=True)
+        self.select_range(self._drag_anchor, idx)
 
-        self._selection = (idx1, idx2)
-        self.on_selection_changed.fire(idx1, idx2)
+    def _on_mouse_left_up(self, event: wx.MouseEvent):
+        if self.HasCapture():
+            self.ReleaseMouse()
+        self._drag_anchor = None
+
+    def _on_kill_focus(self, event: wx.FocusEvent):
+        self._abort_edit()
+        event.Skip()
+
+    # ############################################ Editing ############################################################
+    def _abort_edit(self):
+        if self._edit_nibble is not None:
+            self._edit_nibble = None
+            self.Refresh()
+
+    def _edit_hex_digit(self, digit: str):
+        """Edit the byte at the cursor. Two hex digits are needed for one byte."""
+        if self._edit_nibble is None:
+            self._edit_nibble = digit
+            self.Refresh()
+            return
+
+        value = int(self._edit_nibble + digit, 16)
+        self._edit_nibble = None
+        self._binary_data.overwrite_range(
+            self._cursor_idx, bytes([value]), typing=True
+        )
+        self.set_cursor(self.get_next_cursor_idx(self._cursor_idx))
 
     def _cut_selection(self) -> bool:
         """
@@ -847,7 +818,7 @@ class HexEditorGrid(Grid.Grid):
          - true if copy is okay
          - false if an error occured
         """
-        if self.read_only is True:
+        if not self._is_editable():
             return False
 
         if self._copy_selection() is False:
@@ -864,7 +835,7 @@ class HexEditorGrid(Grid.Grid):
          - true if remove is okay
          - false if an error occured
         """
-        if self.read_only is True:
+        if not self._is_editable():
             return False
 
         sel = self._selection
@@ -878,14 +849,8 @@ class HexEditorGrid(Grid.Grid):
 
         byts = self._binary_data.remove_range(sel[0], length)
 
-        self.ClearSelection()
         self._selection = (None, None)
-
-        idx = self._table.get_byte_idx(self.GetGridCursorRow(), self.GetGridCursorCol())
-        if idx > len(self._editor.binary):
-            self.SetGridCursor(0, 0)
-        else:
-            self.SetGridCursor(self.GetGridCursorCoords())
+        self.set_cursor(self._cursor_idx)
 
         self.refresh()
         return True
@@ -898,7 +863,7 @@ class HexEditorGrid(Grid.Grid):
          - true if insertation is okay
          - false if an error occured
         """
-        if self.read_only is True:
+        if not self._is_editable():
             return False
 
         sel = self._selection
@@ -926,10 +891,19 @@ class HexEditorGrid(Grid.Grid):
         else:
             length = sel[1] - sel[0] + 1
 
-        byts = self._binary_data.get_range(sel[0], length)
+        if self._editor.bit_view:
+            # copy the selected bits (eg. "0110")
+            first_byte = sel[0] // 8
+            byts = self._binary_data.get_range(
+                first_byte, (sel[0] + length - 1) // 8 - first_byte + 1
+            )
+            bits_str = "".join(f"{byte:08b}" for byte in byts)
+            byts_str = bits_str[sel[0] % 8 : sel[0] % 8 + length]
+        else:
+            byts = self._binary_data.get_range(sel[0], length)
+            byts_str = byts.hex(" ")
 
         if wx.TheClipboard.Open():
-            byts_str = byts.hex(" ")
             wx.TheClipboard.SetData(wx.TextDataObject(byts_str))
             wx.TheClipboard.Close()
         else:
@@ -947,7 +921,7 @@ class HexEditorGrid(Grid.Grid):
         If insert=True: Insert new bytes to the binary data. The binary data is always
                         increased by the size of the data from the clipboard.
         """
-        if self.read_only is True:
+        if not self._is_editable():
             return False
 
         # check if somethis is selected
@@ -1028,69 +1002,80 @@ class HexEditorGrid(Grid.Grid):
         return None
 
     def _undo(self):
-        self._binary_data.command_processor.Undo()
+        self._binary_data.command_processor.undo()
 
     def _redo(self):
-        self._binary_data.command_processor.Redo()
+        self._binary_data.command_processor.redo()
 
     def _on_key_down(self, event: wx.KeyEvent):
-        if event.GetKeyCode() == wx.WXK_RETURN or event.GetKeyCode() == wx.WXK_TAB:
-            if event.ControlDown():  # the edit control needs this key
-                event.Skip()
+        key = event.GetKeyCode()
+        hex_digit = None
+        if not (event.ControlDown() or event.AltDown()) and self._is_editable():
+            hex_digit = _get_valid_hex_digit(key)
+
+        # Hex digits (edit the byte at the cursor)
+        if hex_digit is not None:
+            self._edit_hex_digit(hex_digit)
+
+        # Escape
+        elif key == wx.WXK_ESCAPE:
+            self._abort_edit()
+
+        # Return/Tab (Shift: backwards)
+        elif key == wx.WXK_RETURN or key == wx.WXK_TAB:
+            if event.ShiftDown():
+                self.set_cursor(self.get_prev_cursor_idx(self._cursor_idx))
             else:
-                self.DisableCellEditControl()
-                if event.ShiftDown():
-                    (row, col) = self.GetTable().get_prev_cursor_rowcol(
-                        self.GetGridCursorRow(), self.GetGridCursorCol()
-                    )
-                else:
-                    (row, col) = self.GetTable().get_next_cursor_rowcol(
-                        self.GetGridCursorRow(), self.GetGridCursorCol()
-                    )
-                self.SetGridCursor(row, col)
-                self.MakeCellVisible(row, col)
+                self.set_cursor(self.get_next_cursor_idx(self._cursor_idx))
 
         # Del
-        elif event.GetKeyCode() == wx.WXK_DELETE:
+        elif key == wx.WXK_DELETE:
             self._remove_selection()
 
         # Insert
-        elif event.GetKeyCode() == wx.WXK_INSERT:
+        elif key == wx.WXK_INSERT:
             self._insert_byte_at_selection()
 
-        # Shift+Up
-        elif event.ShiftDown() and event.GetKeyCode() == wx.WXK_UP:
-            self._on_range_selecting_keyboard(row_diff=-1)
-
-        # Shift+Down
-        elif event.ShiftDown() and event.GetKeyCode() == wx.WXK_DOWN:
-            self._on_range_selecting_keyboard(row_diff=1)
-
-        # Shift+Left
-        elif event.ShiftDown() and event.GetKeyCode() == wx.WXK_LEFT:
-            self._on_range_selecting_keyboard(col_diff=-1)
-
-        # Shift+Right
-        elif event.ShiftDown() and event.GetKeyCode() == wx.WXK_RIGHT:
-            self._on_range_selecting_keyboard(col_diff=1)
+        # Arrows/Page Up/Page Down (Shift: change selection)
+        elif key in (
+            wx.WXK_UP,
+            wx.WXK_DOWN,
+            wx.WXK_LEFT,
+            wx.WXK_RIGHT,
+            wx.WXK_PAGEUP,
+            wx.WXK_PAGEDOWN,
+        ):
+            page = self._get_visible_rows() * self._cols
+            diff = {
+                wx.WXK_UP: -self._cols,
+                wx.WXK_DOWN: self._cols,
+                wx.WXK_LEFT: -1,
+                wx.WXK_RIGHT: 1,
+                wx.WXK_PAGEUP: -page,
+                wx.WXK_PAGEDOWN: page,
+            }[key]
+            if event.ShiftDown():
+                self._on_range_selecting_keyboard(diff)
+            else:
+                self.set_cursor(self._cursor_idx + diff)
 
         # Ctrl+Z
-        elif event.ControlDown() and event.GetKeyCode() == ord("Z"):
+        elif event.ControlDown() and key == ord("Z"):
             self._undo()
 
         # Ctrl+Y
-        elif event.ControlDown() and event.GetKeyCode() == ord("Y"):
+        elif event.ControlDown() and key == ord("Y"):
             self._redo()
 
         # Ctrl+X
-        elif event.ControlDown() and event.GetKeyCode() == ord("X"):
+        elif event.ControlDown() and key == ord("X"):
             self._cut_selection()
 
         # Ctrl+C
-        elif event.ControlDown() and event.GetKeyCode() == ord("C"):
+        elif event.ControlDown() and key == ord("C"):
             self._copy_selection()
 
-        elif event.ControlDown() and event.GetKeyCode() == ord("V"):
+        elif event.ControlDown() and key == ord("V"):
             # Ctrl+Shift+V
             if event.ShiftDown():
                 self._paste(insert=True)
@@ -1100,25 +1085,24 @@ class HexEditorGrid(Grid.Grid):
                 self._paste(overwrite=True)
 
         # Ctrl+A
-        elif event.ControlDown() and event.GetKeyCode() == ord("A"):
-            self.select_range(0, len(self._binary_data) - 1)
+        elif event.ControlDown() and key == ord("A"):
+            self.select_range(0, self._get_len() - 1)
 
         else:
             event.Skip()
 
-    def _on_cell_right_click(self, event: Grid.GridEvent):
+    def _on_mouse_right_down(self, event: wx.MouseEvent):
         """Show context menu"""
+        self.SetFocus()
+        idx = self._hit_test(event.GetPosition())
+        if idx is None:
+            return
+
         # Check if the click is inside the current selection.
         # If not, select the current cell
         sel = self._selection
-        select_cell = True
-        if sel[0] is not None and sel[1] is not None:
-            idx = self._table.get_byte_idx(event.GetRow(), event.GetCol())
-            if sel[0] <= idx <= sel[1]:
-                select_cell = False
-
-        if select_cell:
-            self.SetGridCursor(event.GetRow(), event.GetCol())
+        if sel[0] is None or sel[1] is None or not (sel[0] <= idx <= sel[1]):
+            self.set_cursor(idx)
 
         popup_menu = wx.Menu()
         for menu in self.build_context_menu():
@@ -1147,7 +1131,7 @@ class HexEditorGrid(Grid.Grid):
                 "Cut\tCtrl+X",
                 lambda event: self._cut_selection(),
                 None,
-                not self.read_only,
+                self._is_editable(),
             ),
             ContextMenuItem(
                 wx.ID_COPY,
@@ -1161,14 +1145,14 @@ class HexEditorGrid(Grid.Grid):
                 "Paste (overwrite)\tCtrl+V",
                 lambda event: self._paste(overwrite=True),
                 None,
-                not self.read_only,
+                self._is_editable(),
             ),
             ContextMenuItem(
                 wx.ID_PASTE,
                 "Paste (insert)\tCtrl+Shift+V",
                 lambda event: self._paste(insert=True),
                 None,
-                not self.read_only,
+                self._is_editable(),
             ),
             None,
             ContextMenuItem(
@@ -1176,18 +1160,20 @@ class HexEditorGrid(Grid.Grid):
                 "Undo\tCtrl+Z",
                 lambda event: self._undo(),
                 None,
-                self._binary_data.command_processor.CanUndo(),
+                self._binary_data.command_processor.can_undo(),
             ),
             ContextMenuItem(
                 wx.ID_REDO,
                 "Redo\tCtrl+Y",
                 lambda event: self._redo(),
                 None,
-                self._binary_data.command_processor.CanRedo(),
+                self._binary_data.command_processor.can_redo(),
             ),
         ]
 
 
+
+
 # #####################################################################################################################
 # ############################################## WxHexEditor ##########################################################
 # #####################################################################################################################
@@ -1212,14 +1198,15 @@ class WxHexEditor(wx.Panel):
         else:
             self._format = format
         self.bitwiese = bitwiese
+        self._address_offset = 0
+        self._bit_view = False
 
         # self.control = wx.TextCtrl(self, style=wx.TE_MULTILINE)
         sizer = wx.BoxSizer(wx.VERTICAL)
 
-        # create HexEditorTable & HexEditorGrid
-        self._table = HexEditorTable(self, self._binary_data)
-        self._grid = HexEditorGrid(self, self._table, self._binary_data, read_only)
-        sizer.Add(self._grid, 1, wx.ALL | wx.EXPAND, 0)
+        # create HexEditorView
+        self._view = HexEditorView(self, self._binary_data, read_only)
+        sizer.Add(self._view, 1, wx.ALL | wx.EXPAND, 0)
 
         # create status bar
         self._status_bar = wx.StatusBar(
@@ -1239,12 +1226,15 @@ class WxHexEditor(wx.Panel):
         self.Show(True)
 
     def _on_binary_changed(self, binary_data: HexEditorBinaryData):
-        if self.bitwiese is True:
+        length = len(binary_data)
+        if self._bit_view is True:
+            length *= 8
+        if self.bitwiese is True or self._bit_view is True:
             unit = "Bits"
         else:
             unit = "Bytes"
 
-        msg = f"{len(binary_data):n} {unit}"
+        msg = f"{length:n} {unit}"
         self._status_bar.SetStatusText(msg, 0)
         self.refresh()
 
@@ -1257,24 +1247,40 @@ class WxHexEditor(wx.Panel):
         self._status_bar.SetStatusText(msg, 1)
 
     def colorise(self, start: int, end: int, refresh: bool = True):
-        """Colorize a byte range in the Hex Editor. Only a singe range can be colorized"""
-        self._table.selections = [(start, end)]
+        """Colorize a byte range in the Hex Editor. All other colorized ranges are removed."""
+        self.colorise_ranges([(start, end, self._view.colorise_color)], refresh)
+
+    @property
+    def colorise_color(self) -> wx.Colour:
+        """Colour of the byte range, that is colorized with `colorise`"""
+        return self._view.colorise_color
+
+    def colorise_ranges(
+        self,
+        ranges: t.Sequence[t.Tuple[int, int, wx.Colour]],
+        refresh: bool = True,
+    ):
+        """
+        Colorize multiple byte ranges (start, end, colour) in the Hex Editor
+        (eg. every field of a struct in a different shade). All other colorized
+        ranges are removed. When ranges overlap, later ranges are drawn over
+        earlier ranges.
+        """
+        self._view.set_color_ranges(ranges)
 
         if refresh:
             self.refresh()
 
     def scroll_to_idx(self, idx: int, refresh: bool = True):
         """Scroll to a specific byte index in the Hex Editor"""
-        row, col = self._table.get_byte_rowcol(idx)
-
-        self._grid.MakeCellVisible(row, col)
+        self._view.make_idx_visible(idx)
 
         if refresh:
             self.refresh()
 
     def refresh(self):
         """Refresh the Grid, when some values have canged"""
-        self._grid.refresh()
+        self._view.refresh()
 
     # Property: binary ########################################################
     @property
@@ -1285,9 +1291,60 @@ class WxHexEditor(wx.Panel):
     @binary.setter
     def binary(self, val: bytes):
         self.colorise(0, 0, True)
+        self._address_offset = 0
+        self._bit_view = False
         self._binary_data.overwrite_all(val)
         # clear all commands, when new data is set from external
-        self._binary_data.command_processor.ClearCommands()
+        self._binary_data.command_processor.clear_commands()
+
+    def append_binary(self, val: bytes):
+        """
+        Append binary data from external (eg. of a file, that is still
+        written), without copying the shown data.
+        """
+        self._binary_data.append(val)
+
+    def show_view(
+        self, view: memoryview, address_offset: int = 0, bit_view: bool = False
+    ):
+        """
+        Show a read-only view of external data (eg. of a substream), without
+        copying the data. Only use this for read-only Hex Editors.
+
+        If the view is only a part of the data, `address_offset` is the address
+        of the first byte, which is used for the row labels.
+
+        If `bit_view` is True, every bit of the data is shown as "0" or "1" and
+        all indexes (eg. of `colorise` and `scroll_to_idx`) are bit indexes.
+        This is used for bitwise streams, so that the bits don't have to be
+        expanded to one byte per bit.
+        """
+        self.colorise(0, 0, False)
+        self._address_offset = address_offset
+        self._bit_view = bit_view
+        self._binary_data.set_view(view)
+
+    # Property: address_offset ##############################################
+    @property
+    def address_offset(self) -> int:
+        """Address of the first byte, which is used for the row labels (see `show_view`)."""
+        return self._address_offset
+
+    # Property: bit_view ####################################################
+    @property
+    def bit_view(self) -> bool:
+        """Show every bit of the data (see `show_view`)."""
+        return self._bit_view
+
+    # Property: read_only ###################################################
+    @property
+    def read_only(self) -> bool:
+        """Forbid editing the data (eg. while showing a view, see `show_view`)."""
+        return self._view.read_only
+
+    @read_only.setter
+    def read_only(self, val: bool):
+        self._view.read_only = val
 
     # Property: format ##################################################
     @property
@@ -1308,7 +1365,7 @@ class WxHexEditor(wx.Panel):
     # Property: on_binary_changed #############################################
     @property
     def on_selection_changed(self) -> "CallbackList[[int, t.Optional[int]]]":
-        return self._grid.on_selection_changed
+        return self._view.on_selection_changed
 
 
 if __name__ == "__main__":
@@ -373,7 +373,7 @@ class WxObjRendererHelper_Default:
         # has a helper function we can use for measuring text that is
         # aware of any custom attributes that may have been set for
         # this item.
-        obj_str = self.entry.obj_str if self.entry else ""
+        obj_str = self.entry.cached_obj_str if self.entry else ""
         size = renderer.GetTextExtent(obj_str)
         size += (2, 2)
         return size
@@ -388,7 +388,7 @@ class WxObjRendererHelper_Default:
         # And then finish up with this helper function that draws the
         # text for us, dealing with alignment, font and color
         # attributes, etc.
-        obj_str = self.entry.obj_str if self.entry else ""
+        obj_str = self.entry.cached_obj_str if self.entry else ""
         renderer.RenderText(obj_str, 0, rect, dc, state)
         return True
 
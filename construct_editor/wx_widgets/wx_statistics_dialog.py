@@ -0,0 +1,105 @@
+import typing as t
+
+import wx
+
+from construct_editor.core.entries import int_to_str
+from construct_editor.core.model import IntegerFormat
+from construct_editor.core.statistics import FieldStatistics, Histogram
+
+HISTOGRAM_CHARS = " ▁▂▃▄▅▆▇█"
+
+
+def _number_to_str(integer_format: IntegerFormat, val: t.Any) -> str:
+    if val is None:
+        return ""
+    if isinstance(val, bool):
+        return str(val)
+    if isinstance(val, int):
+        return int_to_str(integer_format, val)
+    return f"{val:.6g}"
+
+
+def _histogram_to_str(histogram: t.Optional[Histogram]) -> str:
+    if histogram is None or len(histogram.counts) == 0:
+        return ""
+    max_count = max(histogram.counts)
+    if max_count == 0:
+        return ""
+    chars = []
+    for count in histogram.counts:
+        idx = round(count / max_count * (len(HISTOGRAM_CHARS) - 1))
+        chars.append(HISTOGRAM_CHARS[idx])
+    return "".join(chars)
+
+
+class WxStatisticsDialog(wx.Dialog):
+    def __init__(
+        self,
+        parent,
+        title: str,
+        statistics: t.List[FieldStatistics],
+        integer_format: IntegerFormat,
+    ):
+        wx.Dialog.__init__(
+            self,
+            parent,
+            id=wx.ID_ANY,
+            title=title,
+            pos=wx.DefaultPosition,
+            size=wx.Size(900, 400),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
+        )
+
+        self._init_gui()
+
+        for field in statistics:
+            top_values = ", ".join(f"{name} ({count})" for name, count in field.top_values)
+            self.statistics_list.Append(
+                [
+                    field.name,
+                    str(field.count),
+                    _number_to_str(integer_format, field.minimum),
+                    _number_to_str(integer_format, field.maximum),
+                    _number_to_str(IntegerFormat.Dec, field.mean),
+                    str(field.distinct_count),
+                    _histogram_to_str(field.histogram),
+                    top_values,
+                ]
+            )
+
+    def _init_gui(self):
+        self.SetSizeHints(wx.DefaultSize, wx.DefaultSize)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.statistics_list = wx.ListCtrl(
+            self, wx.ID_ANY, wx.DefaultPosition, wx.DefaultSize, wx.LC_REPORT
+        )
+        for label, width in (
+            ("Field", 160),
+            ("Count", 70),
+            ("Min", 80),
+            ("Max", 80),
+            ("Mean", 80),
+            ("Distinct", 70),
+            ("Histogram", 100),
+            ("Most Frequent", 220),
+        ):
+            self.statistics_list.AppendColumn(label, width=width)
+        sizer.Add(self.statistics_list, 1, wx.ALL | wx.EXPAND, 5)
+
+        self.ok_btn = wx.Button(
+            self, wx.ID_ANY, "OK", wx.DefaultPosition, wx.DefaultSize, 0
+        )
+        sizer.Add(self.ok_btn, 0, wx.ALL | wx.EXPAND, 5)
+
+        self.SetSizer(sizer)
+        self.Layout()
+
+        self.Centre(wx.BOTH)
+
+        # Connect Events
+        self.ok_btn.Bind(wx.EVT_BUTTON, self.on_ok_clicked)
+
+    def on_ok_clicked(self, event):
+        self.Close()
@@ -0,0 +1,69 @@
+"""
+Measure the memory, that is needed for the entries of the large ("Huge")
+gallery examples.
+
+Usage: python -m doc.benchmark_scripts.entry_memory
+"""
+import gc
+import importlib
+import tracemalloc
+import typing as t
+
+import construct_editor.core.entries as entries
+from construct_editor.core.model import ConstructEditorModel
+from construct_editor.core.preprocessor import include_metadata
+
+GALLERY_ITEMS = [
+    "test_array",
+    "test_bitwise",
+    "test_bits_swapped_bitwise",
+]
+
+
+class BenchmarkModel(ConstructEditorModel):
+    def on_value_changed(self, entry: "entries.EntryConstruct"):
+        pass
+
+
+def create_all_entries(root_entry: "entries.EntryConstruct") -> int:
+    """Create the entries of the whole tree and return the number of entries"""
+    count = 0
+    stack = [root_entry]
+    while stack:
+        entry = stack.pop()
+        count += 1
+        stack.extend(entries.get_all_subentries(entry) or [])
+    return count
+
+
+def measure(gallery_item_name: str) -> t.Tuple[int, int]:
+    """Return the number of entries and the allocated bytes for all entries"""
+    module = importlib.import_module(f"construct_editor.gallery.{gallery_item_name}")
+    gallery_item = module.gallery_item
+
+    constr = include_metadata("root" / gallery_item.construct)
+    model = BenchmarkModel()
+    model.root_obj = constr.parse(
+        gallery_item.example_binarys["Huge"], **gallery_item.contextkw
+    )
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    model.root_entry = entries.create_entry_from_construct(model, None, constr, None, "")
+    count = create_all_entries(model.root_entry)
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, end - start
+
+
+def main():
+    print(f"{'gallery item':<30} {'entries':>10} {'bytes':>12} {'bytes/entry':>12}")
+    for name in GALLERY_ITEMS:
+        count, size = measure(name)
+        print(f"{name:<30} {count:>10} {size:>12} {size / count:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measure the import time of the modules, that are needed for starting the
+application, so that the startup stays fast (eg. the gallery items and the
+widgets are only imported on first use).
+
+Each module is imported in a new interpreter (with `python -X importtime`),
+so that already imported modules do not distort the measurement.
+
+Usage: python -m doc.benchmark_scripts.import_time
+"""
+import subprocess
+import sys
+import typing as t
+
+MODULES = [
+    "construct_editor.core.construct_editor",
+    "construct_editor.wx_widgets",
+    "construct_editor.main",
+]
+
+REPEATS = 5
+SLOWEST_COUNT = 5
+
+
+def measure(module: str) -> t.Optional[t.Dict[str, int]]:
+    """
+    Return the cumulative import time in microseconds of the module and of
+    all modules, that are imported by it (best of `REPEATS` runs), or None,
+    if the module cannot be imported (eg. because wx is not installed).
+    """
+    best: t.Optional[t.Dict[str, int]] = None
+    for _ in range(REPEATS):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+
+        times: t.Dict[str, int] = {}
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:") :].split("|")
+            times[name.strip()] = int(cumulative)
+
+        if best is None or times.get(module, 0) < best.get(module, 0):
+            best = times
+    return best
+
+
+def main():
+    print(f"{'module':<45} {'import time [ms]':>17}")
+    for module in MODULES:
+        times = measure(module)
+        if times is None:
+            print(f"{module:<45} {'(not importable)':>17}")
+            continue
+        print(f"{module:<45} {times.get(module, 0) / 1000:>17.1f}")
+
+        # slowest imported packages and modules of this package
+        slowest = sorted(
+            (
+                (cumulative, name)
+                for name, cumulative in times.items()
+                if name != module
+                and ("." not in name or name.startswith("construct_editor."))
+            ),
+            reverse=True,
+        )[:SLOWEST_COUNT]
+        for cumulative, name in slowest:
+            print(f"  {name:<43} {cumulative / 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
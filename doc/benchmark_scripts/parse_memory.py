@@ -0,0 +1,48 @@
+"""
+Measure the memory, that is retained by the parsed objects (including the
+GUI metadata) of the large ("Huge") gallery examples.
+
+Usage: python -m doc.benchmark_scripts.parse_memory
+"""
+import gc
+import importlib
+import tracemalloc
+import typing as t
+
+from construct_editor.core.preprocessor import include_metadata
+
+GALLERY_ITEMS = [
+    "test_array",
+    "test_bitwise",
+    "test_bits_swapped_bitwise",
+]
+
+
+def measure(gallery_item_name: str) -> t.Tuple[int, int]:
+    """Return the retained and the peak bytes while parsing"""
+    module = importlib.import_module(f"construct_editor.gallery.{gallery_item_name}")
+    gallery_item = module.gallery_item
+
+    constr = include_metadata("root" / gallery_item.construct)
+    binary = gallery_item.example_binarys["Huge"]
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    root_obj = constr.parse(binary, **gallery_item.contextkw)
+    gc.collect()
+    end, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del root_obj
+    return end - start, peak - start
+
+
+def main():
+    print(f"{'gallery item':<30} {'retained bytes':>15} {'peak bytes':>15}")
+    for name in GALLERY_ITEMS:
+        retained, peak = measure(name)
+        print(f"{name:<30} {retained:>15} {peak:>15}")
+
+
+if __name__ == "__main__":
+    main()
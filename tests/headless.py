@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import typing as t
+
+import construct as cs
+
+from construct_editor.core.construct_editor import ConstructEditor
+from construct_editor.core.model import ConstructEditorColumn, ConstructEditorModel
+
+
+class HeadlessModel(ConstructEditorModel):
+    """ConstructEditorModel without GUI, that records the changed entries"""
+
+    def __init__(self):
+        super().__init__()
+        self.changed_entries: t.List[t.Any] = []
+
+    def on_value_changed(self, entry):
+        self.changed_entries.append(entry)
+
+
+class HeadlessEditor(ConstructEditor):
+    """ConstructEditor without GUI, that builds the binary after each change"""
+
+    def __init__(self, constr: cs.Construct):
+        super().__init__(constr, HeadlessModel())
+        self.binary = b""
+        self.reload_count = 0
+        self.on_root_obj_changed.append(lambda _: self._rebuild())
+
+    @property
+    def headless_model(self) -> HeadlessModel:
+        return t.cast(HeadlessModel, self.model)
+
+    def _rebuild(self):
+        self.binary = self.build()
+
+    def reload(self):
+        self.reload_count += 1
+
+    def show_parse_error_message(self, msg, ex):
+        pass
+
+    def show_build_error_message(self, msg, ex):
+        pass
+
+    def show_status(self, path_info, bytes_info):
+        pass
+
+    def get_selected_entry(self) -> t.Any:
+        return None
+
+    def select_entry(self, entry):
+        pass
+
+    def _put_to_clipboard(self, txt):
+        pass
+
+    def _get_from_clipboard(self):
+        return None
+
+    def expand_entry(self, entry):
+        entry.row_expanded = True
+
+    def collapse_entry(self, entry):
+        entry.row_expanded = False
+
+    def show_array_statistics(self, entry):
+        pass
+
+    def edit_list_view_filter(self, entry):
+        pass
+
+
+def create_editor(
+    fields: t.Sequence["cs.Construct[t.Any, t.Any]"],
+    binary: bytes,
+    checksum_of: t.Sequence[str] = (),
+) -> HeadlessEditor:
+    """
+    Create an editor of a struct with the fields and parse the binary. If
+    `checksum_of` names fields, a "checksum" field with the sum of the built
+    bytes of these fields is appended to the struct.
+    """
+    fields = list(fields)
+    if checksum_of:
+        subcons = {field.name: field for field in fields}
+
+        def checksum_data(ctx: t.Any) -> bytes:
+            return b"".join(subcons[name].build(ctx[name]) for name in checksum_of)
+
+        fields.append(
+            "checksum"
+            / cs.Checksum(cs.Int8ub, lambda data: sum(data) & 0xFF, checksum_data)
+        )
+    editor = HeadlessEditor(cs.Struct(*fields))
+    editor.parse(binary)
+    return editor
+
+
+def edit(editor: HeadlessEditor, path_str: str, value: t.Any) -> None:
+    """Edit a value like the GUI does (set the value, then rebuild)"""
+    entry = editor.model.get_entry(path_str)
+    assert entry is not None
+    editor.model.set_value(value, entry, ConstructEditorColumn.Value)
+    editor.on_root_obj_changed.fire(editor.model.root_obj)
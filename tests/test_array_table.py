@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+import pytest
+
+from construct_editor.core import entries
+from construct_editor.core.model import ConstructEditorColumn
+
+from headless import HeadlessEditor, create_editor
+
+pytest.importorskip("numpy")
+
+
+def create_items_editor(element: cs.Construct, binary: bytes) -> HeadlessEditor:
+    return create_editor(["items" / cs.GreedyRange(element)], binary)
+
+
+def get_items_entry(editor: HeadlessEditor) -> entries.EntryArray:
+    entry = editor.model.get_entry("root.items")
+    assert isinstance(entry, entries.EntryArray)
+    return entry
+
+
+def test_table_of_primitive_structs():
+    element = cs.Struct(
+        "id" / cs.Int16ul,
+        "value" / cs.Float32b,
+        "flag" / cs.Flag,
+        "kind" / cs.Enum(cs.Int8ub, a=1, b=2),
+    )
+    binary = b"".join(
+        element.build(dict(id=i, value=i / 2, flag=i % 2 == 0, kind=1 + i % 2))
+        for i in range(4)
+    )
+    editor = create_items_editor(element, binary)
+    entry = get_items_entry(editor)
+    editor.enable_list_view(entry)
+
+    table = editor.model.get_array_table(entry)
+    assert table is not None
+    assert len(table) == 4
+    assert table.column_names == ["id", "value", "flag", "kind"]
+    assert table.get_column(0).tolist() == [0, 1, 2, 3]
+    assert table.get_cell_str(3, 1) == "1.5"
+    assert table.get_cell_str(1, 2) == "False"
+    assert table.get_cell_str(1, 3) == "2 (b)"
+
+    # the rows have no entries, the cells are read from the table
+    assert editor.model.get_children(entry) == []
+    assert editor.model.get_table_rows(entry) == [0, 1, 2, 3]
+    assert entry._subentries == []
+    model = editor.model
+    first_column = len(ConstructEditorColumn)
+    cells = [model.get_table_value(entry, 2, first_column + c) for c in range(4)]
+    assert cells == ["2", "1.0", "True", "1 (a)"]
+    assert model.get_table_value(entry, 2, ConstructEditorColumn.Name) == "[2]"
+    assert model.get_table_value(entry, 2, ConstructEditorColumn.Type) == "Struct"
+
+    # the cells match the element entries
+    element_entries = entry.subentries or []
+    assert [e.obj_str for e in element_entries[2].subentries or []] == cells
+    assert model.get_table_row(element_entries[2]) == (entry, 2)
+
+
+def test_table_sort_order():
+    element = cs.Struct("x" / cs.Int8ub, "y" / cs.Int8sb)
+    editor = create_items_editor(element, bytes([3, 0xFF, 1, 5, 2, 0]))
+    entry = get_items_entry(editor)
+    editor.enable_list_view(entry)
+
+    table = editor.model.get_array_table(entry)
+    assert table is not None
+    assert table.get_sort_order(0).tolist() == [1, 2, 0]
+    assert table.get_sort_order(1, descending=True).tolist() == [1, 2, 0]
+
+
+def test_no_table_for_variable_sized_elements():
+    element = cs.Struct("len" / cs.Int8ub, "data" / cs.Bytes(cs.this.len))
+    editor = create_items_editor(element, bytes([1, 0xAA, 2, 0xBB, 0xCC]))
+    entry = get_items_entry(editor)
+    editor.enable_list_view(entry)
+
+    assert editor.model.get_array_table(entry) is None
+    assert len(editor.model.get_children(entry)) == 2
+    assert editor.model.get_table_rows(entry) == []
+
+
+def test_table_is_updated_after_edit():
+    element = cs.Struct("x" / cs.Int8ub)
+    editor = create_items_editor(element, bytes([1, 2]))
+    entry = get_items_entry(editor)
+    editor.enable_list_view(entry)
+    assert editor.model.get_array_table(entry) is not None
+
+    editor.set_values([("root.items[1].x", 9)])
+    table = editor.model.get_array_table(entry)
+    assert table is not None
+    assert table.get_column(0).tolist() == [1, 9]
+
+
+def test_sorted_table_rows():
+    element = cs.Struct("x" / cs.Int8ub)
+    editor = create_items_editor(element, bytes([3, 1, 2]))
+    entry = get_items_entry(editor)
+    editor.enable_list_view(entry)
+
+    editor.sort_list_view(entry, 0)
+    assert editor.model.get_table_rows(entry) == [1, 2, 0]
+    assert editor.model.get_table_value(entry, 1, len(ConstructEditorColumn)) == "1"
+
+    # expanding all entries does not create entries for the rows
+    editor.expand_all()
+    assert entry._subentries == []
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+
+from construct_editor.core import custom, entries
+
+from headless import HeadlessEditor, HeadlessModel
+
+
+class Base64Tunnel(cs.Tunnel):
+    def _decode(self, data, context, path):
+        return data
+
+    def _encode(self, data, context, path):
+        return data
+
+
+class Base64UrlTunnel(Base64Tunnel):
+    pass
+
+
+class CustomStruct(cs.Struct):
+    pass
+
+
+def create_entry(subcon: cs.Construct) -> entries.EntryConstruct:
+    return entries.create_entry_from_construct(HeadlessModel(), None, subcon, "x", "")
+
+
+def test_subclass_uses_entry_class_of_nearest_base():
+    entry = create_entry(CustomStruct("a" / cs.Int8ub))
+    assert type(entry) is entries.EntryStruct
+
+
+def test_custom_mapping_clears_entry_class_cache():
+    assert type(create_entry(Base64UrlTunnel(cs.GreedyBytes))) is entries.EntryConstruct
+
+    custom.add_custom_tunnel(Base64Tunnel, "Base64")
+    try:
+        entry = create_entry(Base64UrlTunnel(cs.GreedyBytes))
+        assert entry.typ_str == "Base64[GreedyBytes]"
+    finally:
+        del entries.construct_entry_mapping[Base64Tunnel]
+        entries.clear_entry_class_cache()
+
+
+def test_switch_creates_only_the_parsed_case_entry():
+    editor = HeadlessEditor(
+        cs.Struct(
+            "t" / cs.Int8ub,
+            "body"
+            / cs.Switch(
+                cs.this.t,
+                {1: cs.Struct("a" / cs.Int8ub), 2: cs.Struct("b" / cs.Int16ub)},
+                cs.Struct("c" / cs.Int8ub),
+            ),
+        )
+    )
+    editor.parse(bytes([2, 0, 5]))
+    switch = editor.model.get_entry("root.body")
+    assert isinstance(switch, entries.EntrySwitch)
+
+    entry = editor.model.get_entry("root.body.b")
+    assert entry is not None and entry.obj == 5
+    assert list(switch._subentry_cases.keys()) == [2]
+    assert switch._subentry_default is None
+
+
+def test_switch_without_parsed_object_shows_all_cases():
+    model = HeadlessModel()
+    switch = entries.create_entry_from_construct(
+        model,
+        None,
+        cs.Switch(cs.this.t, {1: cs.Int8ub, 2: cs.Int16ub}, cs.Int32ub),
+        "x",
+        "",
+    )
+    subentries = switch.subentries
+    assert subentries is not None
+    assert [entry.typ_str for entry in subentries] == ["Int8ub", "Int16ub", "Int32ub"]
+
+
+def test_select_creates_only_the_parsed_option_entry():
+    editor = HeadlessEditor(
+        cs.Struct(
+            "body"
+            / cs.Select(
+                cs.Struct("a" / cs.Const(b"A")),
+                cs.Struct("b" / cs.Int8ub),
+            ),
+        )
+    )
+    editor.parse(bytes([5]))
+    select = editor.model.get_entry("root.body")
+    assert isinstance(select, entries.EntrySelect)
+
+    entry = editor.model.get_entry("root.body.b")
+    assert entry is not None and entry.obj == 5
+    assert list(select._subentries.keys()) == [1]
+
+
+def _iter_subclasses(cls: type):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _iter_subclasses(subclass)
+
+
+def test_entry_classes_have_no_instance_dict():
+    for cls in [entries.EntryConstruct, *_iter_subclasses(entries.EntryConstruct)]:
+        if cls.__module__ not in ("construct_editor.core.entries", custom.__name__):
+            continue
+        for base in cls.__mro__:
+            if base is not object:
+                assert "__slots__" in vars(base), f"{base.__name__} has no __slots__"
+
+    entry = create_entry(cs.Struct("a" / cs.Int8ub))
+    assert not hasattr(entry, "__dict__")
+
+
+def test_entry_flags_are_independent():
+    entry = create_entry(cs.Struct("a" / cs.Bytes(2)))
+    entry.row_expanded = True
+    entry.visible_row = False
+    assert entry.row_expanded is True
+    assert entry.visible_row is False
+
+    entry.row_expanded = False
+    assert entry.row_expanded is False
+    assert entry.visible_row is False
+
+
+def test_if_then_else_with_condition_not_evaluable_after_parsing():
+    # the condition can only be evaluated once (while parsing)
+    conditions = iter([True])
+    editor = HeadlessEditor(
+        cs.Struct(
+            "x" / cs.IfThenElse(lambda ctx: next(conditions), cs.Int8ub, cs.Int16ub)
+        )
+    )
+    editor.parse(bytes([5]))
+    entry = editor.model.get_entry("root.x")
+    assert isinstance(entry, entries.EntryIfThenElse)
+    assert entry.obj == 5
+
+    subentries = entry.subentries
+    assert subentries is not None
+    assert [subentry.typ_str for subentry in subentries] == ["Int8ub", "Int16ub"]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+import typing as t
+
+import construct as cs
+import pytest
+
+from construct_editor.core import follow
+from construct_editor.core.follow import FollowSource, FollowWindow
+from construct_editor.core.preprocessor import get_gui_metadata, include_metadata
+
+from headless import HeadlessEditor
+
+
+def create_records() -> "cs.Construct[t.Any, t.Any]":
+    return cs.GreedyRange(
+        cs.Struct("length" / cs.Int8ub, "data" / cs.Bytes(cs.this.length))
+    )
+
+
+def create_construct() -> "cs.Construct[t.Any, t.Any]":
+    return include_metadata(create_records())
+
+
+def record(data: bytes) -> bytes:
+    return bytes([len(data)]) + data
+
+
+def get_record_data(window: FollowWindow, index: int) -> bytes:
+    metadata = get_gui_metadata(window.root_obj[index])
+    assert metadata is not None
+    assert metadata.stream.getvalue() == window.binary
+    return window.binary[metadata.offset_start : metadata.offset_end]
+
+
+def test_incomplete_record():
+    window = FollowWindow(create_construct(), max_records=10)
+    assert window.feed(record(b"ab") + b"\x03c")
+    assert [obj.data for obj in window.root_obj] == [b"ab"]
+
+    assert not window.feed(b"d")
+    assert window.feed(b"e")
+    assert [obj.data for obj in window.root_obj] == [b"ab", b"cde"]
+
+
+def test_evict_by_count():
+    window = FollowWindow(create_construct(), max_records=2)
+    for idx in range(10):
+        assert window.feed(record(bytes([idx]) * 3))
+
+    assert window.first_index == 8
+    assert [obj.data for obj in window.root_obj] == [b"\x08" * 3, b"\x09" * 3]
+
+    # the data of the evicted records is removed from the stream
+    assert len(window.binary) <= 2 * 2 * 4
+    assert window.base_offset + len(window.binary) == 10 * 4
+    assert window.base_offset + window.window_start == 8 * 4
+    assert get_record_data(window, 0) == record(b"\x08" * 3)
+    assert get_record_data(window, 1) == record(b"\x09" * 3)
+    assert window.root_obj[0]._io.getvalue() == window.binary
+
+
+def test_evict_by_bytes():
+    window = FollowWindow(create_construct(), max_bytes=10)
+    window.feed(record(b"a" * 4) + record(b"b" * 4) + record(b"c" * 20))
+
+    # the newest record is always kept
+    assert [obj.data for obj in window.root_obj] == [b"c" * 20]
+    assert window.first_index == 2
+    assert get_record_data(window, 0) == record(b"c" * 20)
+
+
+def test_drop_pending_data(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(follow, "MAX_PENDING_BYTES", 8)
+    window = FollowWindow(create_construct(), max_records=10)
+    window.feed(record(b"a") + b"\xff" + b"x" * 10)
+    assert window.dropped_bytes == 11
+    assert window.binary == record(b"a")
+
+    window.feed(record(b"b"))
+    assert [obj.data for obj in window.root_obj] == [b"a", b"b"]
+
+
+def test_follow_source(tmp_path: t.Any):
+    file_path = os.path.join(str(tmp_path), "log.bin")
+    with open(file_path, "wb") as f:
+        f.write(record(b"old"))
+
+    source = FollowSource(file_path, from_end=True)
+    window = FollowWindow(create_construct(), max_records=10)
+    assert not window.feed(source.read())
+
+    with open(file_path, "ab") as f:
+        f.write(record(b"new"))
+    assert window.feed(source.read())
+    assert [obj.data for obj in window.root_obj] == [b"new"]
+    source.close()
+    assert source.read() == b""
+
+
+def test_show_follow_window():
+    editor = HeadlessEditor(create_records())
+    window = FollowWindow(editor.construct, max_records=2)
+    window.feed(record(b"a") + record(b"b") + record(b"c"))
+    editor.show_follow_window(window)
+    assert editor.model.get_obj("root[0].data") == b"b"
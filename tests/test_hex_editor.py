@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+pytest.importorskip("wx")
+
+from construct_editor.wx_widgets.wx_hex_editor import HexEditorBinaryData, _IntervalMap
+
+
+def test_typed_bytes_are_undone_together():
+    binary_data = HexEditorBinaryData(bytes(4))
+    binary_data.overwrite_range(0, b"\x01", typing=True)
+    binary_data.overwrite_range(1, b"\x02", typing=True)
+    binary_data.overwrite_range(2, b"\x03", typing=True)
+    assert binary_data.get_range(0, 4) == b"\x01\x02\x03\x00"
+
+    assert binary_data.command_processor.undo()
+    assert binary_data.get_range(0, 4) == bytes(4)
+    assert not binary_data.command_processor.undo()
+
+    assert binary_data.command_processor.redo()
+    assert binary_data.get_range(0, 4) == b"\x01\x02\x03\x00"
+
+
+def test_pasted_ranges_are_undone_separately():
+    binary_data = HexEditorBinaryData(bytes(4))
+    binary_data.overwrite_range(0, b"\x01\x02")
+    binary_data.overwrite_range(2, b"\x03\x04")
+
+    assert binary_data.command_processor.undo()
+    assert binary_data.get_range(0, 4) == b"\x01\x02\x00\x00"
+    assert binary_data.command_processor.undo()
+    assert binary_data.get_range(0, 4) == bytes(4)
+
+
+def test_typed_byte_after_paste_is_undone_separately():
+    binary_data = HexEditorBinaryData(bytes(4))
+    binary_data.overwrite_range(0, b"\x01\x02")
+    binary_data.overwrite_range(2, b"\x03", typing=True)
+
+    assert binary_data.command_processor.undo()
+    assert binary_data.get_range(0, 4) == b"\x01\x02\x00\x00"
+
+
+def test_interval_map_later_ranges_win():
+    interval_map = _IntervalMap([(0, 8, "a"), (2, 4, "b"), (3, 10, "c")])
+    values = [interval_map.get(idx) for idx in range(12)]
+    assert values == ["a", "a", "b", "c", "c", "c", "c", "c", "c", "c", None, None]
+
+
+def test_interval_map_get_row():
+    interval_map = _IntervalMap([(2, 6, "a"), (9, 10, "b")])
+    assert interval_map.get_row(0, 4) == [None, None, "a", "a"]
+    assert interval_map.get_row(1, 4, default="-") == ["a", "a", "-", "-"]
+    assert interval_map.get_row(2, 4, default="-") == ["-", "b", "-", "-"]
+
+
+def test_interval_map_without_ranges():
+    interval_map = _IntervalMap([(4, 4, "a")])
+    assert len(interval_map) == 0
+    assert interval_map.get(4, default="-") == "-"
+
+
+def test_view_shares_the_external_data():
+    data = bytearray(b"\x00\x01\x02\x03")
+    binary_data = HexEditorBinaryData(b"")
+    binary_data.set_view(memoryview(data)[1:3])
+    assert len(binary_data) == 2
+    assert binary_data.get_range(0, 2) == b"\x01\x02"
+
+    data[1] = 0xFF  # not copied
+    assert binary_data.get_value(0) == 0xFF
+
+    with pytest.raises(TypeError):
+        binary_data.remove_range(0, 1)
+    assert bytes(data) == b"\x00\xff\x02\x03"
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import typing as t
+
+import construct as cs
+import pytest
+
+from construct_editor.core import file_watcher
+from construct_editor.core.file_watcher import FileChange, FileWatcher
+from construct_editor.core.incremental_parse import parse_appended
+from construct_editor.core.preprocessor import get_gui_metadata, include_metadata
+
+from headless import HeadlessEditor
+
+# bigger than the first and the last few KiB of the data
+OLD_DATA = bytes(range(256)) * 64
+
+
+def write_file(file_path: str, binary: bytes) -> None:
+    with open(file_path, "wb") as f:
+        f.write(binary)
+    # the modification time may not change on a fast file system
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_file_watcher_appended(tmp_path: t.Any):
+    file_path = os.path.join(str(tmp_path), "data.bin")
+    write_file(file_path, OLD_DATA)
+    watcher = FileWatcher(file_path, OLD_DATA)
+    assert watcher.check() is None
+
+    write_file(file_path, OLD_DATA + b"new")
+    assert watcher.check() is FileChange.Appended
+    assert watcher.appended == b"new"
+    assert watcher.binary == OLD_DATA + b"new"
+
+
+def test_file_watcher_middle_rewritten(tmp_path: t.Any):
+    file_path = os.path.join(str(tmp_path), "data.bin")
+    write_file(file_path, OLD_DATA)
+    watcher = FileWatcher(file_path, OLD_DATA)
+
+    middle = len(OLD_DATA) // 2
+    new_data = OLD_DATA[:middle] + b"\xff\xff" + OLD_DATA[middle + 2 :] + b"new"
+    write_file(file_path, new_data)
+    assert watcher.check() is FileChange.Rewritten
+    assert watcher.appended == b""
+    assert watcher.binary == new_data
+
+    os.remove(file_path)
+    assert watcher.check() is FileChange.Removed
+
+
+def test_file_watcher_compares_bounded_parts(
+    tmp_path: t.Any, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(file_watcher, "MAX_COMPARED_SIZE", 4096)
+    read_sizes: t.List[int] = []
+
+    class CountingFile(io.FileIO):
+        def read(self, size: t.Optional[int] = -1) -> bytes:
+            data = super().read(size)
+            read_sizes.append(len(data))
+            return data
+
+    monkeypatch.setattr(file_watcher, "open", CountingFile, raising=False)
+
+    file_path = os.path.join(str(tmp_path), "data.bin")
+    write_file(file_path, OLD_DATA)
+    watcher = FileWatcher(file_path, OLD_DATA)
+
+    # rewrite the middle, which is not compared at the first checks
+    middle = len(OLD_DATA) // 2
+    binary = OLD_DATA[:middle] + b"\xff\xff" + OLD_DATA[middle + 2 :]
+    changes = []
+    while len(changes) < 10:
+        binary += b"new"
+        write_file(file_path, binary)
+        read_sizes.clear()
+        changes.append(watcher.check())
+        if changes[-1] is FileChange.Rewritten:
+            break
+        assert sum(read_sizes) == 4096 + 3
+
+    # the middle is compared at the fifth check (the rest is compared in
+    # parts of 2048 bytes)
+    assert changes == [FileChange.Appended] * 4 + [FileChange.Rewritten]
+    assert watcher.binary == binary
+
+
+def create_construct() -> "cs.Construct[t.Any, t.Any]":
+    return include_metadata(cs.GreedyRange(cs.Int16ub))
+
+
+def test_parse_appended():
+    constr = create_construct()
+    root_obj = constr.parse(OLD_DATA + b"\x01")
+    old_len = len(root_obj)
+
+    # the incomplete element at the end is parsed again
+    assert parse_appended(constr, root_obj, OLD_DATA + b"\x01\x02\x03") == 1
+    assert len(root_obj) == old_len + 1
+    assert root_obj[-1] == 0x0102
+
+    metadata = get_gui_metadata(root_obj[-1])
+    assert metadata is not None
+    assert (metadata.offset_start, metadata.offset_end) == (
+        len(OLD_DATA),
+        len(OLD_DATA) + 2,
+    )
+    assert root_obj == constr.parse(OLD_DATA + b"\x01\x02\x03")
+
+
+def test_parse_appended_after_incomplete_element_changed():
+    constr = create_construct()
+    root_obj = constr.parse(OLD_DATA + b"\x01")
+
+    # the incomplete element is compared, because it is parsed again
+    assert parse_appended(constr, root_obj, OLD_DATA + b"\xff\x02") is None
+    assert parse_appended(constr, root_obj, OLD_DATA) is None
+    assert root_obj == constr.parse(OLD_DATA + b"\x01")
+
+
+def test_editor_parse_append():
+    editor = HeadlessEditor(cs.GreedyRange(cs.Int16ub))
+    editor.parse(OLD_DATA + b"\x01")
+    assert editor.parse_append(OLD_DATA + b"\x01\x02")
+    assert editor.root_obj[-1] == 0x0102
+
+    editor.parse(OLD_DATA + b"\x01")
+    assert not editor.parse_append(OLD_DATA + b"\xff\x02")  # incomplete element
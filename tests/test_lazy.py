@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+
+from construct_editor.core import entries
+from construct_editor.core.preprocessor import LazyObj
+
+from headless import HeadlessEditor, edit
+
+
+def test_lazy_is_parsed_on_access():
+    editor = HeadlessEditor(
+        cs.Struct("a" / cs.Int8ub, "lazy" / cs.Lazy(cs.Int16ub), "b" / cs.Int8ub)
+    )
+    editor.parse(bytes([1, 0, 2, 3]))
+    assert isinstance(editor.root_obj.lazy, LazyObj)
+    assert not editor.root_obj.lazy.is_parsed
+    assert editor.root_obj.b == 3
+
+    entry = editor.model.get_entry("root.lazy")
+    assert isinstance(entry, entries.EntryLazy)
+    assert entry.subentry.obj == 2
+    assert editor.root_obj.lazy.is_parsed
+    assert entry.cached_typ_str == "Lazy[Int16ub]"
+
+
+def test_lazy_struct():
+    editor = HeadlessEditor(
+        cs.Struct("body" / cs.LazyStruct("x" / cs.Int8ub, "y" / cs.Int16ub))
+    )
+    editor.parse(bytes([1, 0, 2]))
+    entry = editor.model.get_entry("root.body.y")
+    assert entry is not None
+    assert entry.obj == 2
+
+    edit(editor, "root.body.y", 7)
+    assert editor.binary == bytes([1, 0, 7])
+
+
+def test_lazy_array():
+    editor = HeadlessEditor(cs.Struct("items" / cs.LazyArray(3, cs.Int8ub)))
+    editor.parse(bytes([1, 2, 3]))
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+    assert entry.typ_str == "LazyArray[3]"
+    assert editor.model.get_obj("root.items[2]") == 3
+
+    edit(editor, "root.items[1]", 9)
+    assert editor.binary == bytes([1, 9, 3])
+
+
+def test_lazy_bound_of_recursive_construct():
+    node = cs.Struct(
+        "value" / cs.Int8ub,
+        "has_next" / cs.Flag,
+        "next" / cs.If(cs.this.has_next, cs.LazyBound(lambda: node)),
+    )
+    editor = HeadlessEditor(node)
+    editor.parse(bytes([1, 1, 2, 1, 3, 0]))
+    assert editor.model.get_obj("root.next.next.value") == 3
+
+    entry = editor.model.get_entry("root.next.next.value")
+    assert entry is not None
+    assert entry.obj == 3
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+
+import pytest
+
+from construct_editor.gallery import GalleryItem, load_gallery_item
+
+
+def run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def test_wx_widgets_are_imported_on_first_access():
+    output = run_python(
+        "import sys\n"
+        "import construct_editor.wx_widgets as wx_widgets\n"
+        "prefix = 'construct_editor.wx_widgets'\n"
+        "print(sorted(m for m in sys.modules if m.startswith(prefix)))\n"
+        "print('wx' in sys.modules)\n"
+        "print('WxHexEditor' in dir(wx_widgets))\n"
+        "try:\n"
+        "    wx_widgets.WxUnknown\n"
+        "except AttributeError as e:\n"
+        "    print(e)\n"
+    )
+    assert output.splitlines() == [
+        "['construct_editor.wx_widgets']",
+        "False",
+        "True",
+        "module 'construct_editor.wx_widgets' has no attribute 'WxUnknown'",
+    ]
+
+
+def test_wx_widget_access():
+    pytest.importorskip("wx")
+    import construct_editor.wx_widgets as wx_widgets
+    from construct_editor.wx_widgets.wx_hex_editor import WxHexEditor
+
+    assert wx_widgets.WxHexEditor is WxHexEditor
+    assert vars(wx_widgets)["WxHexEditor"] is WxHexEditor  # cached
+
+
+def test_load_gallery_item():
+    gallery_item = load_gallery_item("test_bytes_greedybytes")
+    assert isinstance(gallery_item, GalleryItem)
+    assert len(gallery_item.example_binarys) > 0
+
+    with pytest.raises(ImportError):
+        load_gallery_item("unknown")
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+import pytest
+
+from construct_editor.core import entries
+from construct_editor.core.list_view import ListViewFilterError
+
+from headless import HeadlessEditor, create_editor
+
+
+def create_list_view_editor(element: cs.Construct, binary: bytes) -> HeadlessEditor:
+    editor = create_editor(["items" / cs.GreedyRange(element)], binary)
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+    editor.enable_list_view(entry)
+    return editor
+
+
+def get_visible_indexes(editor: HeadlessEditor) -> list:
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+    if editor.model.get_array_table(entry) is not None:
+        return [f"[{row}]" for row in editor.model.get_table_rows(entry)]
+    return [child.name for child in editor.model.get_children(entry)]
+
+
+def test_filter_and_sort_table():
+    element = cs.Struct("len" / cs.Int16ub, "proto" / cs.Enum(cs.Int8ub, tcp=6, udp=17))
+    binary = b"".join(
+        element.build(dict(len=length, proto=proto))
+        for length, proto in [(100, 6), (1500, 17), (2000, 6), (1400, 6)]
+    )
+    editor = create_list_view_editor(element, binary)
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+
+    editor.filter_list_view(entry, 'len >= 1400 and proto == "tcp"')
+    assert get_visible_indexes(editor) == ["[2]", "[3]"]
+
+    editor.sort_list_view(entry, 0)
+    assert get_visible_indexes(editor) == ["[3]", "[2]"]
+
+    editor.sort_list_view(entry, 0)  # toggle the order
+    assert get_visible_indexes(editor) == ["[2]", "[3]"]
+
+    editor.filter_list_view(entry, None)
+    assert get_visible_indexes(editor) == ["[2]", "[1]", "[3]", "[0]"]
+
+
+def test_filter_columns_with_none():
+    # the length only exists for `kind == 1`, so the column contains None
+    element = cs.Struct(
+        "kind" / cs.Int8ub,
+        "len" / cs.If(cs.this.kind == 1, cs.Int8ub),
+    )
+    editor = create_list_view_editor(element, bytes([1, 5, 0, 1, 20, 0]))
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+    assert editor.model.get_array_table(entry) is None
+
+    editor.filter_list_view(entry, "len > 3")
+    assert get_visible_indexes(editor) == ["[0]", "[2]"]
+
+    editor.filter_list_view(entry, "kind == 0 or len > 10")
+    assert get_visible_indexes(editor) == ["[1]", "[2]", "[3]"]
+
+    editor.sort_list_view(entry, 1)
+    assert get_visible_indexes(editor) == ["[2]", "[1]", "[3]"]
+
+
+def test_invalid_filter_keeps_old_filter():
+    element = cs.Struct("x" / cs.Int8ub, "y" / cs.Int8ub)
+    editor = create_list_view_editor(element, bytes([1, 2, 3, 4]))
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+
+    editor.filter_list_view(entry, "x > 1")
+    with pytest.raises(ListViewFilterError):
+        editor.filter_list_view(entry, "x >")
+    with pytest.raises(ListViewFilterError):
+        editor.filter_list_view(entry, "unknown > 1")
+    assert editor.get_list_view_filter(entry) == "x > 1"
+    assert get_visible_indexes(editor) == ["[1]"]
+
+
+def test_filter_error_after_data_change():
+    element = cs.Struct(
+        "x" / cs.Int8ub,
+        "sub" / cs.If(cs.this.x > 0, cs.Struct("y" / cs.Int8ub)),
+    )
+    editor = create_list_view_editor(element, bytes([1, 5]))
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+    editor.filter_list_view(entry, "sub.y > 1")
+    assert get_visible_indexes(editor) == ["[0]"]
+
+    # the column of the saved filter does not exist anymore, so all rows are shown
+    editor.set_values([("root.items[0].x", 0)])
+    assert editor.binary == bytes([0])
+    assert get_visible_indexes(editor) == ["[0]"]
+    state = editor.model.get_list_view_state(entry)
+    assert isinstance(state.error, ListViewFilterError)
+
+    with pytest.raises(ListViewFilterError):
+        editor.filter_list_view(entry, "sub.y > 0")
+    assert editor.get_list_view_filter(entry) == "sub.y > 1"
+
+
+def test_entry_is_shown_in_list_view():
+    element = cs.Struct("x" / cs.Int8ub)
+    editor = create_list_view_editor(element, bytes([1, 2]))
+    entry = editor.model.get_entry("root.items")
+    assert isinstance(entry, entries.EntryArray)
+    assert editor.is_list_view_enabled(entry)
+
+
+def test_filter_without_huge_integers():
+    element = cs.Struct("x" / cs.Int8ub)
+    editor = create_list_view_editor(element, bytes([1, 2]))
+    entry = editor.model.get_entry("root.items")
+    assert entry is not None
+
+    editor.filter_list_view(entry, "x << 2 == 8")
+    assert get_visible_indexes(editor) == ["[1]"]
+    with pytest.raises(ListViewFilterError):
+        editor.filter_list_view(entry, "x ** 10 ** 10 > 1")
+    with pytest.raises(ListViewFilterError):
+        editor.filter_list_view(entry, "1 << 10000000000 > x")
+    assert editor.get_list_view_filter(entry) == "x << 2 == 8"
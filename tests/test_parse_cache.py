@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import zlib
+
+import construct as cs
+import pytest
+
+from construct_editor.core import parse_cache
+from construct_editor.core.preprocessor import include_metadata
+
+
+def test_memoized_function_is_called_once_for_equal_data():
+    parse_cache.clear_parse_cache()
+    calls = []
+
+    def func(data):
+        calls.append(data)
+        return len(data)
+
+    memoized = parse_cache.memoize_bytes_func(func)
+    data = bytes(range(256)) * 4
+    assert memoized(data) == 1024
+    assert memoized(bytearray(data)) == 1024  # other object with the same data
+    assert len(calls) == 1
+
+    assert memoized(data[:-1] + b"\x00") == 1024
+    assert len(calls) == 2
+
+
+def test_small_data_is_not_cached():
+    parse_cache.clear_parse_cache()
+    calls = []
+
+    def func(data):
+        calls.append(data)
+        return data
+
+    memoized = parse_cache.memoize_bytes_func(func)
+    memoized(b"abc")
+    memoized(b"abc")
+    assert len(calls) == 2
+
+
+def test_compressed_is_decompressed_once():
+    parse_cache.clear_parse_cache()
+    payload = bytes(range(256)) * 16
+    constr = include_metadata(cs.Struct("data" / cs.Compressed(cs.GreedyBytes, "zlib")))
+    binary = zlib.compress(payload)
+
+    obj = constr.parse(binary)
+    assert obj.data == payload
+    assert len(parse_cache._cache) == 1
+
+    assert constr.parse(bytes(binary)).data == payload
+    assert len(parse_cache._cache) == 1
+
+
+def test_checksum_is_verified_on_every_parse():
+    constr = include_metadata(
+        cs.Struct(
+            "data" / cs.Bytes(512),
+            "checksum"
+            / cs.Checksum(cs.Int8ub, lambda data: sum(data) & 0xFF, cs.this.data),
+        )
+    )
+    data = bytes(range(256)) * 2
+    assert constr.parse(data + bytes([sum(data) & 0xFF])).data == data
+    with pytest.raises(cs.ChecksumError):
+        constr.parse(data + bytes([(sum(data) + 1) & 0xFF]))
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+import pytest
+
+from construct_editor.core import entries
+
+from headless import HeadlessEditor, create_editor
+
+
+def create_sections_editor() -> HeadlessEditor:
+    return create_editor(
+        [
+            "count" / cs.Int8ub,
+            "sections" / cs.Array(cs.this.count, cs.Struct("name" / cs.Bytes(2))),
+        ],
+        bytes([2]) + b"aabb",
+    )
+
+
+def test_parse_path_str_is_inverse_of_create_path_str():
+    path = ["root", "sections", entries.ListIndexName("[1]"), "name"]
+    path_str = entries.create_path_str(path)
+    assert path_str == "root.sections[1].name"
+    assert entries.parse_path_str(path_str) == path
+
+    with pytest.raises(ValueError):
+        entries.parse_path_str(".root")
+
+
+def test_get_entry():
+    editor = create_sections_editor()
+    entry = editor.model.get_entry("root.sections[1].name")
+    assert entry is not None
+    assert entries.create_path_str(entry.path) == "root.sections[1].name"
+    assert entry.obj == b"bb"
+
+    assert editor.model.get_entry("root.sections[2].name") is None
+
+
+def test_get_entry_after_new_data():
+    editor = create_sections_editor()
+    assert editor.model.get_entry("root.sections[2]") is None
+
+    editor.parse(bytes([3]) + b"aabbcc")
+    entry = editor.model.get_entry("root.sections[2].name")
+    assert entry is not None
+    assert entry.obj == b"cc"
+
+
+def test_get_obj():
+    editor = create_sections_editor()
+    assert editor.model.get_obj("root.sections[0].name") == b"aa"
+    assert editor.model.get_obj("root.count") == 2
+
+    with pytest.raises(KeyError):
+        editor.model.get_obj("root.sections[5].name")
+    with pytest.raises(KeyError):
+        editor.model.get_obj("root.unknown")
+
+
+def test_path_must_start_with_the_root():
+    editor = create_sections_editor()
+    assert editor.model.get_entry("count") is None
+    with pytest.raises(KeyError):
+        editor.model.get_obj("count")
+    with pytest.raises(KeyError):
+        editor.model.get_obj("bogus.count")
+    with pytest.raises(KeyError):
+        editor.model.get_obj("sections[0].name")
+
+
+def test_index_is_kept_after_value_change():
+    editor = create_sections_editor()
+    index = editor.model.get_path_index()
+    entry = editor.model.get_entry("root.sections[1].name")
+
+    editor.set_values([("root.sections[1].name", b"cc")])
+    editor.set_values([("root.sections[0].name", b"dd")])
+    assert editor.model.get_path_index() is index
+    assert editor.model.get_entry("root.sections[1].name") is entry
+    assert entry is not None and entry.obj == b"cc"
+
+
+def test_index_is_built_lazily():
+    editor = create_sections_editor()
+    assert editor.model.get_entry("root.count") is not None
+    sections = editor.model.get_entry("root.sections")
+    assert sections is not None
+    assert sections not in editor.model.get_path_index()._children
+
+
+def test_index_after_length_change():
+    editor = create_sections_editor()
+    assert editor.model.get_entry("root.sections[1].name") is not None
+
+    sections = cs.ListContainer([dict(name=b"aa")])
+    editor.set_values([("root.count", 1), ("root.sections", sections)])
+    assert editor.model.get_entry("root.sections[1].name") is None
+
+    sections = cs.ListContainer([dict(name=b"aa"), dict(name=b"cc")])
+    editor.set_values([("root.count", 2), ("root.sections", sections)])
+    entry = editor.model.get_entry("root.sections[1].name")
+    assert entry is not None and entry.obj == b"cc"
+
+
+def test_index_after_switch_case_change():
+    editor = create_editor(
+        [
+            "kind" / cs.Int8ub,
+            "body"
+            / cs.Switch(
+                cs.this.kind,
+                {1: cs.Struct("x" / cs.Int8ub), 2: cs.Struct("y" / cs.Int16ub)},
+            ),
+        ],
+        bytes([1, 5]),
+    )
+    assert editor.model.get_entry("root.body") is not None
+    assert editor.model.get_entry("root.body.x") is not None
+    assert editor.model.get_entry("root.body.y") is None
+
+    editor.parse(bytes([2, 0, 6]))
+    assert editor.model.get_entry("root.body.x") is None
+    entry = editor.model.get_entry("root.body.y")
+    assert entry is not None and entry.obj == 6
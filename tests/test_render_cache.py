@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+
+from headless import HeadlessEditor, create_editor, edit
+
+
+def test_cached_strings_are_updated_after_edit():
+    editor = HeadlessEditor(cs.Struct("a" / cs.Int8ub, "b" / cs.Bytes(2)))
+    editor.parse(bytes([10, 1, 2]))
+    entry = editor.model.get_entry("root.a")
+    assert entry is not None
+    assert entry.cached_obj_str == "10"
+    assert entry.cached_typ_str == "Int8ub"
+
+    edit(editor, "root.a", 11)
+    assert entry.cached_obj_str == "11"
+
+
+def test_edit_keeps_cached_strings_of_unchanged_entries():
+    editor = create_editor(
+        ["a" / cs.Int8ub, "b" / cs.Int8ub, "c" / cs.Int8ub], bytes([1, 2, 3, 1]), ["a"]
+    )
+    entries = {}
+    for name in ("a", "b", "c", "checksum"):
+        entry = editor.model.get_entry(f"root.{name}")
+        assert entry is not None
+        assert entry.cached_obj_str != ""
+        entries[name] = entry
+    caches = {name: entry._render_cache for name, entry in entries.items()}
+
+    edit(editor, "root.a", 5)
+    assert entries["b"]._render_cache is caches["b"]
+    assert entries["c"]._render_cache is caches["c"]
+
+    # the dependent checksum is updated after the binary was parsed again
+    assert entries["a"].cached_obj_str == "5"
+    assert entries["checksum"].cached_obj_str == "5"
+
+
+def test_edit_invalidates_cached_strings_of_parents():
+    editor = create_editor(
+        ["inner" / cs.Struct("x" / cs.Int8ub), "y" / cs.Int8ub], bytes([1, 2])
+    )
+    inner = editor.model.get_entry("root.inner")
+    other = editor.model.get_entry("root.y")
+    assert inner is not None and other is not None
+    assert inner.cached_typ_str == "Struct" and other.cached_obj_str == "2"
+    inner_cache = inner._render_cache
+    assert inner_cache is not None
+    other_cache = other._render_cache
+
+    edit(editor, "root.inner.x", 7)
+    assert inner._render_cache is not inner_cache
+    assert other._render_cache is other_cache
+
+
+def test_cached_strings_are_updated_when_lazy_value_is_parsed():
+    editor = HeadlessEditor(
+        cs.Struct("a" / cs.Int8ub, "lazy" / cs.Lazy(cs.Struct("x" / cs.Int8ub)))
+    )
+    editor.parse(bytes([1, 2]))
+    entry = editor.model.get_entry("root.lazy")
+    assert entry is not None
+    assert entry.cached_typ_str == "Lazy"
+
+    # expanding the row parses the value
+    children = editor.model.get_children(entry)
+    assert [child.cached_obj_str for child in children] == ["2"]
+    assert entry.cached_typ_str == "Lazy[Struct]"
+
+
+def test_parsing_lazy_value_keeps_cached_strings_of_other_entries():
+    editor = create_editor(
+        [
+            "first" / cs.Lazy(cs.Struct("x" / cs.Int8ub)),
+            "second" / cs.Lazy(cs.Struct("x" / cs.Int8ub)),
+        ],
+        bytes([1, 2]),
+    )
+    first = editor.model.get_entry("root.first")
+    second = editor.model.get_entry("root.second")
+    assert first is not None and second is not None
+    assert first.cached_typ_str == "Lazy" and second.cached_typ_str == "Lazy"
+    second_cache = second._render_cache
+
+    children = editor.model.get_children(first)
+    assert [child.cached_obj_str for child in children] == ["1"]
+    assert first.cached_typ_str == "Lazy[Struct]"
+    assert second.cached_typ_str == "Lazy"
+    assert second._render_cache is second_cache
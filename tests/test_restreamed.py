@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import io
+
+import construct as cs
+
+from construct_editor.core import restreamed
+
+
+def create_bitstream(data: bytes) -> cs.RestreamedBytesIO:
+    return cs.RestreamedBytesIO(io.BytesIO(data), cs.bytes2bits, 1, cs.bits2bytes, 8)
+
+
+def test_window_is_decoded_around_the_range():
+    restreamed.clear_restreamed_cache()
+    data = bytes(range(256)) * 64
+    window, offset = restreamed.get_restreamed_window(
+        create_bitstream(data), (80000, 80010)
+    )
+    bits = cs.bytes2bits(data)
+    assert offset <= 80000
+    assert window.getvalue() == bits[offset : offset + len(window.getvalue())]
+    assert offset + len(window.getvalue()) >= 80010
+    assert len(window.getvalue()) < len(bits)
+
+
+def test_window_is_cached_by_the_bytes_of_the_window():
+    restreamed.clear_restreamed_cache()
+    data = bytes(range(256)) * 64
+    window, _ = restreamed.get_restreamed_window(create_bitstream(data), (0, 8))
+
+    # a re-parse creates a new stream, the bytes outside of the window may differ
+    changed_data = data[:-1] + b"\xff"
+    cached_window, _ = restreamed.get_restreamed_window(
+        create_bitstream(changed_data), (0, 8)
+    )
+    assert cached_window is window
+
+    changed_data = b"\xff" + data[1:]
+    changed_window, _ = restreamed.get_restreamed_window(
+        create_bitstream(changed_data), (0, 8)
+    )
+    assert changed_window is not window
+    assert changed_window.getvalue()[:8] == b"\x01" * 8
+
+
+
+def test_packed_bits():
+    restreamed.clear_restreamed_cache()
+    data = b"\x0f\xf0\xaa"
+    packed = restreamed.get_packed_bits(create_bitstream(data), (8, 16))
+    assert packed is not None
+    window, bit_offset = packed
+    assert bit_offset == 0
+    assert window.getvalue() == data
+
+    assert restreamed.get_packed_bits(io.BytesIO(b"\x00\x01\x02"), (0, 3)) is None
+
+
+def test_packed_bits_of_a_complete_bitstream():
+    stream = io.BytesIO(cs.bytes2bits(b"\x12\x34"))
+    packed = restreamed.get_packed_bits(stream, (0, 16))
+    assert packed is not None
+    window, bit_offset = packed
+    assert bit_offset == 0
+    assert window.getvalue() == b"\x12\x34"
+
+    # the packed data is cached at the stream
+    cached = restreamed.get_packed_bits(stream, (0, 16))
+    assert cached is not None and cached[0] is window
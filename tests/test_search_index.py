@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import typing as t
+
+import construct as cs
+
+from headless import HeadlessEditor, create_editor, edit
+
+
+def create_search_editor() -> HeadlessEditor:
+    return create_editor(
+        [
+            "header" / cs.Struct("a" / cs.Int8ub, "b" / cs.Int16ub),
+            "count" / cs.Int8ub,
+            "items" / cs.Array(cs.this.count, cs.Int8ub),
+        ],
+        bytes([1, 0, 2, 2, 7, 8, 3]),
+        checksum_of=["header"],
+    )
+
+
+def get_paths(found) -> t.List[str]:
+    return [".".join(entry.path) for entry in found]
+
+
+def find_checksum(editor: HeadlessEditor, value: int) -> t.List[str]:
+    return get_paths(editor.find(name="checksum", min_value=value, max_value=value))
+
+
+def test_find_by_name_value_and_range():
+    editor = create_search_editor()
+    assert get_paths(editor.find(name="checksum")) == ["root.checksum"]
+    assert get_paths(editor.find(min_value=7, max_value=8)) == [
+        "root.items.[0]",
+        "root.items.[1]",
+    ]
+    assert get_paths(editor.find(name="a", value="1")) == ["root.header.a"]
+    assert get_paths(editor.find(path="items[1]")) == ["root.items.[1]"]
+    assert editor.find(name="unknown") == []
+
+
+def test_index_is_updated_after_edit():
+    editor = create_search_editor()
+    assert find_checksum(editor, 3) == ["root.checksum"]
+
+    edit(editor, "root.header.b", 9)
+    assert editor.binary == bytes([1, 0, 9, 2, 7, 8, 10])
+
+    # the checksum was changed by the rebuild, not by the edit itself
+    assert find_checksum(editor, 10) == ["root.checksum"]
+    assert find_checksum(editor, 3) == []
+    assert get_paths(editor.find(name="b", value="9")) == ["root.header.b"]
+
+
+def test_index_is_updated_after_length_change():
+    editor = create_search_editor()
+    assert len(editor.find(path="items[")) == 2
+
+    editor.set_values([("root.count", 3), ("root.items", cs.ListContainer([7, 8, 5]))])
+    assert get_paths(editor.find(path="items[")) == [
+        "root.items.[0]",
+        "root.items.[1]",
+        "root.items.[2]",
+    ]
+    assert get_paths(editor.find(min_value=5, max_value=5)) == ["root.items.[2]"]
+
+    editor.set_values([("root.count", 1), ("root.items", cs.ListContainer([4]))])
+    assert get_paths(editor.find(path="items[")) == ["root.items.[0]"]
+    assert editor.find(min_value=5, max_value=5) == []
+
+
+def test_index_is_updated_after_undo():
+    editor = create_search_editor()
+    editor.find(name="checksum")
+    edit(editor, "root.header.a", 5)
+    assert find_checksum(editor, 7) == ["root.checksum"]
+
+    assert editor.undo()
+    assert find_checksum(editor, 3) == ["root.checksum"]
+    assert editor.find(name="a", min_value=5, max_value=5) == []
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import os
+import typing as t
+
+import construct as cs
+
+from construct_editor.core.preprocessor import get_gui_metadata, include_metadata
+from construct_editor.core.session_cache import (
+    Session,
+    SessionCache,
+    get_construct_fingerprint,
+    read_file,
+)
+
+
+def create_construct() -> "cs.Construct[t.Any, t.Any]":
+    return cs.Struct(
+        "count" / cs.Int8ub,
+        "items" / cs.Array(cs.this.count, cs.Int16ub),
+        "kind" / cs.Select(cs.Const(b"A"), cs.Const(b"B")),
+        "length" / cs.Computed(lambda ctx: ctx.count * 2),
+    )
+
+
+def write_file(tmp_path: t.Any, binary: bytes) -> str:
+    file_path = os.path.join(str(tmp_path), "data.bin")
+    with open(file_path, "wb") as f:
+        f.write(binary)
+    return file_path
+
+
+def test_fingerprint_is_stable():
+    assert get_construct_fingerprint(create_construct()) == get_construct_fingerprint(
+        create_construct()
+    )
+    assert get_construct_fingerprint(create_construct()) != get_construct_fingerprint(
+        cs.Struct("count" / cs.Int8ub)
+    )
+
+
+def test_save_and_load(tmp_path: t.Any):
+    file_path = write_file(tmp_path, bytes([2, 0, 1, 0, 2]) + b"B")
+    binary, stamp = read_file(file_path)
+    assert stamp is not None
+
+    constr = include_metadata(create_construct())
+    root_obj = constr.parse(binary)
+    cache = SessionCache(os.path.join(str(tmp_path), "cache"))
+    assert cache.save(file_path, stamp, constr, {}, Session(root_obj, ["root"], []))
+
+    # a new construct with the same structure, eg. after a restart
+    constr = include_metadata(create_construct())
+    session = cache.load(file_path, stamp, constr, {}, binary)
+    assert session is not None
+    assert session.expanded_paths == ["root"]
+    assert session.root_obj["items"] == [1, 2]
+    assert session.root_obj.kind == b"B"
+
+    metadata = get_gui_metadata(session.root_obj["items"])
+    assert metadata is not None
+    assert metadata.construct is constr.subcons[1].subcon.subcon  # type: ignore
+    assert metadata.stream.getvalue() == binary
+
+    # other context
+    assert cache.load(file_path, stamp, constr, {"a": 1}, binary) is None
+
+
+def test_load_after_file_changed(tmp_path: t.Any):
+    file_path = write_file(tmp_path, bytes([1, 0, 1]) + b"A")
+    binary, stamp = read_file(file_path)
+    assert stamp is not None
+
+    constr = include_metadata(create_construct())
+    cache = SessionCache(os.path.join(str(tmp_path), "cache"))
+    session = Session(constr.parse(binary), [], [])
+    assert cache.save(file_path, stamp, constr, {}, session)
+
+    write_file(tmp_path, bytes([1, 0, 2]) + b"AB")
+    binary, new_stamp = read_file(file_path)
+    assert new_stamp is not None and new_stamp != stamp
+    assert cache.load(file_path, new_stamp, constr, {}, binary) is None
+
+    # the session of the old content is not saved for the new content
+    assert not cache.save(file_path, stamp, constr, {}, Session(None, [], []))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+
+from construct_editor.core import entries, list_view, statistics
+
+from headless import create_editor
+
+
+def get_statistics(element: cs.Construct, binary: bytes):
+    editor = create_editor(["items" / cs.GreedyRange(element)], binary)
+    entry = editor.model.get_entry("root.items")
+    assert isinstance(entry, entries.EntryArray)
+    return {s.name: s for s in editor.model.get_array_statistics(entry)}
+
+
+def test_statistics_of_numbers_and_enums():
+    element = cs.Struct("len" / cs.Int16ub, "proto" / cs.Enum(cs.Int8ub, tcp=6, udp=17))
+    binary = b"".join(
+        element.build(dict(len=length, proto=proto))
+        for length, proto in [(100, 6), (300, 17), (200, 6), (200, 6)]
+    )
+    stats = get_statistics(element, binary)
+
+    length = stats["len"]
+    assert length.count == 4
+    assert (length.minimum, length.maximum, length.mean) == (100, 300, 200.0)
+    assert length.distinct_count == 3
+    assert length.histogram is not None
+    assert sum(length.histogram.counts) == 4
+
+    proto = stats["proto"]
+    assert proto.top_values == [("tcp", 3), ("udp", 1)]
+
+
+def test_statistics_of_columns_with_none():
+    element = cs.Struct(
+        "kind" / cs.Int8ub,
+        "len" / cs.If(cs.this.kind == 1, cs.Int8ub),
+    )
+    stats = get_statistics(element, bytes([1, 5, 0, 1, 7]))
+
+    assert (stats["kind"].minimum, stats["kind"].maximum) == (0, 1)
+    length = stats["len"]
+    assert length.count == 3
+    assert length.minimum is None
+    assert length.distinct_count == 3
+
+
+def test_python_statistics_match_vectorized():
+    column = list_view.ListViewColumn("x", [3, 1, 2, 2])
+    stats = statistics._compute_python(column, 4, bins=10, top=5)
+    assert (stats.minimum, stats.maximum, stats.mean) == (1, 3, 2.0)
+    assert stats.distinct_count == 3
+    assert stats.histogram is not None
+    assert stats.histogram.counts == [1, 2, 1]
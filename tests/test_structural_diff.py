@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import construct as cs
+
+from construct_editor.core.preprocessor import include_metadata
+from construct_editor.core.structural_diff import (
+    DiffKind,
+    StructuralDiff,
+    _is_context_free,
+)
+
+
+def diff(constr: cs.Construct, binary_a: bytes, binary_b: bytes) -> StructuralDiff:
+    constr = include_metadata(constr)
+    return StructuralDiff("root", constr.parse(binary_a), constr.parse(binary_b))
+
+
+def test_changed_fields():
+    result = diff(
+        cs.Struct("a" / cs.Int8ub, "b" / cs.Int16ub, "c" / cs.Bytes(2)),
+        bytes([1, 0, 2, 3, 4]),
+        bytes([1, 0, 5, 3, 4]),
+    )
+    assert [item.path_str for item in result.items] == ["root.b"]
+    item = result.items[0]
+    assert item.kind is DiffKind.Changed
+    assert (item.obj_a, item.obj_b) == (2, 5)
+    assert (item.byte_range_a, item.byte_range_b) == ((1, 3), (1, 3))
+    assert result.contains_changes("root")
+
+
+def test_added_elements():
+    result = diff(
+        cs.Struct("items" / cs.GreedyRange(cs.Int8ub)),
+        bytes([1, 2]),
+        bytes([1, 2, 3]),
+    )
+    assert [(item.path_str, item.kind) for item in result.items] == [
+        ("root.items[2]", DiffKind.OnlyInB)
+    ]
+
+
+def test_same_bytes_parsed_depending_on_the_context():
+    result = diff(
+        cs.Struct(
+            "t" / cs.Int8ul,
+            "body" / cs.Switch(cs.this.t, {1: cs.Int16ul, 2: cs.Int16ub}),
+        ),
+        bytes([1, 1, 2]),
+        bytes([2, 1, 2]),
+    )
+    assert [item.path_str for item in result.items] == ["root.t", "root.body"]
+    assert (result.items[1].obj_a, result.items[1].obj_b) == (0x0201, 0x0102)
+
+
+def test_same_bytes_of_array_with_count_of_the_context():
+    result = diff(
+        cs.Struct(
+            "count" / cs.Int8ub,
+            "data" / cs.Struct("items" / cs.Array(cs.this._.count, cs.Int8ub)),
+            "rest" / cs.GreedyBytes,
+        ),
+        bytes([1, 5, 6]),
+        bytes([2, 5, 6]),
+    )
+    assert [item.path_str for item in result.items] == [
+        "root.count",
+        "root.data.items[1]",
+        "root.rest",
+    ]
+
+
+def test_is_context_free():
+    assert _is_context_free(cs.Struct("a" / cs.Int8ub, "b" / cs.Bytes(2)))
+    assert _is_context_free(cs.Array(3, cs.PaddedString(4, "ascii")))
+    assert _is_context_free(cs.Prefixed(cs.Int8ub, cs.GreedyRange(cs.Int16ub)))
+    assert not _is_context_free(cs.Bytes(cs.this.length))
+    assert not _is_context_free(cs.Struct("a" / cs.Int8ub, "b" / cs.Computed(1)))
+    assert not _is_context_free(cs.Switch(cs.this.t, {1: cs.Int8ub}))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import typing as t
+
+import construct as cs
+import pytest
+
+from construct_editor.core import entries, value_delta
+from construct_editor.core.commands import CommandProcessor
+
+from headless import HeadlessEditor, create_editor, edit
+
+
+def create_checksum_editor() -> HeadlessEditor:
+    return create_editor(
+        ["a" / cs.Int8ub, "b" / cs.Int16ub], bytes([1, 0, 2, 3]), checksum_of=["a", "b"]
+    )
+
+
+def test_undo_rebuilds_binary():
+    editor = create_checksum_editor()
+    edit(editor, "root.b", 7)
+    assert editor.binary == bytes([1, 0, 7, 8])
+
+    assert editor.undo()
+    assert editor.root_obj.b == 2
+    assert editor.binary == bytes([1, 0, 2, 3])
+    assert editor.build() == bytes([1, 0, 2, 3])
+
+    assert editor.redo()
+    assert editor.root_obj.b == 7
+    assert editor.binary == bytes([1, 0, 7, 8])
+    assert editor.build() == bytes([1, 0, 7, 8])
+
+
+def test_undo_batch_edit_rebuilds_binary():
+    editor = create_checksum_editor()
+    editor.set_values([("root.a", 5), ("root.b", 9)])
+    assert editor.binary == bytes([5, 0, 9, 14])
+
+    assert editor.undo()
+    assert (editor.root_obj.a, editor.root_obj.b) == (1, 2)
+    assert editor.build() == bytes([1, 0, 2, 3])
+
+
+def test_undo_without_history():
+    editor = create_checksum_editor()
+    assert not editor.undo()
+    assert not editor.redo()
+
+
+def test_failed_batch_edit_is_rolled_back():
+    editor = create_checksum_editor()
+    with pytest.raises(KeyError):
+        editor.set_values([("root.a", 5), ("root.unknown", 9)])
+    assert editor.root_obj.a == 1
+    assert editor.binary == b""  # not built again
+    assert not editor.undo()
+
+
+def get_changed_paths(editor: HeadlessEditor) -> t.List[str]:
+    paths = [
+        entries.create_path_str(entry.path)
+        for entry in editor.headless_model.changed_entries
+    ]
+    editor.headless_model.changed_entries.clear()
+    return paths
+
+
+def test_undo_updates_only_changed_entries():
+    editor = create_checksum_editor()
+    reload_count = editor.reload_count
+
+    edit(editor, "root.b", 7)
+    assert get_changed_paths(editor) == ["root.b", "root.checksum"]
+
+    assert editor.undo()
+    assert get_changed_paths(editor) == ["root.b", "root.checksum"]
+    assert editor.model.get_obj("root.checksum") == 3
+
+    assert editor.redo()
+    assert get_changed_paths(editor) == ["root.b", "root.checksum"]
+    assert editor.model.get_obj("root.checksum") == 8
+    assert editor.reload_count == reload_count
+
+
+def test_undo_reloads_after_structure_change():
+    editor = create_editor(
+        ["count" / cs.Int8ub, "items" / cs.Array(cs.this.count, cs.Int8ub)],
+        bytes([1, 5]),
+    )
+    editor.set_values([("root.count", 2), ("root.items", cs.ListContainer([5, 6]))])
+    assert editor.binary == bytes([2, 5, 6])
+
+    reload_count = editor.reload_count
+    assert editor.undo()
+    assert editor.binary == bytes([1, 5])
+    assert editor.reload_count == reload_count + 1
+
+
+def test_undo_of_value_changed_in_the_meantime():
+    editor = create_checksum_editor()
+    edit(editor, "root.b", 7)
+
+    # change the value without a command
+    editor.root_obj.b = 9
+    assert not editor.undo()
+    assert editor.root_obj.b == 9
+
+
+def test_value_delta_matches():
+    delta = value_delta.create_value_delta(b"abcdef", b"abXYef")
+    assert delta.matches(b"abcdef", revert=False)
+    assert delta.matches(b"abXYef", revert=True)
+    assert not delta.matches(b"abXYef", revert=False)
+    assert not delta.matches(b"abcdefg", revert=False)
+
+    delta = value_delta.create_value_delta([1, 2, 3], [1, 5, 3])
+    assert delta.matches([1, 2, 3], revert=False)
+    assert not delta.matches([1, 2], revert=False)
+    assert not delta.matches([1, 2, 3], revert=True)
+
+
+def test_value_delta_size_counts_nested_values():
+    old_value = cs.Container(data=b"a" * 100_000, items=cs.ListContainer([b"b" * 1000]))
+    new_value = cs.Container(data=b"c" * 200_000)
+    delta = value_delta.create_value_delta(old_value, new_value)
+    assert 301_000 < delta.get_size() < 310_000
+
+    # a list with a new length is saved completely
+    delta = value_delta.create_value_delta([b"a" * 1000] * 100, [b"b" * 1000])
+    assert 2_000 < delta.get_size() < 4_000  # the same item is counted once
+
+    delta = value_delta.create_value_delta(
+        [cs.Container(data=b"a" * 1000), 1], [cs.Container(data=b"b" * 1000), 1]
+    )
+    assert 2_000 < delta.get_size() < 4_000
+
+
+def test_history_is_limited_by_nested_values():
+    editor = create_editor(
+        ["items" / cs.GreedyRange(cs.Struct("data" / cs.Bytes(1000)))], b""
+    )
+    editor.model.command_processor = CommandProcessor(max_size=100_000)
+    for idx in range(200):
+        items = cs.ListContainer(
+            [cs.Container(data=bytes([idx]) * 1000)] * (idx % 2 + 1)
+        )
+        editor.set_values([("root.items", items)])
+
+    assert editor.model.command_processor.get_history_size() <= 100_000
+    undo_count = 0
+    while editor.undo():
+        undo_count += 1
+    assert 10 < undo_count < 100